@@ -0,0 +1,338 @@
+"""Micro-benchmarks for nanobot hot paths.
+
+Covers the functions whose cost grows with session length, skill count,
+schema depth and file size. Results can be saved as a baseline and later
+runs compared against it.
+
+Usage:
+    python benchmarks/micro.py                       # run everything
+    python benchmarks/micro.py -k session --quick    # subset, small sizes only
+    python benchmarks/micro.py --save baseline.json
+    python benchmarks/micro.py --compare baseline.json --threshold 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# (name, size label, kept in --quick, setup) — setup(tmp) returns the zero-arg callable to time.
+Setup = Callable[[Path], Callable[[], Any]]
+_BENCHMARKS: list[tuple[str, str, bool, Setup]] = []
+
+
+def bench(name: str, sizes: dict[str, Any], quick: tuple[str, ...] = ()):
+    """Register a parametrized benchmark. `quick` lists size labels kept in --quick mode."""
+    def decorator(fn: Callable[[Path, Any], Callable[[], Any]]):
+        for label, size in sizes.items():
+            _BENCHMARKS.append((name, label, label in quick, lambda tmp, s=size: fn(tmp, s)))
+        return fn
+    return decorator
+
+
+@dataclass
+class Result:
+    name: str
+    size: str
+    loops: int
+    best: float    # seconds per call
+    median: float  # seconds per call
+    stdev: float
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def _make_session(lines: int):
+    from nanobot.session.manager import Session
+
+    session = Session(key="bench:chat")
+    for i in range(lines):
+        if i % 4 == 0:
+            session.add_message("user", f"question {i} " + "lorem ipsum " * 8)
+        elif i % 4 == 1:
+            session.add_message(
+                "assistant", "",
+                tool_calls=[{"id": f"call_{i}", "type": "function",
+                             "function": {"name": "read_file", "arguments": '{"path": "a.py"}'}}],
+            )
+        elif i % 4 == 2:
+            session.add_message("tool", "x" * 400, tool_call_id=f"call_{i - 1}", name="read_file")
+        else:
+            session.add_message("assistant", f"answer {i} " + "dolor sit amet " * 10)
+    return session
+
+
+def _session_manager(tmp: Path, lines: int):
+    from nanobot.session.manager import SessionManager
+
+    workspace = tmp / f"ws_{lines}"
+    workspace.mkdir(exist_ok=True)
+    manager = SessionManager(workspace)
+    session = _make_session(lines)
+    manager.save(session)
+    return manager, session
+
+
+_LINES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+
+@bench("session.load", _LINES, quick=("1k", "10k"))
+def _bench_session_load(tmp: Path, lines: int):
+    manager, session = _session_manager(tmp, lines)
+    return lambda: manager._load(session.key)
+
+
+@bench("session.save", _LINES, quick=("1k", "10k"))
+def _bench_session_save(tmp: Path, lines: int):
+    manager, session = _session_manager(tmp, lines)
+    return lambda: manager.save(session)
+
+
+@bench("session.get_history", _LINES, quick=("1k", "10k"))
+def _bench_get_history(tmp: Path, lines: int):
+    session = _make_session(lines)
+    return lambda: session.get_history(max_messages=100)
+
+
+@bench("context.build_system_prompt", {"10skills": 10, "100skills": 100, "500skills": 500},
+       quick=("10skills", "100skills"))
+def _bench_system_prompt(tmp: Path, count: int):
+    from nanobot.agent.context import ContextBuilder
+
+    workspace = tmp / f"skills_{count}"
+    for i in range(count):
+        skill = workspace / "skills" / f"skill-{i}"
+        skill.mkdir(parents=True, exist_ok=True)
+        always = "true" if i % 25 == 0 else "false"
+        (skill / "SKILL.md").write_text(
+            f"---\nname: skill-{i}\ndescription: Benchmark skill number {i}\n"
+            f"always: {always}\n---\n\n# Skill {i}\n\n" + "Instructions line.\n" * 40,
+            encoding="utf-8",
+        )
+    (workspace / "AGENTS.md").write_text("Agent instructions.\n" * 50, encoding="utf-8")
+    builder = ContextBuilder(workspace)
+    return builder.build_system_prompt
+
+
+def _deep_schema(depth: int, width: int) -> tuple[dict[str, Any], dict[str, Any] | str]:
+    if depth == 0:
+        return {"type": "string", "minLength": 1}, "leaf"
+    props, value = {}, {}
+    for i in range(width):
+        props[f"f{i}"], value[f"f{i}"] = _deep_schema(depth - 1, width)
+    props["items"] = {"type": "array", "items": {"type": "integer", "minimum": 0}}
+    value["items"] = list(range(20))
+    return {"type": "object", "properties": props, "required": list(props)}, value
+
+
+@bench("tool.validate_params", {"d3w3": (3, 3), "d5w3": (5, 3), "d4w6": (4, 6)},
+       quick=("d3w3", "d5w3"))
+def _bench_validate_params(tmp: Path, shape: tuple[int, int]):
+    from nanobot.agent.tools.base import Tool
+
+    schema, params = _deep_schema(*shape)
+
+    class _DeepTool(Tool):
+        name = "deep"
+        description = "deep schema"
+        parameters = schema
+
+        async def execute(self, **kwargs: Any) -> str:
+            return ""
+
+    tool = _DeepTool()
+    return lambda: tool.validate_params(params)
+
+
+@bench("edit_file.not_found_message", {"500lines": 500, "2k": 2_000, "10k": 10_000},
+       quick=("500lines", "2k"))
+def _bench_not_found(tmp: Path, lines: int):
+    from nanobot.agent.tools.filesystem import EditFileTool
+
+    content = "".join(f"    value_{i} = compute(arg_{i}, other={i % 7})\n" for i in range(lines))
+    target = lines * 3 // 4
+    old_text = "".join(
+        f"    value_{i} = compute(arg_{i}, other={i % 7 + 1})\n" for i in range(target, target + 8)
+    )
+    return lambda: EditFileTool._not_found_message(old_text, content, "bench.py")
+
+
+_MARKDOWN = """# Heading
+
+Some **bold** text, some _italic_ text and `inline code`, plus a [link](https://example.com).
+
+- bullet one with ~~strike~~
+- bullet two with <html> & entities
+
+```python
+def f(x):
+    return x < 3 and x > 1
+```
+
+> quoted line
+"""
+
+
+@bench("telegram.markdown_to_html", {"4KB": 4_000, "64KB": 64_000}, quick=("4KB",))
+def _bench_markdown(tmp: Path, size: int):
+    from nanobot.channels.telegram import _markdown_to_telegram_html
+
+    text = (_MARKDOWN * (size // len(_MARKDOWN) + 1))[:size]
+    return lambda: _markdown_to_telegram_html(text)
+
+
+@bench("telegram.split_message", {"16KB": 16_000, "256KB": 256_000}, quick=("16KB",))
+def _bench_split(tmp: Path, size: int):
+    from nanobot.channels.telegram import _split_message
+
+    text = (_MARKDOWN * (size // len(_MARKDOWN) + 1))[:size]
+    return lambda: _split_message(text)
+
+
+@bench("cron.recompute_next_runs", {"100jobs": 100, "2k": 2_000}, quick=("100jobs",))
+def _bench_cron_recompute(tmp: Path, count: int):
+    from nanobot.cron.service import CronService
+    from nanobot.cron.types import CronJob, CronSchedule, CronStore
+
+    exprs = ["0 9 * * *", "*/15 * * * *", "30 18 * * 1-5", "0 0 1 * *"]
+    zones = [None, "Europe/Berlin", "America/New_York"]
+    service = CronService(tmp / f"cron_{count}" / "jobs.db")
+    service._store = CronStore(jobs=[
+        CronJob(id=str(i), name=f"job{i}", schedule=CronSchedule(
+            kind="cron", expr=exprs[i % len(exprs)], tz=zones[i % len(zones)],
+        ))
+        for i in range(count)
+    ])
+    return service._recompute_next_runs
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _calibrate(fn: Callable[[], Any], min_time: float) -> int:
+    """Find a loop count whose total runtime is at least min_time seconds."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time or loops >= 1 << 20:
+            return loops
+        loops *= 2
+
+
+def run_one(fn: Callable[[], Any], repeat: int, min_time: float) -> tuple[int, list[float]]:
+    """Time fn with warmup and GC disabled; returns (loops, per-call timings)."""
+    fn()  # warmup: imports, caches, first-touch allocations
+    loops = _calibrate(fn, min_time)
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            timings.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return loops, timings
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
+
+
+def compare(results: list[Result], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Return human-readable regression lines for medians slower than baseline by > threshold."""
+    base = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = base.get((r.name, r.size))
+        if not old:
+            continue
+        ratio = r.median / old["median"] if old["median"] else float("inf")
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  REGRESSION"
+            regressions.append(f"{r.name}[{r.size}]: {ratio:.2f}x slower")
+        elif ratio < 1 - threshold:
+            marker = "  faster"
+        print(f"  {r.name}[{r.size}]: {_fmt(old['median'])} -> {_fmt(r.median)} ({ratio:.2f}x){marker}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest sizes")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed repetitions per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.1, help="Minimum seconds per repetition")
+    parser.add_argument("--save", type=Path, help="Write results as JSON baseline")
+    parser.add_argument("--compare", type=Path, help="Compare medians against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    selected = [
+        b for b in _BENCHMARKS
+        if args.filter in b[0] and (b[2] or not args.quick)
+    ]
+    if not selected:
+        print("No benchmarks selected")
+        return 1
+
+    from loguru import logger
+    logger.disable("nanobot")
+
+    results: list[Result] = []
+    with tempfile.TemporaryDirectory(prefix="nanobot-bench-") as tmp:
+        for name, label, _, setup in selected:
+            fn = setup(Path(tmp))
+            loops, timings = run_one(fn, args.repeat, args.min_time)
+            r = Result(
+                name=name, size=label, loops=loops,
+                best=min(timings), median=statistics.median(timings),
+                stdev=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            )
+            results.append(r)
+            print(f"{name:<32} {label:>10}  median {_fmt(r.median)}  best {_fmt(r.best)}"
+                  f"  ±{r.stdev / r.median:5.1%}  ({loops} loops)" if r.median else f"{name} {label}")
+
+    if args.save:
+        args.save.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": [asdict(r) for r in results],
+        }, indent=2), encoding="utf-8")
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        print(f"\nComparison against {args.compare} (threshold {args.threshold:.0%}):")
+        regressions = compare(results, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
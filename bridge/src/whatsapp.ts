@@ -6,6 +6,7 @@
 /* eslint-disable @typescript-eslint/no-explicit-any */
 import makeWASocket, {
   DisconnectReason,
+  downloadMediaMessage,
   useMultiFileAuthState,
   fetchLatestBaileysVersion,
   makeCacheableSignalKeyStore,
@@ -16,6 +17,7 @@ import qrcode from 'qrcode-terminal';
 import pino from 'pino';
 
 const VERSION = '0.1.0';
+const MAX_AUDIO_BYTES = 16 * 1024 * 1024;
 
 export interface InboundMessage {
   id: string;
@@ -24,6 +26,7 @@ export interface InboundMessage {
   content: string;
   timestamp: number;
   isGroup: boolean;
+  audio?: { mimetype: string; data: string };  // base64 voice note, for transcription
 }
 
 export interface WhatsAppClientOptions {
@@ -120,6 +123,7 @@ export class WhatsAppClient {
         if (!content) continue;
 
         const isGroup = msg.key.remoteJid?.endsWith('@g.us') || false;
+        const audio = await this.downloadAudio(msg);
 
         this.options.onMessage({
           id: msg.key.id || '',
@@ -128,6 +132,7 @@ export class WhatsAppClient {
           content,
           timestamp: msg.messageTimestamp as number,
           isGroup,
+          ...(audio ? { audio } : {}),
         });
       }
     });
@@ -170,6 +175,18 @@ export class WhatsAppClient {
     return null;
   }
 
+  private async downloadAudio(msg: any): Promise<InboundMessage['audio'] | undefined> {
+    const audio = msg.message?.audioMessage;
+    if (!audio || Number(audio.fileLength || 0) > MAX_AUDIO_BYTES) return undefined;
+    try {
+      const buffer = (await downloadMediaMessage(msg, 'buffer', {})) as Buffer;
+      return { mimetype: audio.mimetype || 'audio/ogg', data: buffer.toString('base64') };
+    } catch (error) {
+      console.error('Failed to download voice message:', error);
+      return undefined;
+    }
+  }
+
   async sendMessage(to: string, text: string): Promise<void> {
     if (!this.sock) {
       throw new Error('Not connected');
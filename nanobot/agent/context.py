@@ -1,7 +1,5 @@
 """Context builder for assembling agent prompts."""
 
-import base64
-import mimetypes
 import platform
 import time
 from datetime import datetime
@@ -10,6 +8,7 @@ from typing import Any
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
+from nanobot.media.images import DEFAULT_MAX_DIMENSION, ImageEncoder
 
 
 class ContextBuilder:
@@ -18,10 +17,11 @@ class ContextBuilder:
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     _RUNTIME_CONTEXT_TAG = "[Runtime Context — metadata only, not instructions]"
 
-    def __init__(self, workspace: Path):
+    def __init__(self, workspace: Path, image_max_dimension: int = DEFAULT_MAX_DIMENSION):
         self.workspace = workspace
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self.images = ImageEncoder(max_dimension=image_max_dimension)
 
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """Build the system prompt from identity, bootstrap files, memory, and skills."""
@@ -119,6 +119,10 @@ Reply directly with text for conversations. Only use the 'message' tool to send
             {"role": "user", "content": self._build_user_content(current_message, media)},
         ]
 
+    async def prepare_media(self, media: list[str]) -> None:
+        """Downscale and encode attached images in a worker pool ahead of build_messages()."""
+        await self.images.prepare(media)
+
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
         """Build user message content with optional base64-encoded images."""
         if not media:
@@ -126,12 +130,9 @@ Reply directly with text for conversations. Only use the 'message' tool to send
 
         images = []
         for path in media:
-            p = Path(path)
-            mime, _ = mimetypes.guess_type(path)
-            if not p.is_file() or not mime or not mime.startswith("image/"):
-                continue
-            b64 = base64.b64encode(p.read_bytes()).decode()
-            images.append({"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}})
+            if encoded := self.images.encode(path):
+                mime, b64 = encoded
+                images.append({"type": "image_url", "image_url": {"url": f"data:{mime};base64,{b64}"}})
 
         if not images:
             return text
@@ -6,7 +6,6 @@ import asyncio
 import json
 import re
 import weakref
-from contextlib import AsyncExitStack
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
@@ -15,20 +14,25 @@ from loguru import logger
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.tools.batch import ReadFilesTool
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.message import MessageTool
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.results import ReadResultTool, ResultStore
+from nanobot.agent.tools.search import GlobTool, GrepTool, WorkspaceIndex
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.media.images import max_dimension_for
 from nanobot.providers.base import LLMProvider
 from nanobot.session.manager import Session, SessionManager
 
 if TYPE_CHECKING:
-    from nanobot.config.schema import ChannelsConfig, ExecToolConfig
+    from nanobot.agent.tools.mcp import MCPManager
+    from nanobot.config.schema import ChannelsConfig, ExecToolConfig, SubagentConfig
     from nanobot.cron.service import CronService
 
 
@@ -60,6 +64,7 @@ class AgentLoop:
         brave_api_key: str | None = None,
         web_proxy: str | None = None,
         exec_config: ExecToolConfig | None = None,
+        subagent_config: SubagentConfig | None = None,
         cron_service: CronService | None = None,
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
@@ -83,9 +88,11 @@ class AgentLoop:
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
 
-        self.context = ContextBuilder(workspace)
+        self.context = ContextBuilder(workspace, image_max_dimension=max_dimension_for(self.model))
         self.sessions = session_manager or SessionManager(workspace)
         self.tools = ToolRegistry()
+        self.workspace_index = WorkspaceIndex(workspace)
+        self.results = ResultStore(workspace / "tool_results")
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -98,11 +105,13 @@ class AgentLoop:
             web_proxy=web_proxy,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            workspace_index=self.workspace_index,
+            config=subagent_config,
         )
 
         self._running = False
         self._mcp_servers = mcp_servers or {}
-        self._mcp_stack: AsyncExitStack | None = None
+        self._mcp: MCPManager | None = None
         self._mcp_connected = False
         self._mcp_connecting = False
         self._consolidating: set[str] = set()  # Session keys with consolidation in progress
@@ -117,6 +126,11 @@ class AgentLoop:
         allowed_dir = self.workspace if self.restrict_to_workspace else None
         for cls in (ReadFileTool, WriteFileTool, EditFileTool, ListDirTool):
             self.tools.register(cls(workspace=self.workspace, allowed_dir=allowed_dir))
+        for cls in (GrepTool, GlobTool, ReadFilesTool):
+            self.tools.register(cls(
+                workspace=self.workspace, allowed_dir=allowed_dir, index=self.workspace_index,
+            ))
+        self.tools.register(ReadResultTool(self.results))
         self.tools.register(ExecTool(
             working_dir=str(self.workspace),
             timeout=self.exec_config.timeout,
@@ -135,20 +149,18 @@ class AgentLoop:
         if self._mcp_connected or self._mcp_connecting or not self._mcp_servers:
             return
         self._mcp_connecting = True
-        from nanobot.agent.tools.mcp import connect_mcp_servers
+        from nanobot.agent.tools.mcp import MCPManager
         try:
-            self._mcp_stack = AsyncExitStack()
-            await self._mcp_stack.__aenter__()
-            await connect_mcp_servers(self._mcp_servers, self.tools, self._mcp_stack)
+            self._mcp = MCPManager(
+                self._mcp_servers, self.tools, results=self.results,
+            )
+            await self._mcp.start()
             self._mcp_connected = True
         except Exception as e:
             logger.error("Failed to connect MCP servers (will retry next message): {}", e)
-            if self._mcp_stack:
-                try:
-                    await self._mcp_stack.aclose()
-                except Exception:
-                    pass
-                self._mcp_stack = None
+            if self._mcp:
+                await self._mcp.close()
+                self._mcp = None
         finally:
             self._mcp_connecting = False
 
@@ -229,6 +241,8 @@ class AgentLoop:
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info("Tool call: {}({})", tool_call.name, args_str[:200])
                     result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                    if len(result) > self.results.inline_chars:
+                        result = await asyncio.to_thread(self.results.compact, tool_call.name, result)
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
@@ -315,12 +329,9 @@ class AgentLoop:
 
     async def close_mcp(self) -> None:
         """Close MCP connections."""
-        if self._mcp_stack:
-            try:
-                await self._mcp_stack.aclose()
-            except (RuntimeError, BaseExceptionGroup):
-                pass  # MCP SDK cancel scope cleanup is noisy but harmless
-            self._mcp_stack = None
+        if self._mcp:
+            await self._mcp.close()
+            self._mcp = None
 
     def stop(self) -> None:
         """Stop the agent loop."""
@@ -348,7 +359,7 @@ class AgentLoop:
                 current_message=msg.content, channel=channel, chat_id=chat_id,
             )
             final_content, _, all_msgs = await self._run_agent_loop(messages)
-            self._save_turn(session, all_msgs, 1 + len(history))
+            await self._save_turn(session, all_msgs, 1 + len(history))
             self.sessions.save(session)
             return OutboundMessage(channel=channel, chat_id=chat_id,
                                   content=final_content or "Background task completed.")
@@ -417,6 +428,8 @@ class AgentLoop:
                 message_tool.start_turn()
 
         history = session.get_history(max_messages=self.memory_window)
+        if msg.media:
+            await self.context.prepare_media(msg.media)
         initial_messages = self.context.build_messages(
             history=history,
             current_message=msg.content,
@@ -439,7 +452,7 @@ class AgentLoop:
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
 
-        self._save_turn(session, all_msgs, 1 + len(history))
+        await self._save_turn(session, all_msgs, 1 + len(history))
         self.sessions.save(session)
 
         if (mt := self.tools.get("message")) and isinstance(mt, MessageTool) and mt._sent_in_turn:
@@ -452,7 +465,7 @@ class AgentLoop:
             metadata=msg.metadata or {},
         )
 
-    def _save_turn(self, session: Session, messages: list[dict], skip: int) -> None:
+    async def _save_turn(self, session: Session, messages: list[dict], skip: int) -> None:
         """Save new-turn messages into session, truncating large tool results."""
         from datetime import datetime
         for m in messages[skip:]:
@@ -461,7 +474,9 @@ class AgentLoop:
             if role == "assistant" and not content and not entry.get("tool_calls"):
                 continue  # skip empty assistant messages — they poison session context
             if role == "tool" and isinstance(content, str) and len(content) > self._TOOL_RESULT_MAX_CHARS:
-                entry["content"] = content[:self._TOOL_RESULT_MAX_CHARS] + "\n... (truncated)"
+                entry["content"] = await asyncio.to_thread(
+                    self._truncate_tool_result, entry.get("name") or "tool", content,
+                )
             elif role == "user":
                 if isinstance(content, str) and content.startswith(ContextBuilder._RUNTIME_CONTEXT_TAG):
                     continue
@@ -476,6 +491,21 @@ class AgentLoop:
             session.messages.append(entry)
         session.updated_at = datetime.now()
 
+    def _truncate_tool_result(self, tool_name: str, content: str) -> str:
+        """Shorten a tool result for the session, keeping the full text in the result store."""
+        if content.startswith(f"[{tool_name} output: "):
+            head, _, content = content.partition("\n")  # already stored by compact()
+        elif tool_name == "read_result":
+            head = ""  # a window of something already stored
+        else:
+            try:
+                head = ResultStore.reference(tool_name, content, self.results.put(content))
+            except OSError as e:
+                logger.warning("Could not store tool result: {}", e)
+                head = ""
+        budget = max(0, self._TOOL_RESULT_MAX_CHARS - len(head))
+        return "\n".join(filter(None, [head, content[:budget] + "\n... (truncated)"]))
+
     async def _consolidate_memory(self, session, archive_all: bool = False) -> bool:
         """Delegate to MemoryStore.consolidate(). Returns True on success."""
         return await MemoryStore(self.workspace).consolidate(
@@ -1,25 +1,164 @@
 """Subagent manager for background task execution."""
 
 import asyncio
+import heapq
+import itertools
 import json
+import time
 import uuid
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from loguru import logger
 
+from nanobot.agent.tools.batch import ReadFilesTool
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.search import GlobTool, GrepTool, WorkspaceIndex
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
-from nanobot.bus.events import InboundMessage
+from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
-from nanobot.config.schema import ExecToolConfig
+from nanobot.config.schema import ExecToolConfig, SubagentConfig
 from nanobot.providers.base import LLMProvider
+from nanobot.utils.helpers import ensure_dir
+
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+
+class _PrioritySlots:
+    """Concurrency limit that hands freed slots to waiters by (priority, arrival)."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for *_, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: int) -> None:
+        # A free slot means every entry left in the heap is a cancelled waiter
+        if self.active < self.limit:
+            self.active += 1
+            self._waiters.clear()
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # cancelled right after being handed a slot: pass it on
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            *_, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)  # the slot moves to this waiter
+                return
+        self.active -= 1
+
+
+@dataclass
+class SubagentStats:
+    """Pool counters and queue-wait times."""
+
+    spawned: int = 0
+    rejected: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    def record_wait(self, wait_s: float) -> None:
+        self.total_wait_s += wait_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+
+    def to_dict(self) -> dict[str, Any]:
+        started = self.completed + self.failed
+        return {
+            **self.__dict__,
+            "avg_wait_s": self.total_wait_s / started if started else 0.0,
+        }
+
+
+class SubagentTranscript:
+    """
+    Append-only JSONL checkpoint of one subagent run.
+
+    The first line holds the task metadata, every later line one message of
+    the conversation (the system prompt is rebuilt on resume and not stored).
+    Write failures are logged once and otherwise ignored: a checkpoint is a
+    convenience, never a reason to fail the task.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._failed = False
+
+    def start(self, meta: dict[str, Any], messages: list[dict[str, Any]]) -> None:
+        header = {"_type": "metadata", "created_at": datetime.now().isoformat(), **meta}
+        self._write("w", [header, *messages])
+
+    def append(self, message: dict[str, Any]) -> None:
+        self._write("a", [message])
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    def _write(self, mode: str, lines: list[dict[str, Any]]) -> None:
+        try:
+            ensure_dir(self.path.parent)
+            with open(self.path, mode, encoding="utf-8") as f:
+                f.writelines(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+        except OSError as e:
+            if not self._failed:
+                logger.warning("Subagent checkpoint {} not writable: {}", self.path.name, e)
+            self._failed = True
+
+    @staticmethod
+    def load(path: Path) -> tuple[dict[str, Any], list[dict[str, Any]]] | None:
+        """Read a checkpoint, dropping a trailing tool-call round that did not finish."""
+        try:
+            lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable subagent checkpoint {}: {}", path.name, e)
+            return None
+        if not lines or lines[0].get("_type") != "metadata":
+            return None
+        meta, messages = lines[0], lines[1:]
+        for i in range(len(messages) - 1, -1, -1):
+            calls = messages[i].get("tool_calls")
+            if calls:
+                answered = {m.get("tool_call_id") for m in messages[i + 1:]}
+                if not {c["id"] for c in calls} <= answered:
+                    messages = messages[:i]
+                break
+        return meta, messages
 
 
 class SubagentManager:
-    """Manages background subagent execution."""
+    """
+    Manages background subagent execution.
+
+    Subagents run on a bounded pool: at most config.max_concurrent talk to
+    the provider at once and the rest wait, high priority first, then in
+    spawn order. Each chat session may have config.max_per_session running
+    or queued. All subagents share one tool registry and a system prompt
+    that is only rebuilt when the skills on disk change.
+
+    Every subagent's conversation is checkpointed to
+    <workspace>/subagents/<task_id>.jsonl as it runs; resume_pending()
+    restarts unfinished ones after a restart, and long runs post progress
+    updates to the origin chat every config.progress_interval seconds.
+    """
 
     def __init__(
         self,
@@ -34,8 +173,10 @@ class SubagentManager:
         web_proxy: str | None = None,
         exec_config: "ExecToolConfig | None" = None,
         restrict_to_workspace: bool = False,
+        workspace_index: WorkspaceIndex | None = None,
+        config: SubagentConfig | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, SubagentConfig
         self.provider = provider
         self.workspace = workspace
         self.bus = bus
@@ -47,7 +188,14 @@ class SubagentManager:
         self.web_proxy = web_proxy
         self.exec_config = exec_config or ExecToolConfig()
         self.restrict_to_workspace = restrict_to_workspace
-        self._running_tasks: dict[str, asyncio.Task[None]] = {}
+        self.workspace_index = workspace_index or WorkspaceIndex(workspace)
+        self.config = config or SubagentConfig()
+        self.stats = SubagentStats()
+        self._slots = _PrioritySlots(self.config.max_concurrent)
+        self._tools: ToolRegistry | None = None
+        self._prompt_cache: tuple[tuple, str] | None = None  # (skills signature, prompt body)
+        self.checkpoint_dir = workspace / "subagents"
+        self._running_tasks: dict[str, asyncio.Task[None]] = {}  # running and queued
         self._session_tasks: dict[str, set[str]] = {}  # session_key -> {task_id, ...}
 
     async def spawn(
@@ -57,20 +205,53 @@ class SubagentManager:
         origin_channel: str = "cli",
         origin_chat_id: str = "direct",
         session_key: str | None = None,
+        priority: str = "normal",
     ) -> str:
         """Spawn a subagent to execute a task in the background."""
+        limit = self.config.max_per_session
+        if session_key and len(self._session_tasks.get(session_key, ())) >= limit:
+            self.stats.rejected += 1
+            return (
+                f"Error: this chat already has {limit} subagents running or queued. "
+                "Wait for one to finish before spawning another."
+            )
+
         task_id = str(uuid.uuid4())[:8]
         display_label = label or task[:30] + ("..." if len(task) > 30 else "")
         origin = {"channel": origin_channel, "chat_id": origin_chat_id}
+        queued = len(self._running_tasks) >= self._slots.limit  # every live task holds or awaits a slot
+
+        meta = {
+            "task_id": task_id, "label": display_label, "task": task, "origin": origin,
+            "session_key": session_key, "priority": PRIORITIES.get(priority, 1),
+        }
+        transcript = SubagentTranscript(self.checkpoint_dir / f"{task_id}.jsonl")
+        transcript.start(meta, [])
+        self._launch(meta, transcript, [])
+        self.stats.spawned += 1
+
+        if queued:
+            logger.info("Queued subagent [{}] ({} waiting): {}", task_id, self._slots.waiting + 1, display_label)
+            return (
+                f"Subagent [{display_label}] queued (id: {task_id}); it will start when one of the "
+                f"{self._slots.limit} running subagents finishes. I'll notify you when it completes."
+            )
+        logger.info("Spawned subagent [{}]: {}", task_id, display_label)
+        return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
 
-        bg_task = asyncio.create_task(
-            self._run_subagent(task_id, task, display_label, origin)
-        )
+    def _launch(
+        self, meta: dict[str, Any], transcript: SubagentTranscript, history: list[dict[str, Any]]
+    ) -> None:
+        """Start the background task for a new or resumed subagent and track it."""
+        task_id, session_key = meta["task_id"], meta.get("session_key")
+        bg_task = asyncio.create_task(self._run_subagent(meta, transcript, history))
         self._running_tasks[task_id] = bg_task
         if session_key:
             self._session_tasks.setdefault(session_key, set()).add(task_id)
 
-        def _cleanup(_: asyncio.Task) -> None:
+        def _cleanup(t: asyncio.Task) -> None:
+            if t.cancelled():
+                self.stats.cancelled += 1
             self._running_tasks.pop(task_id, None)
             if session_key and (ids := self._session_tasks.get(session_key)):
                 ids.discard(task_id)
@@ -79,46 +260,67 @@ class SubagentManager:
 
         bg_task.add_done_callback(_cleanup)
 
-        logger.info("Spawned subagent [{}]: {}", task_id, display_label)
-        return f"Subagent [{display_label}] started (id: {task_id}). I'll notify you when it completes."
+    async def resume_pending(self) -> int:
+        """Restart subagents whose checkpoints survived a shutdown. Returns count resumed."""
+        if not self.checkpoint_dir.is_dir():
+            return 0
+        paths = sorted(self.checkpoint_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime)
+        resumed = 0
+        for path in paths:
+            loaded = SubagentTranscript.load(path)
+            if loaded is None or loaded[0].get("task_id") in self._running_tasks:
+                continue
+            meta, history = loaded
+            meta.pop("_type", None)
+            meta.pop("created_at", None)
+            transcript = SubagentTranscript(path)
+            transcript.start(meta, history)  # rewrite without any unfinished tail
+            self._launch(meta, transcript, history)
+            resumed += 1
+            logger.info("Resuming subagent [{}] from checkpoint ({} messages)", meta["task_id"], len(history))
+        return resumed
 
     async def _run_subagent(
-        self,
-        task_id: str,
-        task: str,
-        label: str,
-        origin: dict[str, str],
+        self, meta: dict[str, Any], transcript: SubagentTranscript, history: list[dict[str, Any]]
+    ) -> None:
+        """Wait for a pool slot, then execute the subagent task and announce the result."""
+        queued_at = time.monotonic()
+        await self._slots.acquire(meta.get("priority", 1))
+        try:
+            wait = time.monotonic() - queued_at
+            self.stats.record_wait(wait)
+            if wait >= 1:
+                logger.info("Subagent [{}] waited {:.1f}s for a slot", meta["task_id"], wait)
+            await self._execute_subagent(meta, transcript, history)
+        finally:
+            self._slots.release()
+
+    async def _execute_subagent(
+        self, meta: dict[str, Any], transcript: SubagentTranscript, history: list[dict[str, Any]]
     ) -> None:
-        """Execute the subagent task and announce the result."""
+        """Execute (or continue) the subagent task, checkpointing each message, and announce the result."""
+        task_id, task, label, origin = meta["task_id"], meta["task"], meta["label"], meta["origin"]
         logger.info("Subagent [{}] starting task: {}", task_id, label)
 
+        def _add(message: dict[str, Any]) -> None:
+            messages.append(message)
+            transcript.append(message)
+
         try:
-            # Build subagent tools (no message tool, no spawn tool)
-            tools = ToolRegistry()
-            allowed_dir = self.workspace if self.restrict_to_workspace else None
-            tools.register(ReadFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
-            tools.register(WriteFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
-            tools.register(EditFileTool(workspace=self.workspace, allowed_dir=allowed_dir))
-            tools.register(ListDirTool(workspace=self.workspace, allowed_dir=allowed_dir))
-            tools.register(ExecTool(
-                working_dir=str(self.workspace),
-                timeout=self.exec_config.timeout,
-                restrict_to_workspace=self.restrict_to_workspace,
-                path_append=self.exec_config.path_append,
-            ))
-            tools.register(WebSearchTool(api_key=self.brave_api_key, proxy=self.web_proxy))
-            tools.register(WebFetchTool(proxy=self.web_proxy))
-            
+            tools = self._get_tools()
             system_prompt = self._build_subagent_prompt()
-            messages: list[dict[str, Any]] = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": task},
-            ]
-
-            # Run agent loop (limited iterations)
-            max_iterations = 15
-            iteration = 0
+            messages: list[dict[str, Any]] = [{"role": "system", "content": system_prompt}, *history]
+            if not history:
+                _add({"role": "user", "content": task})
+
+            # Run agent loop (limited iterations), counting rounds already in the checkpoint
+            max_iterations = self.config.max_iterations
+            iteration = sum(1 for m in history if m.get("role") == "assistant")
             final_result: str | None = None
+            if history and history[-1].get("role") == "assistant" and not history[-1].get("tool_calls"):
+                final_result = history[-1].get("content")  # finished but never announced
+                iteration = max_iterations
+            last_progress = time.monotonic()
 
             while iteration < max_iterations:
                 iteration += 1
@@ -145,7 +347,7 @@ class SubagentManager:
                         }
                         for tc in response.tool_calls
                     ]
-                    messages.append({
+                    _add({
                         "role": "assistant",
                         "content": response.content or "",
                         "tool_calls": tool_call_dicts,
@@ -156,26 +358,68 @@ class SubagentManager:
                         args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                         logger.debug("Subagent [{}] executing: {} with arguments: {}", task_id, tool_call.name, args_str)
                         result = await tools.execute(tool_call.name, tool_call.arguments)
-                        messages.append({
+                        _add({
                             "role": "tool",
                             "tool_call_id": tool_call.id,
                             "name": tool_call.name,
                             "content": result,
                         })
+
+                    interval = self.config.progress_interval
+                    if interval and time.monotonic() - last_progress >= interval:
+                        last_progress = time.monotonic()
+                        await self._report_progress(label, origin, iteration, response)
                 else:
                     final_result = response.content
+                    _add({"role": "assistant", "content": final_result or ""})
                     break
 
             if final_result is None:
                 final_result = "Task completed but no final response was generated."
 
             logger.info("Subagent [{}] completed successfully", task_id)
+            self.stats.completed += 1
             await self._announce_result(task_id, label, task, final_result, origin, "ok")
 
         except Exception as e:
+            self.stats.failed += 1
             error_msg = f"Error: {str(e)}"
             logger.error("Subagent [{}] failed: {}", task_id, e)
             await self._announce_result(task_id, label, task, error_msg, origin, "error")
+        transcript.remove()
+
+    async def _report_progress(self, label: str, origin: dict[str, str], iteration: int, response: Any) -> None:
+        """Post a short progress line for a long-running subagent to its origin chat."""
+        note = (response.content or "").strip()
+        if len(note) > 200:
+            note = note[:200] + "…"
+        note = note or "working: " + ", ".join(tc.name for tc in response.tool_calls)
+        await self.bus.publish_outbound(OutboundMessage(
+            channel=origin["channel"],
+            chat_id=origin["chat_id"],
+            content=f"[{label}] step {iteration}/{self.config.max_iterations}: {note}",
+            metadata={"_progress": True, "_subagent": True},
+        ))
+
+    def _get_tools(self) -> ToolRegistry:
+        """Tools shared by all subagents (no message tool, no spawn tool), built on first use."""
+        if self._tools is None:
+            tools = ToolRegistry()
+            allowed_dir = self.workspace if self.restrict_to_workspace else None
+            for cls in (ReadFileTool, WriteFileTool, EditFileTool, ListDirTool):
+                tools.register(cls(workspace=self.workspace, allowed_dir=allowed_dir))
+            for cls in (GrepTool, GlobTool, ReadFilesTool):
+                tools.register(cls(workspace=self.workspace, allowed_dir=allowed_dir, index=self.workspace_index))
+            tools.register(ExecTool(
+                working_dir=str(self.workspace),
+                timeout=self.exec_config.timeout,
+                restrict_to_workspace=self.restrict_to_workspace,
+                path_append=self.exec_config.path_append,
+            ))
+            tools.register(WebSearchTool(api_key=self.brave_api_key, proxy=self.web_proxy))
+            tools.register(WebFetchTool(proxy=self.web_proxy))
+            self._tools = tools
+        return self._tools
 
     async def _announce_result(
         self,
@@ -212,35 +456,60 @@ Summarize this naturally for the user. Keep it brief (1-2 sentences). Do not men
     def _build_subagent_prompt(self) -> str:
         """Build a focused system prompt for the subagent."""
         from nanobot.agent.context import ContextBuilder
-        from nanobot.agent.skills import SkillsLoader
 
         time_ctx = ContextBuilder._build_runtime_context(None, None)
-        parts = [f"""# Subagent
+        return f"# Subagent\n\n{time_ctx}\n\n{self._prompt_body()}"
 
-{time_ctx}
+    def _prompt_body(self) -> str:
+        """Everything after the runtime context; cached until a skill is added, removed or edited."""
+        from nanobot.agent.skills import SkillsLoader
+
+        loader = SkillsLoader(self.workspace)
+        signature = tuple(
+            (str(p), p.stat().st_mtime_ns)
+            for root in (loader.workspace_skills, loader.builtin_skills)
+            if root and root.is_dir()
+            for p in [root, *root.glob("*/SKILL.md")]
+        )
+        if self._prompt_cache and self._prompt_cache[0] == signature:
+            return self._prompt_cache[1]
 
-You are a subagent spawned by the main agent to complete a specific task.
+        parts = [f"""You are a subagent spawned by the main agent to complete a specific task.
 Stay focused on the assigned task. Your final response will be reported back to the main agent.
 
 ## Workspace
 {self.workspace}"""]
 
-        skills_summary = SkillsLoader(self.workspace).build_skills_summary()
+        skills_summary = loader.build_skills_summary()
         if skills_summary:
             parts.append(f"## Skills\n\nRead SKILL.md with read_file to use a skill.\n\n{skills_summary}")
 
-        return "\n\n".join(parts)
-    
+        body = "\n\n".join(parts)
+        self._prompt_cache = (signature, body)
+        return body
+
     async def cancel_by_session(self, session_key: str) -> int:
         """Cancel all subagents for the given session. Returns count cancelled."""
-        tasks = [self._running_tasks[tid] for tid in self._session_tasks.get(session_key, [])
-                 if tid in self._running_tasks and not self._running_tasks[tid].done()]
+        ids = [tid for tid in self._session_tasks.get(session_key, [])
+               if tid in self._running_tasks and not self._running_tasks[tid].done()]
+        tasks = [self._running_tasks[tid] for tid in ids]
         for t in tasks:
             t.cancel()
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
+        for tid in ids:  # stopped on purpose: don't resume after a restart
+            (self.checkpoint_dir / f"{tid}.jsonl").unlink(missing_ok=True)
         return len(tasks)
 
     def get_running_count(self) -> int:
-        """Return the number of currently running subagents."""
+        """Return the number of running and queued subagents."""
         return len(self._running_tasks)
+
+    def status(self) -> dict[str, Any]:
+        """Pool occupancy and counters."""
+        return {
+            "running": self._slots.active,
+            "queued": self._slots.waiting,
+            "max_concurrent": self._slots.limit,
+            **self.stats.to_dict(),
+        }
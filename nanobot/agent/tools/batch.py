@@ -0,0 +1,147 @@
+"""Batch file tool: read many files in one call."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.tools.filesystem import _resolve_path
+from nanobot.agent.tools.search import _SearchTool
+
+_GLOB_CHARS = set("*?[")
+
+
+class ReadFilesTool(_SearchTool):
+    """Tool to read several files (or glob matches) concurrently under one byte budget."""
+
+    _MAX_TOTAL_BYTES = 256_000
+    _MAX_FILES = 50
+    _BINARY = "Error: Binary file"
+    _pool: ThreadPoolExecutor | None = None
+
+    @property
+    def name(self) -> str:
+        return "read_files"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read multiple files in one call. Each entry in paths is a file path or a glob "
+            "(e.g. 'src/*.py'; a pattern without '/' matches file names at any depth). "
+            "Output is capped by a total byte budget shared across files."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "File paths or glob patterns to read",
+                },
+                "max_bytes": {
+                    "type": "integer",
+                    "description": f"Total byte budget (default {self._MAX_TOTAL_BYTES})",
+                    "minimum": 1000,
+                    "maximum": 1_000_000,
+                },
+            },
+            "required": ["paths"],
+        }
+
+    @classmethod
+    def _executor(cls) -> ThreadPoolExecutor:
+        if cls._pool is None:
+            cls._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="nanobot-read")
+        return cls._pool
+
+    async def execute(self, paths: list[str], max_bytes: int | None = None, **kwargs: Any) -> str:
+        budget = max_bytes or self._MAX_TOTAL_BYTES
+        targets: list[tuple[str, Path | None, str | None, bool]] = []  # (shown, path, error, from glob)
+        seen: set[Path] = set()
+        for raw in paths:
+            try:
+                expanded = await asyncio.to_thread(self._expand, raw)
+            except (PermissionError, NotADirectoryError) as e:
+                targets.append((raw, None, f"Error: {e}", False))
+                continue
+            if not expanded:
+                targets.append((raw, None, "Error: No files match", False))
+            for shown, path in expanded:
+                if path not in seen:
+                    seen.add(path)
+                    targets.append((shown, path, None, shown != raw))
+
+        dropped = max(0, len(targets) - self._MAX_FILES)
+        targets = targets[: self._MAX_FILES]
+        loop = asyncio.get_running_loop()
+        reads = await asyncio.gather(*(
+            loop.run_in_executor(self._executor(), self._read_one, path, budget)
+            for _, path, error, _ in targets if error is None
+        ))
+
+        sections: list[str] = []
+        skipped: list[str] = []
+        remaining, returned, read_iter = budget, 0, iter(reads)
+        for shown, _, error, from_glob in targets:
+            if error:
+                sections.append(f"=== {shown} ===\n{error}")
+                continue
+            size, data, error = next(read_iter)
+            if error and from_glob and error.startswith(self._BINARY):
+                continue  # glob matches skip binaries quietly, like grep
+            if error:
+                sections.append(f"=== {shown} ===\n{error}")
+            elif remaining <= 0:
+                skipped.append(shown)
+            else:
+                header = f"{shown} ({size} bytes"
+                data = data[:remaining]
+                if len(data) < size:
+                    header += f", truncated to {len(data)}"
+                remaining -= len(data)
+                returned += len(data)
+                sections.append(f"=== {header}) ===\n" + data.decode("utf-8", errors="replace"))
+
+        summary = f"[read_files: {len(targets)} entries, {returned} bytes returned"
+        if skipped:
+            summary += f"; byte budget exhausted, not read: {', '.join(skipped)}"
+        if dropped:
+            summary += f"; {dropped} more entries over the {self._MAX_FILES}-file limit"
+        return "\n\n".join(sections + [summary + "]"])
+
+    def _expand(self, raw: str) -> list[tuple[str, Path]]:
+        """Resolve a path, or expand a glob through the workspace index."""
+        parts = Path(raw).parts
+        glob_at = next((i for i, p in enumerate(parts) if _GLOB_CHARS & set(p)), None)
+        if glob_at is None:
+            return [(raw, _resolve_path(raw, self._workspace, self._allowed_dir))]
+
+        base = str(Path(*parts[:glob_at])) if glob_at else None
+        pattern = "/".join(parts[glob_at:])
+        root, index = self._root_and_index(base)
+        index.refresh()  # stats only; never reads contents or builds trigrams
+        matches = []
+        for rel in self._scoped(index, root, index.files):
+            under_root = (index.root / rel).relative_to(root).as_posix()
+            if self._matches_glob(under_root, pattern):
+                shown = f"{base}/{under_root}" if base else under_root
+                matches.append((shown, index.root / rel))
+        return matches
+
+    @staticmethod
+    def _read_one(path: Path, budget: int) -> tuple[int, bytes, str | None]:
+        """Read at most `budget` bytes; returns (file size, data, error)."""
+        try:
+            if not path.is_file():
+                return 0, b"", "Error: Not a file" if path.exists() else "Error: File not found"
+            size = path.stat().st_size
+            with open(path, "rb") as f:
+                data = f.read(budget)
+            if b"\0" in data[:8192]:
+                return size, b"", f"{ReadFilesTool._BINARY} ({size} bytes)"
+            return size, data, None
+        except Exception as e:
+            return 0, b"", f"Error reading file: {e}"
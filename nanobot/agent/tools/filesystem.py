@@ -1,11 +1,23 @@
 """File system tools: read, write, edit."""
 
 import difflib
+import mmap
+import re
+import time
+from bisect import bisect_right
+from collections import Counter, OrderedDict
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from nanobot.agent.tools.base import Tool
 
+# Directories never worth descending into when walking a tree
+_SKIP_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox",
+})
+
 
 def _resolve_path(
     path: str, workspace: Path | None = None, allowed_dir: Path | None = None
@@ -23,12 +35,65 @@ def _resolve_path(
     return resolved
 
 
+class _LineIndex:
+    """
+    Sparse line-number -> byte-offset index for one file version.
+
+    Checkpoints are recorded roughly every CHUNK bytes and only as far as
+    reads have reached, so a window near the top of a multi-GB log never
+    scans the rest of it, and later windows resume from the nearest checkpoint.
+    """
+
+    CHUNK = 1 << 20
+
+    def __init__(self, stamp: tuple[int, int]):
+        self.stamp = stamp  # (st_mtime_ns, st_size) the index was built for
+        self.lines = [0]  # 0-based line number starting at each checkpoint
+        self.offsets = [0]
+        self.total: int | None = None  # line count, once the whole file was scanned
+
+    def seek(self, mm: mmap.mmap, line: int) -> int:
+        """Return the byte offset where 0-based `line` starts (len(mm) if past EOF)."""
+        size = len(mm)
+        while self.total is None and self.lines[-1] <= line:
+            pos = self.offsets[-1]
+            end = min(pos + self.CHUNK, size)
+            if end < size:
+                nl = mm.find(b"\n", end)
+                end = size if nl == -1 else nl + 1
+            count = mm[pos:end].count(b"\n")
+            if end >= size:
+                self.total = self.lines[-1] + count + int(mm[size - 1] != ord("\n"))
+                break
+            self.lines.append(self.lines[-1] + count)
+            self.offsets.append(end)
+
+        i = bisect_right(self.lines, line) - 1
+        current, offset = self.lines[i], self.offsets[i]
+        while current < line and offset < size:
+            nl = mm.find(b"\n", offset)
+            offset = size if nl == -1 else nl + 1
+            current += 1
+        return offset
+
+
 class ReadFileTool(Tool):
     """Tool to read file contents."""
 
-    def __init__(self, workspace: Path | None = None, allowed_dir: Path | None = None):
+    _MAX_BYTES = 128_000
+    _BINARY_SNIFF_BYTES = 8192
+    _INDEX_CACHE_SIZE = 32
+
+    def __init__(
+        self,
+        workspace: Path | None = None,
+        allowed_dir: Path | None = None,
+        max_bytes: int = _MAX_BYTES,
+    ):
         self._workspace = workspace
         self._allowed_dir = allowed_dir
+        self._max_bytes = max_bytes
+        self._indexes: OrderedDict[Path, _LineIndex] = OrderedDict()
 
     @property
     def name(self) -> str:
@@ -36,17 +101,45 @@ class ReadFileTool(Tool):
 
     @property
     def description(self) -> str:
-        return "Read the contents of a file at the given path."
+        return (
+            "Read the contents of a file at the given path. "
+            f"Output is capped at {self._max_bytes} bytes; use offset/limit to read "
+            "large files in line windows, and column to continue a line that was cut."
+        )
 
     @property
     def parameters(self) -> dict[str, Any]:
         return {
             "type": "object",
-            "properties": {"path": {"type": "string", "description": "The file path to read"}},
+            "properties": {
+                "path": {"type": "string", "description": "The file path to read"},
+                "offset": {
+                    "type": "integer",
+                    "description": "Line number to start reading from (1-based)",
+                    "minimum": 1,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of lines to read",
+                    "minimum": 1,
+                },
+                "column": {
+                    "type": "integer",
+                    "description": "Byte position in the offset line to start from (1-based)",
+                    "minimum": 1,
+                },
+            },
             "required": ["path"],
         }
 
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self,
+        path: str,
+        offset: int | None = None,
+        limit: int | None = None,
+        column: int | None = None,
+        **kwargs: Any,
+    ) -> str:
         try:
             file_path = _resolve_path(path, self._workspace, self._allowed_dir)
             if not file_path.exists():
@@ -54,13 +147,87 @@ class ReadFileTool(Tool):
             if not file_path.is_file():
                 return f"Error: Not a file: {path}"
 
-            content = file_path.read_text(encoding="utf-8")
-            return content
+            st = file_path.stat()
+            with open(file_path, "rb") as f:
+                if b"\0" in f.read(self._BINARY_SNIFF_BYTES):
+                    return f"Error: {path} appears to be a binary file ({st.st_size} bytes)"
+            if st.st_size == 0:
+                return ""
+            if offset is None and limit is None and column is None and st.st_size <= self._max_bytes:
+                return file_path.read_text(encoding="utf-8")
+
+            return self._read_window(
+                file_path, (st.st_mtime_ns, st.st_size), offset or 1, limit, column or 1
+            )
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
+    def _line_index(self, file_path: Path, stamp: tuple[int, int]) -> _LineIndex:
+        """Get the cached line index for this file version, replacing stale ones."""
+        index = self._indexes.get(file_path)
+        if index is None or index.stamp != stamp:
+            index = _LineIndex(stamp)
+        self._indexes[file_path] = index
+        self._indexes.move_to_end(file_path)
+        while len(self._indexes) > self._INDEX_CACHE_SIZE:
+            self._indexes.popitem(last=False)
+        return index
+
+    def _read_window(
+        self,
+        file_path: Path,
+        stamp: tuple[int, int],
+        offset: int,
+        limit: int | None,
+        column: int = 1,
+    ) -> str:
+        """Read up to `limit` lines from 1-based `offset` (and byte `column`), within the byte cap."""
+        index = self._line_index(file_path, stamp)
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            line_start = index.seek(mm, offset - 1)
+            if line_start >= size:
+                return f"Error: offset {offset} is beyond end of file ({index.total} lines)"
+            if column > 1:
+                nl = mm.find(b"\n", line_start)
+                line_len = (size if nl == -1 else nl) - line_start
+                if column > line_len:
+                    return f"Error: column {column} is beyond end of line {offset} ({line_len} bytes)"
+            start = line_start + column - 1
+
+            end, count, truncated, cut_at = start, 0, False, 0
+            while end < size and (limit is None or count < limit):
+                nl = mm.find(b"\n", end)
+                line_end = size if nl == -1 else nl + 1
+                if line_end - start > self._max_bytes:
+                    truncated = True
+                    if count == 0:  # a single huge line: cut it mid-line
+                        end, count = start + self._max_bytes, 1
+                        cut_at = end - line_start + 1
+                    break
+                end, count = line_end, count + 1
+            text = mm[start:end].decode("utf-8", errors="replace")
+
+        last = offset + count - 1
+        if end >= size and not truncated:
+            if offset == 1:
+                return text
+            index.total = last
+        total = index.total if index.total is not None else "unknown"
+        notice = f"[Showing lines {offset}-{last} of {total}"
+        if truncated:
+            notice += f", truncated at {self._max_bytes} bytes"
+        if cut_at:
+            notice += (
+                f". Line {offset} was cut; use offset={offset}, column={cut_at} "
+                "to read the rest of it"
+            )
+        elif end < size:
+            notice += f". Use offset={last + 1} to continue"
+        return text.rstrip("\n") + f"\n\n{notice}.]"
+
 
 class WriteFileTool(Tool):
     """Tool to write content to a file."""
@@ -159,11 +326,7 @@ class EditFileTool(Tool):
         old_lines = old_text.splitlines(keepends=True)
         window = len(old_lines)
 
-        best_ratio, best_start = 0.0, 0
-        for i in range(max(1, len(lines) - window + 1)):
-            ratio = difflib.SequenceMatcher(None, old_lines, lines[i : i + window]).ratio()
-            if ratio > best_ratio:
-                best_ratio, best_start = ratio, i
+        best_ratio, best_start = _find_similar_block(old_lines, lines)
 
         if best_ratio > 0.5:
             diff = "\n".join(
@@ -181,9 +344,73 @@ class EditFileTool(Tool):
         )
 
 
+_TOKEN_RE = re.compile(r"\w+")
+_MATCH_CANDIDATES = 16
+_MATCH_BUDGET_S = 0.5
+
+
+def _find_similar_block(
+    old_lines: list[str], lines: list[str], budget_s: float = _MATCH_BUDGET_S
+) -> tuple[float, int]:
+    """
+    Locate the block of `lines` most similar to `old_lines`.
+
+    Instead of diffing every window, candidate start lines are voted for by
+    anchors: identical (whitespace-stripped) lines and rare word tokens shared
+    with the file. Only the top candidates get a character-level diff, within
+    a time budget. Returns (ratio, start_line); ratio is 0.0 if nothing matched.
+    """
+    window = len(old_lines)
+    if not window or not lines:
+        return 0.0, 0
+    deadline = time.monotonic() + budget_s
+    last_start = max(0, len(lines) - window)
+
+    line_index: dict[str, list[int]] = {}
+    token_index: dict[str, list[int]] = {}
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        line_index.setdefault(stripped, []).append(i)
+        for tok in set(_TOKEN_RE.findall(stripped)):
+            token_index.setdefault(tok, []).append(i)
+
+    # Tokens present on many lines (keywords, common names) carry no position signal
+    max_df = max(8, len(lines) // 20)
+    votes: Counter[int] = Counter()
+    for j, old in enumerate(old_lines):
+        stripped = old.strip()
+        if not stripped:
+            continue
+        for i in line_index.get(stripped, ()):
+            votes[min(max(i - j, 0), last_start)] += 2
+        tokens = [t for t in set(_TOKEN_RE.findall(stripped)) if len(token_index.get(t, ())) <= max_df]
+        for tok in tokens:
+            for i in token_index.get(tok, ()):
+                votes[min(max(i - j, 0), last_start)] += 1 / len(tokens)
+
+    old_text = "".join(old_lines)
+    autojunk = len(old_text) > 20_000  # junk heuristic only where a full diff gets expensive
+    best_ratio, best_start = 0.0, 0
+    for start, _ in votes.most_common(_MATCH_CANDIDATES):
+        candidate = "".join(lines[start : start + window])
+        matcher = difflib.SequenceMatcher(None, old_text, candidate, autojunk=autojunk)
+        if matcher.real_quick_ratio() <= best_ratio or matcher.quick_ratio() <= best_ratio:
+            continue
+        ratio = matcher.ratio()
+        if ratio > best_ratio:
+            best_ratio, best_start = ratio, start
+        if time.monotonic() > deadline:
+            break
+    return best_ratio, best_start
+
+
 class ListDirTool(Tool):
     """Tool to list directory contents."""
 
+    _MAX_ENTRIES = 500
+
     def __init__(self, workspace: Path | None = None, allowed_dir: Path | None = None):
         self._workspace = workspace
         self._allowed_dir = allowed_dir
@@ -194,17 +421,31 @@ class ListDirTool(Tool):
 
     @property
     def description(self) -> str:
-        return "List the contents of a directory."
+        return (
+            "List the contents of a directory. Set depth > 1 to recurse and details=true "
+            "to include size and modification time."
+        )
 
     @property
     def parameters(self) -> dict[str, Any]:
         return {
             "type": "object",
-            "properties": {"path": {"type": "string", "description": "The directory path to list"}},
+            "properties": {
+                "path": {"type": "string", "description": "The directory path to list"},
+                "depth": {
+                    "type": "integer",
+                    "description": "How many levels to descend (default 1)",
+                    "minimum": 1,
+                    "maximum": 5,
+                },
+                "details": {"type": "boolean", "description": "Include size and mtime columns"},
+            },
             "required": ["path"],
         }
 
-    async def execute(self, path: str, **kwargs: Any) -> str:
+    async def execute(
+        self, path: str, depth: int = 1, details: bool = False, **kwargs: Any
+    ) -> str:
         try:
             dir_path = _resolve_path(path, self._workspace, self._allowed_dir)
             if not dir_path.exists():
@@ -212,16 +453,38 @@ class ListDirTool(Tool):
             if not dir_path.is_dir():
                 return f"Error: Not a directory: {path}"
 
-            items = []
-            for item in sorted(dir_path.iterdir()):
-                prefix = "📁 " if item.is_dir() else "📄 "
-                items.append(f"{prefix}{item.name}")
+            items: list[str] = []
+            truncated = self._walk(dir_path, dir_path, depth, details, items)
 
             if not items:
                 return f"Directory {path} is empty"
-
+            if truncated:
+                items.append(f"... (stopped at {self._MAX_ENTRIES} entries; list a subdirectory)")
             return "\n".join(items)
         except PermissionError as e:
             return f"Error: {e}"
         except Exception as e:
             return f"Error listing directory: {str(e)}"
+
+    def _walk(self, root: Path, current: Path, depth: int, details: bool, items: list[str]) -> bool:
+        """Append entries under `current` to items; returns True if the entry cap was hit."""
+        for item in sorted(current.iterdir()):
+            if len(items) >= self._MAX_ENTRIES:
+                return True
+            is_dir = item.is_dir()
+            prefix = "📁 " if is_dir else "📄 "
+            line = f"{prefix}{item.relative_to(root).as_posix()}"
+            if details:
+                try:
+                    st = item.stat()
+                except OSError:  # broken symlink or vanished entry
+                    line = f"{line}  ?  ?"
+                else:
+                    size = "-" if is_dir else str(st.st_size)
+                    mtime = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
+                    line = f"{line}  {size}  {mtime}"
+            items.append(line)
+            if is_dir and depth > 1 and item.name not in _SKIP_DIRS and not item.is_symlink():
+                if self._walk(root, item, depth - 1, details, items):
+                    return True
+        return False
@@ -1,26 +1,267 @@
 """MCP client: connects to MCP servers and wraps their tools as native nanobot tools."""
 
 import asyncio
+import base64
+import hashlib
+import json
+import mimetypes
+import time
 from contextlib import AsyncExitStack
-from typing import Any
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
 
 import httpx
 from loguru import logger
 
 from nanobot.agent.tools.base import Tool
 from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.agent.tools.results import ResultStore
+from nanobot.utils.helpers import ensure_dir, get_data_path, safe_filename
+
+
+class MCPServerUnavailableError(RuntimeError):
+    """Raised instead of connecting while a failed server is backing off."""
+
+
+@dataclass
+class MCPServerStats:
+    """Per-server call counters and latencies."""
+
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    reconnects: int = 0
+    total_latency_s: float = 0.0
+    max_latency_s: float = 0.0
+
+    def record(self, latency_s: float, outcome: str = "ok") -> None:
+        self.calls += 1
+        self.total_latency_s += latency_s
+        self.max_latency_s = max(self.max_latency_s, latency_s)
+        if outcome == "error":
+            self.errors += 1
+        elif outcome == "timeout":
+            self.timeouts += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        avg = self.total_latency_s / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls, "errors": self.errors, "timeouts": self.timeouts,
+            "reconnects": self.reconnects, "avg_latency_ms": round(avg * 1000, 1),
+            "max_latency_ms": round(self.max_latency_s * 1000, 1),
+        }
+
+
+class MCPServerConnection:
+    """
+    One MCP server session, owned by a dedicated task.
+
+    The MCP SDK's transports are anyio task groups that must be entered and
+    exited from the same task, so each server gets its own long-lived task
+    that opens the transport, completes the handshake, then parks until
+    close() is called. This lets servers be connected concurrently, started
+    lazily on first use, and torn down independently.
+
+    After a failure the connection refuses to reconnect until an exponential
+    backoff expires, so tool calls against a dead server fail immediately.
+    """
+
+    _BACKOFF_MAX_S = 300.0
+
+    def __init__(
+        self,
+        name: str,
+        cfg: Any,
+        on_connect: Callable[["MCPServerConnection"], Awaitable[None]] | None = None,
+    ):
+        self.name = name
+        self.cfg = cfg
+        self.session = None
+        self.tools: list = []  # mcp.types.Tool definitions from the last handshake
+        self.stats = MCPServerStats()
+        self.last_error: str | None = None
+        self.retry_at = 0.0  # monotonic time before which connects fail fast
+        self.wanted = asyncio.Event()  # set once anything asked for this server
+        self._failures = 0
+        self._on_connect = on_connect
+        self._task: asyncio.Task | None = None
+        self._ready: asyncio.Future | None = None
+        self._closing: asyncio.Event | None = None
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self.session is not None
+
+    async def ensure_connected(self, force: bool = False) -> None:
+        """Start the server and complete the handshake unless already connected."""
+        self.wanted.set()
+        async with self._lock:
+            if self.session is not None:
+                return
+            wait = self.retry_at - time.monotonic()
+            if wait > 0 and not force:
+                raise MCPServerUnavailableError(f"{self.last_error}; retrying in {wait:.0f}s")
+            await self._close_task()
+            self._ready = asyncio.get_running_loop().create_future()
+            self._closing = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name=f"mcp-{self.name}")
+            try:
+                await asyncio.wait_for(asyncio.shield(self._ready), timeout=self.cfg.connect_timeout)
+            except BaseException as e:
+                # Don't wait here for a stuck process to die; the next connect/close reaps it
+                self._task.cancel()
+                self._note_failure(f"connect timed out after {self.cfg.connect_timeout}s"
+                                   if isinstance(e, asyncio.TimeoutError) else str(e) or type(e).__name__)
+                raise
+            if self._failures:
+                self.stats.reconnects += 1
+            self._failures, self.last_error, self.retry_at = 0, None, 0.0
+        if self._on_connect:
+            await self._on_connect(self)
+
+    def _note_failure(self, error: str) -> None:
+        self._failures += 1
+        self.last_error = error
+        self.retry_at = time.monotonic() + min(self._BACKOFF_MAX_S, 2.0 ** (self._failures - 1))
+
+    async def mark_failed(self, error: str) -> None:
+        """Record that the live session broke and tear it down."""
+        if self.session is None:
+            return
+        logger.warning("MCP server '{}': connection lost: {}", self.name, error)
+        self._note_failure(error)
+        await self.close()
+
+    async def ping(self) -> bool:
+        """Health-check the live session; marks the connection failed if it doesn't answer."""
+        session = self.session
+        if session is None:
+            return False
+        try:
+            await asyncio.wait_for(session.send_ping(), timeout=min(10, self.cfg.ping_interval))
+            return True
+        except Exception as e:
+            await self.mark_failed(f"ping failed: {e or type(e).__name__}")
+            return False
+
+    async def _run(self) -> None:
+        from mcp import ClientSession
+
+        try:
+            async with AsyncExitStack() as stack:
+                read, write = await self._open_transport(stack)
+                session = await stack.enter_async_context(
+                    ClientSession(read, write, message_handler=self._on_message)
+                )
+                await session.initialize()
+                self.tools = (await session.list_tools()).tools
+                self.session = session
+                self._ready.set_result(None)
+                await self._closing.wait()
+        except Exception as e:
+            if not self._ready.done():
+                self._ready.set_exception(e)
+            elif self.session is not None:
+                self._note_failure(str(e) or type(e).__name__)
+                logger.warning("MCP server '{}': connection lost: {}", self.name, e)
+        finally:
+            self.session = None
+
+    async def _on_message(self, message: Any) -> None:
+        """Refresh tools on notifications/tools/list_changed."""
+        from mcp import types
+
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            # Runs inside the session's receive loop: requests must go through a separate task
+            self._refresh_task = asyncio.create_task(self._refresh_tools())
+
+    async def _refresh_tools(self) -> None:
+        session = self.session
+        if session is None:
+            return
+        try:
+            self.tools = (await session.list_tools()).tools
+            logger.info("MCP server '{}': tool list changed, {} tools", self.name, len(self.tools))
+            if self._on_connect:
+                await self._on_connect(self)
+        except Exception as e:
+            logger.warning("MCP server '{}': failed to refresh tool list: {}", self.name, e)
+
+    async def _open_transport(self, stack: AsyncExitStack) -> tuple[Any, Any]:
+        cfg = self.cfg
+        if cfg.command:
+            from mcp import StdioServerParameters
+            from mcp.client.stdio import stdio_client
+
+            params = StdioServerParameters(command=cfg.command, args=cfg.args, env=cfg.env or None)
+            return await stack.enter_async_context(stdio_client(params))
+        if cfg.url:
+            from mcp.client.streamable_http import streamable_http_client
+
+            # Always provide an explicit httpx client so MCP HTTP transport does not
+            # inherit httpx's default 5s timeout and preempt the higher-level tool timeout.
+            http_client = await stack.enter_async_context(
+                httpx.AsyncClient(headers=cfg.headers or None, follow_redirects=True, timeout=None)
+            )
+            read, write, _ = await stack.enter_async_context(
+                streamable_http_client(cfg.url, http_client=http_client)
+            )
+            return read, write
+        raise ValueError("no command or url configured")
+
+    async def _close_task(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        if self._closing and self._ready and self._ready.done():
+            self._closing.set()
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=5)
+                return
+            except (asyncio.TimeoutError, Exception):
+                pass
+        # Transport cleanup swallows a single cancellation and then waits for the
+        # process to exit, so keep cancelling until a stuck server gets killed.
+        while not task.done():
+            task.cancel()
+            await asyncio.wait({task}, timeout=0.5)
+        try:
+            task.result()
+        except (asyncio.CancelledError, Exception, BaseExceptionGroup):
+            pass  # MCP SDK cancel scope cleanup is noisy but harmless
+
+    async def close(self) -> None:
+        """Shut down the session and its transport."""
+        async with self._lock:
+            await self._close_task()
+            self.session = None
 
 
 class MCPToolWrapper(Tool):
     """Wraps a single MCP server tool as a nanobot Tool."""
 
-    def __init__(self, session, server_name: str, tool_def, tool_timeout: int = 30):
-        self._session = session
+    def __init__(
+        self,
+        connection: MCPServerConnection,
+        server_name: str,
+        tool_def,
+        tool_timeout: int = 30,
+        max_result_bytes: int = 0,
+        results: ResultStore | None = None,
+    ):
+        self._connection = connection
         self._original_name = tool_def.name
         self._name = f"mcp_{server_name}_{tool_def.name}"
         self._description = tool_def.description or tool_def.name
         self._parameters = tool_def.inputSchema or {"type": "object", "properties": {}}
         self._tool_timeout = tool_timeout
+        self._max_result_bytes = max_result_bytes
+        self._results = results or ResultStore(get_data_path() / "mcp" / "results")
 
     @property
     def name(self) -> str:
@@ -36,64 +277,231 @@ class MCPToolWrapper(Tool):
 
     async def execute(self, **kwargs: Any) -> str:
         from mcp import types
+        from mcp.shared.exceptions import McpError
+
+        conn = self._connection
+        try:
+            await conn.ensure_connected()
+        except Exception as e:
+            return f"Error: MCP server '{conn.name}' is unavailable: {e or type(e).__name__}"
+        started = time.monotonic()
         try:
             result = await asyncio.wait_for(
-                self._session.call_tool(self._original_name, arguments=kwargs),
+                conn.session.call_tool(self._original_name, arguments=kwargs),
                 timeout=self._tool_timeout,
             )
         except asyncio.TimeoutError:
+            conn.stats.record(time.monotonic() - started, "timeout")
             logger.warning("MCP tool '{}' timed out after {}s", self._name, self._tool_timeout)
             return f"(MCP tool call timed out after {self._tool_timeout}s)"
+        except McpError as e:
+            conn.stats.record(time.monotonic() - started, "error")
+            if e.error.code == types.CONNECTION_CLOSED:
+                await conn.mark_failed(str(e))
+            return f"Error: MCP tool '{self._original_name}' failed: {e}"
+        except Exception as e:
+            # Transport-level failure (broken pipe, closed stream): the session is gone
+            conn.stats.record(time.monotonic() - started, "error")
+            await conn.mark_failed(str(e) or type(e).__name__)
+            return f"Error: MCP server '{conn.name}' is unavailable: {e or type(e).__name__}"
+        conn.stats.record(time.monotonic() - started, "error" if result.isError else "ok")
+        try:
+            return await asyncio.to_thread(self._render, result.content)
+        except Exception as e:
+            logger.error("MCP tool '{}': failed to render result: {}", self._name, e)
+            return f"Error: could not process result of MCP tool '{self._original_name}': {e}"
+
+    def _render(self, blocks: list) -> str:
+        """Flatten content blocks to text, keeping binary payloads and oversized text in the result store."""
         parts = []
-        for block in result.content:
-            if isinstance(block, types.TextContent):
+        for block in blocks:
+            kind = getattr(block, "type", None)
+            if kind == "text":
                 parts.append(block.text)
+            elif kind in ("image", "audio"):
+                path = self._spill(base64.b64decode(block.data), mimetypes.guess_extension(block.mimeType) or ".bin")
+                parts.append(f"[{kind} {block.mimeType}, {path.stat().st_size} bytes, saved to {path}]")
+            elif kind == "resource":
+                res = block.resource
+                if getattr(res, "text", None) is not None:
+                    parts.append(f"[resource {res.uri}]\n{res.text}")
+                else:
+                    ext = mimetypes.guess_extension(res.mimeType or "") or ".bin"
+                    path = self._spill(base64.b64decode(res.blob), ext)
+                    parts.append(f"[resource {res.uri} ({res.mimeType or 'binary'}), saved to {path}]")
+            elif kind == "resource_link":
+                parts.append(f"[resource link {block.name}: {block.uri}]")
             else:
                 parts.append(str(block))
-        return "\n".join(parts) or "(no output)"
+        text = "\n".join(parts) or "(no output)"
 
+        # Capped at the store's inline size too, so the agent loop doesn't store the cut result again.
+        data = text.encode("utf-8")
+        cap = min(self._max_result_bytes, self._results.inline_chars) if self._max_result_bytes else 0
+        if not cap or len(data) <= cap:
+            return text
+        reference = ResultStore.reference(self._name, text, self._results.put(text))
+        keep = max(0, cap - len(reference) - 64)
+        head = data[: keep * 2 // 3].decode("utf-8", errors="ignore")
+        tail = data[len(data) - keep // 3:].decode("utf-8", errors="ignore") if keep // 3 else ""
+        return f"{head}\n\n... [{len(data) - keep} bytes omitted] ...\n{reference}\n\n{tail}"
 
-async def connect_mcp_servers(
-    mcp_servers: dict, registry: ToolRegistry, stack: AsyncExitStack
-) -> None:
-    """Connect to configured MCP servers and register their tools."""
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
+    def _spill(self, data: bytes, suffix: str) -> Path:
+        """Keep a binary payload in the result store's files directory."""
+        return self._results.put_bytes(data, suffix, prefix=f"{safe_filename(self._name)}-")
 
-    for name, cfg in mcp_servers.items():
-        try:
-            if cfg.command:
-                params = StdioServerParameters(
-                    command=cfg.command, args=cfg.args, env=cfg.env or None
-                )
-                read, write = await stack.enter_async_context(stdio_client(params))
-            elif cfg.url:
-                from mcp.client.streamable_http import streamable_http_client
-                # Always provide an explicit httpx client so MCP HTTP transport does not
-                # inherit httpx's default 5s timeout and preempt the higher-level tool timeout.
-                http_client = await stack.enter_async_context(
-                    httpx.AsyncClient(
-                        headers=cfg.headers or None,
-                        follow_redirects=True,
-                        timeout=None,
-                    )
-                )
-                read, write, _ = await stack.enter_async_context(
-                    streamable_http_client(cfg.url, http_client=http_client)
-                )
-            else:
+
+class MCPManager:
+    """
+    Connects configured MCP servers and keeps their tools registered.
+
+    Eager servers are connected concurrently, each bounded by its own
+    connect_timeout. Servers with `lazy` set register their tools from a
+    cached manifest of the last successful handshake and are only spawned
+    when one of their tools is first called.
+
+    A supervisor task per server pings live sessions every ping_interval
+    and reconnects failed ones once their backoff expires; tool lists are
+    swapped into the registry in one step whenever they change.
+
+    Results larger than a server's max_result_bytes are cut to a head and
+    tail; the full text goes to the agent's ResultStore so it can be paged
+    with read_result, and images and binary resources are saved to its
+    files directory.
+    """
+
+    def __init__(
+        self,
+        mcp_servers: dict,
+        registry: ToolRegistry,
+        cache_dir: Path | None = None,
+        results: ResultStore | None = None,
+    ):
+        self.registry = registry
+        self.cache_dir = cache_dir or get_data_path() / "mcp"
+        self.results = results or ResultStore(self.cache_dir / "results")
+        self.connections: dict[str, MCPServerConnection] = {}
+        self._registered: dict[str, set[str]] = {}  # server -> registered tool names
+        self._supervisors: list[asyncio.Task] = []
+        for name, cfg in mcp_servers.items():
+            if not cfg.command and not cfg.url:
                 logger.warning("MCP server '{}': no command or url configured, skipping", name)
                 continue
+            self.connections[name] = MCPServerConnection(name, cfg, on_connect=self._on_connect)
 
-            session = await stack.enter_async_context(ClientSession(read, write))
-            await session.initialize()
+    async def start(self) -> None:
+        """Register lazy servers from their manifests and connect the rest in parallel."""
+        eager = []
+        for name, conn in self.connections.items():
+            manifest = self._load_manifest(conn) if conn.cfg.lazy else None
+            if manifest is None:
+                eager.append(conn)
+                continue
+            self._register_tools(conn, manifest)
+            logger.info("MCP server '{}': {} tools registered from cache (lazy)", name, len(manifest))
+        await asyncio.gather(*(self._connect(conn) for conn in eager))
+        self._supervisors = [
+            asyncio.create_task(self._supervise(conn), name=f"mcp-supervisor-{conn.name}")
+            for conn in self.connections.values()
+        ]
+
+    async def _supervise(self, conn: MCPServerConnection) -> None:
+        """Ping a server while it is up; reconnect with backoff once it is wanted and down."""
+        while True:
+            if conn.connected:
+                # Wake early if the session task ends (process died, call saw it close)
+                done, _ = await asyncio.wait({conn._task}, timeout=conn.cfg.ping_interval)
+                if not done:
+                    await conn.ping()
+            elif not conn.wanted.is_set():
+                await conn.wanted.wait()  # lazy server nobody has called yet
+            else:
+                await asyncio.sleep(max(1.0, conn.retry_at - time.monotonic()))
+                if not conn.connected and time.monotonic() >= conn.retry_at:
+                    await self._connect(conn)
+
+    async def _connect(self, conn: MCPServerConnection) -> None:
+        try:
+            await conn.ensure_connected()
+            logger.info("MCP server '{}': connected, {} tools registered", conn.name, len(conn.tools))
+        except Exception:
+            logger.error(
+                "MCP server '{}': failed to connect: {} (retry in {:.0f}s)",
+                conn.name, conn.last_error, conn.retry_at - time.monotonic(),
+            )
+
+    async def _on_connect(self, conn: MCPServerConnection) -> None:
+        self._register_tools(conn, conn.tools)
+        self._save_manifest(conn)
+
+    def _register_tools(self, conn: MCPServerConnection, tool_defs: list) -> None:
+        """Swap this server's registered tools for wrappers of tool_defs."""
+        wrappers = [
+            MCPToolWrapper(
+                conn, conn.name, tool_def,
+                tool_timeout=conn.cfg.tool_timeout,
+                max_result_bytes=conn.cfg.max_result_bytes,
+                results=self.results,
+            )
+            for tool_def in tool_defs
+        ]
+        self.registry.replace(self._registered.get(conn.name, ()), wrappers)
+        self._registered[conn.name] = {w.name for w in wrappers}
+        logger.debug("MCP: registered tools {} from server '{}'", sorted(self._registered[conn.name]), conn.name)
 
-            tools = await session.list_tools()
-            for tool_def in tools.tools:
-                wrapper = MCPToolWrapper(session, name, tool_def, tool_timeout=cfg.tool_timeout)
-                registry.register(wrapper)
-                logger.debug("MCP: registered tool '{}' from server '{}'", wrapper.name, name)
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Health and call metrics per server."""
+        return {
+            name: {
+                "connected": conn.connected,
+                "tools": len(self._registered.get(name, ())),
+                "last_error": conn.last_error,
+                **conn.stats.to_dict(),
+            }
+            for name, conn in self.connections.items()
+        }
 
-            logger.info("MCP server '{}': connected, {} tools registered", name, len(tools.tools))
+    def _manifest_path(self, conn: MCPServerConnection) -> Path:
+        return self.cache_dir / f"{safe_filename(conn.name)}.json"
+
+    @staticmethod
+    def _fingerprint(cfg: Any) -> str:
+        """Hash of how the server is launched, so a changed command/url invalidates the manifest."""
+        launch = cfg.model_dump_json(include={"command", "args", "env", "url", "headers"})
+        return hashlib.sha256(launch.encode()).hexdigest()
+
+    def _load_manifest(self, conn: MCPServerConnection) -> list | None:
+        from mcp import types
+
+        path = self._manifest_path(conn)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("fingerprint") != self._fingerprint(conn.cfg):
+                return None
+            return [types.Tool.model_validate(t) for t in data["tools"]]
+        except FileNotFoundError:
+            return None
         except Exception as e:
-            logger.error("MCP server '{}': failed to connect: {}", name, e)
+            logger.warning("MCP server '{}': ignoring unreadable tool manifest: {}", conn.name, e)
+            return None
+
+    def _save_manifest(self, conn: MCPServerConnection) -> None:
+        try:
+            ensure_dir(self.cache_dir)
+            self._manifest_path(conn).write_text(json.dumps({
+                "fingerprint": self._fingerprint(conn.cfg),
+                "tools": [
+                    t.model_dump(mode="json", include={"name", "description", "inputSchema"})
+                    for t in conn.tools
+                ],
+            }, ensure_ascii=False), encoding="utf-8")
+        except Exception as e:
+            logger.warning("MCP server '{}': failed to write tool manifest: {}", conn.name, e)
+
+    async def close(self) -> None:
+        """Stop supervision and close every server connection."""
+        for task in self._supervisors:
+            task.cancel()
+        await asyncio.gather(*self._supervisors, return_exceptions=True)
+        self._supervisors = []
+        await asyncio.gather(*(conn.close() for conn in self.connections.values()))
@@ -1,6 +1,6 @@
 """Tool registry for dynamic tool management."""
 
-from typing import Any
+from typing import Any, Iterable
 
 from nanobot.agent.tools.base import Tool
 
@@ -23,6 +23,15 @@ class ToolRegistry:
         """Unregister a tool by name."""
         self._tools.pop(name, None)
 
+    def replace(self, remove: Iterable[str], add: Iterable[Tool]) -> None:
+        """Unregister `remove` and register `add` in a single swap."""
+        tools = dict(self._tools)
+        for name in remove:
+            tools.pop(name, None)
+        for tool in add:
+            tools[tool.name] = tool
+        self._tools = tools
+
     def get(self, name: str) -> Tool | None:
         """Get a tool by name."""
         return self._tools.get(name)
@@ -0,0 +1,175 @@
+"""Large tool result store and the tool to page through stored results."""
+
+import hashlib
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.agent.tools.filesystem import ReadFileTool
+from nanobot.utils.helpers import ensure_dir
+
+_HANDLE_RE = re.compile(r"[0-9a-f]{16}")
+
+
+class ResultStore:
+    """
+    Content-addressed store for tool results too large to keep in context.
+
+    Results are written once to <root>/<sha256[:16]>.txt; the 16-hex-digit
+    prefix is the handle the agent passes to read_result. Binary payloads
+    (images, blobs from MCP tools) go to <root>/files and are referred to by
+    path. Identical outputs share a file, and files older than max_age_days
+    are pruned on the first write and then at most every prune_interval_s.
+    Writes block, so call put() from a worker thread in async code.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        inline_chars: int = 16_000,
+        preview_chars: int = 2_000,
+        max_age_days: int = 30,
+        prune_interval_s: float = 6 * 3600,
+    ):
+        self.root = root
+        self.inline_chars = inline_chars
+        self.preview_chars = preview_chars
+        self.max_age_days = max_age_days
+        self.prune_interval_s = prune_interval_s
+        self._pruned_at: float | None = None
+
+    def put(self, text: str) -> str:
+        """Store text and return its handle."""
+        data = text.encode("utf-8")
+        handle = hashlib.sha256(data).hexdigest()[:16]
+        self._write(self.path(handle), data)
+        return handle
+
+    def put_bytes(self, data: bytes, suffix: str, prefix: str = "") -> Path:
+        """Store a binary payload and return its path."""
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        path = self.root / "files" / f"{prefix}{digest}{suffix}"
+        self._write(path, data)
+        return path
+
+    def path(self, handle: str) -> Path:
+        return self.root / f"{handle}.txt"
+
+    def get(self, handle: str) -> Path | None:
+        """Path of a stored result, or None if the handle is invalid or gone."""
+        if not _HANDLE_RE.fullmatch(handle):
+            return None
+        path = self.path(handle)
+        return path if path.is_file() else None
+
+    def compact(self, tool_name: str, result: str) -> str:
+        """Return result unchanged if small, else store it and return a header plus preview."""
+        if len(result) <= self.inline_chars:
+            return result
+        try:
+            handle = self.put(result)
+        except OSError as e:
+            logger.warning("Could not store large result of {}: {}", tool_name, e)
+            return result[: self.inline_chars] + f"\n... (truncated, {len(result)} chars total)"
+        return (
+            f"{self.reference(tool_name, result, handle)}\n"
+            f"{result[: self.preview_chars]}\n... (preview ends)"
+        )
+
+    @staticmethod
+    def reference(tool_name: str, result: str, handle: str) -> str:
+        lines = result.count("\n") + 1
+        return (
+            f"[{tool_name} output: {len(result)} chars, {lines} lines, stored as result "
+            f"'{handle}'. Use read_result with offset/limit to page through it.]"
+        )
+
+    def _write(self, path: Path, data: bytes) -> None:
+        if path.exists():
+            return
+        ensure_dir(path.parent)
+        if self._pruned_at is None or time.monotonic() - self._pruned_at >= self.prune_interval_s:
+            self._prune()
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+
+    def _prune(self) -> None:
+        """Delete stored results and files older than max_age_days (nothing else in root)."""
+        self._pruned_at = time.monotonic()
+        cutoff = time.time() - self.max_age_days * 86400
+        stored = [p for p in self.root.glob("*.txt") if _HANDLE_RE.fullmatch(p.stem)]
+        files = self.root / "files"
+        if files.is_dir():
+            stored.extend(p for p in files.iterdir() if p.is_file())
+        for path in stored:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+
+class ReadResultTool(ReadFileTool):
+    """Tool to read a stored tool result in line windows."""
+
+    _DEFAULT_LIMIT = 200
+
+    def __init__(self, store: ResultStore, max_bytes: int = 12_000):
+        super().__init__(workspace=store.root, allowed_dir=store.root, max_bytes=max_bytes)
+        self._store = store
+
+    @property
+    def name(self) -> str:
+        return "read_result"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read a large tool output that was stored instead of being shown in full. "
+            f"Returns {self._DEFAULT_LIMIT} lines by default; use offset/limit to page, "
+            "and column to continue a line that was cut."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "The stored result handle"},
+                "offset": {
+                    "type": "integer",
+                    "description": "Line number to start reading from (1-based)",
+                    "minimum": 1,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of lines to read",
+                    "minimum": 1,
+                },
+                "column": {
+                    "type": "integer",
+                    "description": "Byte position in the offset line to start from (1-based)",
+                    "minimum": 1,
+                },
+            },
+            "required": ["handle"],
+        }
+
+    async def execute(
+        self,
+        handle: str,
+        offset: int | None = None,
+        limit: int | None = None,
+        column: int | None = None,
+        **kwargs: Any,
+    ) -> str:
+        path = self._store.get(handle.strip().strip("'\""))
+        if path is None:
+            return f"Error: No stored result '{handle}' (it may have expired)"
+        return await super().execute(
+            str(path), offset=offset or 1, limit=limit or self._DEFAULT_LIMIT, column=column
+        )
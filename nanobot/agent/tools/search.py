@@ -0,0 +1,419 @@
+"""Workspace search tools: grep, glob."""
+
+import asyncio
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.filesystem import _SKIP_DIRS, _resolve_path
+
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+
+class WorkspaceIndex:
+    """
+    Incrementally maintained index of the files under a root directory.
+
+    Keeps path -> (mtime_ns, size) for every file. A directory is only
+    re-listed when its own mtime changes; files are re-stat'ed on refresh.
+    Optionally keeps lowercase byte-trigrams for small text files so grep can
+    skip files that cannot contain a pattern's literal parts. Trigrams are
+    built lazily by `candidates()`, within a file and entry budget, and stored
+    as sorted packed ints; `refresh()` alone never reads file contents.
+    Refreshes are throttled and thread-safe; call sites run them off the
+    event loop.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        trigrams: bool = True,
+        max_trigram_files: int = 2000,
+        max_trigram_bytes: int = 64_000,
+        max_trigram_entries: int = 1_000_000,
+        min_refresh_interval: float = 1.0,
+    ):
+        self.root = root.expanduser().resolve()
+        self.trigrams = trigrams
+        self.max_trigram_files = max_trigram_files
+        self.max_trigram_bytes = max_trigram_bytes
+        self.max_trigram_entries = max_trigram_entries
+        self.min_refresh_interval = min_refresh_interval
+        self.files: dict[str, tuple[int, int]] = {}  # posix relpath -> (mtime_ns, size)
+        self.binary: set[str] = set()
+        self._dirs: dict[str, tuple[int, list[str], list[str]]] = {}  # relpath -> (mtime, dirs, files)
+        self._grams: dict[str, array] = {}  # relpath -> sorted packed trigrams
+        self._stale: set[str] = set()  # small files whose trigrams are not built yet
+        self._entries = 0
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> None:
+        """Bring the index up to date with the filesystem."""
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed_at < self.min_refresh_interval:
+                return
+            files: dict[str, tuple[int, int]] = {}
+            dirs: dict[str, tuple[int, list[str], list[str]]] = {}
+            stack = [""]
+            while stack:
+                rel = stack.pop()
+                path = self.root / rel
+                try:
+                    mtime = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+                cached = self._dirs.get(rel)
+                if cached and cached[0] == mtime:
+                    _, subdirs, names = cached
+                else:
+                    subdirs, names = [], []
+                    try:
+                        with os.scandir(path) as it:
+                            for entry in it:
+                                if entry.is_dir(follow_symlinks=False):
+                                    if entry.name not in _SKIP_DIRS:
+                                        subdirs.append(entry.name)
+                                elif entry.is_file(follow_symlinks=False):
+                                    names.append(entry.name)
+                    except OSError:
+                        continue
+                dirs[rel] = (mtime, subdirs, names)
+
+                prefix = f"{rel}/" if rel else ""
+                for name in names:
+                    file_rel = prefix + name
+                    try:
+                        st = os.stat(path / name)
+                    except OSError:
+                        continue
+                    stamp = (st.st_mtime_ns, st.st_size)
+                    if self.files.get(file_rel) != stamp:
+                        self._drop(file_rel)
+                        if self.trigrams and stamp[1] <= self.max_trigram_bytes:
+                            self._stale.add(file_rel)
+                    files[file_rel] = stamp
+                stack.extend(prefix + d for d in subdirs)
+
+            for gone in self.files.keys() - files.keys():
+                self._drop(gone)
+            self.files, self._dirs = files, dirs
+            self._refreshed_at = time.monotonic()
+
+    def _drop(self, rel: str) -> None:
+        self.binary.discard(rel)
+        self._stale.discard(rel)
+        if (grams := self._grams.pop(rel, None)) is not None:
+            self._entries -= len(grams)
+
+    def _build_grams(self) -> None:
+        """Index stale files until the file or entry budget runs out."""
+        for rel in sorted(self._stale):
+            if len(self._grams) >= self.max_trigram_files or self._entries >= self.max_trigram_entries:
+                return
+            self._stale.discard(rel)
+            try:
+                data = (self.root / rel).read_bytes()
+            except OSError:
+                continue
+            if b"\0" in data[:8192]:
+                self.binary.add(rel)
+                continue
+            data = data.lower()
+            grams = array("I", sorted((a << 16) | (b << 8) | c for a, b, c in set(zip(data, data[1:], data[2:]))))
+            if self._entries + len(grams) > self.max_trigram_entries:
+                self._stale.add(rel)
+                return
+            self._grams[rel] = grams
+            self._entries += len(grams)
+
+    def candidates(self, literals: list[str]) -> set[str] | None:
+        """
+        Files that may contain all `literals` (case-insensitive).
+
+        Returns None when trigrams cannot narrow the search. Files too large
+        for trigram indexing, or over the index budget, are always included.
+        """
+        wanted = {
+            (a << 16) | (b << 8) | c
+            for lit in literals if len(lit) >= 3 and lit.isascii()
+            for data in [lit.lower().encode()]
+            for a, b, c in zip(data, data[1:], data[2:])
+        }
+        if not self.trigrams or not wanted:
+            return None
+        with self._lock:
+            self._build_grams()
+            hits = {rel for rel, grams in self._grams.items() if all(_contains(grams, g) for g in wanted)}
+            unindexed = self.files.keys() - self._grams.keys() - self.binary
+            return hits | unindexed
+
+
+def _contains(grams: array, gram: int) -> bool:
+    i = bisect_left(grams, gram)
+    return i < len(grams) and grams[i] == gram
+
+
+@lru_cache(maxsize=128)
+def _glob_regex(pattern: str) -> re.Pattern:
+    """Translate a glob to a regex: '*' stays within a path segment, '**/' spans any depth."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and (end := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : end]
+            out.append("[^" + body[1:] + "]" if body.startswith("!") else "[" + body + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(out) + r"\Z")
+
+
+def _required_literals(pattern: str) -> list[str]:
+    """Best-effort literal substrings every match of a regex must contain."""
+    if "|" in pattern or re.search(r"\(\?[a-zA-Z-]*x", pattern):
+        return []  # alternation and verbose mode make literal runs unreliable
+    runs: list[str] = []
+    current, depth, i = "", 0, 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c in _REGEX_META:
+            if c in "*?{" and current:
+                current = current[:-1]  # the preceding char is optional
+            if depth == 0 and current:
+                runs.append(current)
+            current = ""
+            if c == "\\":
+                i += 1
+            elif c in "[{":
+                i = pattern.find("]" if c == "[" else "}", i + 2 if c == "[" else i + 1)
+                if i == -1:
+                    return []
+            elif c == "(":
+                depth += 1
+            elif c == ")":
+                depth = max(0, depth - 1)
+        elif depth == 0:
+            current += c
+        i += 1
+    if current:
+        runs.append(current)
+    return runs
+
+
+class _SearchTool(Tool):
+    """Shared path resolution and index selection for search tools."""
+
+    _MAX_RESULTS = 200
+
+    def __init__(
+        self,
+        workspace: Path | None = None,
+        allowed_dir: Path | None = None,
+        index: WorkspaceIndex | None = None,
+    ):
+        self._workspace = workspace
+        self._allowed_dir = allowed_dir
+        self._index = index or (WorkspaceIndex(workspace) if workspace else None)
+
+    def _root_and_index(self, path: str | None) -> tuple[Path, WorkspaceIndex]:
+        """Resolve the search root; reuse the shared index when it lies inside it."""
+        root = _resolve_path(path or str(self._workspace or "."), self._workspace, self._allowed_dir)
+        if not root.is_dir():
+            raise NotADirectoryError(f"Not a directory: {path}")
+        if self._index:
+            try:
+                root.relative_to(self._index.root)
+                return root, self._index
+            except ValueError:
+                pass
+        return root, WorkspaceIndex(root, trigrams=False)
+
+    @staticmethod
+    def _scoped(index: WorkspaceIndex, root: Path, paths: Any) -> list[str]:
+        """Index-relative paths under root, sorted."""
+        rel_root = root.relative_to(index.root).as_posix()
+        prefix = "" if rel_root == "." else rel_root + "/"
+        return sorted(p for p in paths if p.startswith(prefix))
+
+    @staticmethod
+    def _matches_glob(rel: str, pattern: str | None) -> bool:
+        """Match a relative path; patterns without '/' match the file name at any depth."""
+        if not pattern:
+            return True
+        if "/" not in pattern:
+            rel = rel.rsplit("/", 1)[-1]
+        return _glob_regex(pattern).match(rel) is not None
+
+
+class GrepTool(_SearchTool):
+    """Tool to search file contents with a regular expression."""
+
+    _MAX_LINE_CHARS = 300
+
+    @property
+    def name(self) -> str:
+        return "grep"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Search file contents with a regular expression. Returns matching lines as "
+            "path:line: text. Faster than running grep through exec."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "description": "Regular expression to search for"},
+                "path": {"type": "string", "description": "Directory to search (default: workspace)"},
+                "glob": {"type": "string", "description": "Only search files matching this glob, e.g. '*.py'"},
+                "ignore_case": {"type": "boolean", "description": "Case-insensitive search"},
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum matching lines to return",
+                    "minimum": 1,
+                    "maximum": 1000,
+                },
+            },
+            "required": ["pattern"],
+        }
+
+    async def execute(
+        self,
+        pattern: str,
+        path: str | None = None,
+        glob: str | None = None,
+        ignore_case: bool = False,
+        max_results: int | None = None,
+        **kwargs: Any,
+    ) -> str:
+        try:
+            regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        except re.error as e:
+            return f"Error: Invalid regex: {e}"
+        try:
+            return await asyncio.to_thread(
+                self._search, regex, path, glob, max_results or self._MAX_RESULTS
+            )
+        except (PermissionError, NotADirectoryError) as e:
+            return f"Error: {e}"
+        except Exception as e:
+            return f"Error searching files: {str(e)}"
+
+    def _search(self, regex: re.Pattern, path: str | None, glob: str | None, limit: int) -> str:
+        root, index = self._root_and_index(path)
+        index.refresh()
+        candidates = index.candidates(_required_literals(regex.pattern))
+        paths = self._scoped(index, root, index.files if candidates is None else candidates)
+
+        results: list[str] = []
+        for rel in paths:
+            if rel in index.binary or not self._matches_glob(rel, glob):
+                continue
+            shown = (index.root / rel).relative_to(root).as_posix()
+            try:
+                with open(index.root / rel, encoding="utf-8", errors="replace") as f:
+                    head = f.read(8192)
+                    if "\0" in head:
+                        continue
+                    f.seek(0)
+                    for lineno, line in enumerate(f, 1):
+                        if regex.search(line):
+                            text = line.rstrip("\n")
+                            if len(text) > self._MAX_LINE_CHARS:
+                                text = text[: self._MAX_LINE_CHARS] + "…"
+                            results.append(f"{shown}:{lineno}: {text}")
+                            if len(results) >= limit:
+                                break
+            except OSError:
+                continue
+            if len(results) >= limit:
+                results.append(f"... (stopped at {limit} matches; narrow the pattern, path or glob)")
+                break
+
+        if not results:
+            return f"No matches for {regex.pattern!r}"
+        return "\n".join(results)
+
+
+class GlobTool(_SearchTool):
+    """Tool to find files by glob pattern."""
+
+    @property
+    def name(self) -> str:
+        return "glob"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Find files by glob pattern, e.g. '*.md' (any directory) or 'src/**/*.py'. "
+            "Returns paths relative to the search directory, most recently modified first."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "pattern": {"type": "string", "description": "Glob pattern to match"},
+                "path": {"type": "string", "description": "Directory to search (default: workspace)"},
+                "max_results": {
+                    "type": "integer",
+                    "description": "Maximum paths to return",
+                    "minimum": 1,
+                    "maximum": 1000,
+                },
+            },
+            "required": ["pattern"],
+        }
+
+    async def execute(
+        self, pattern: str, path: str | None = None, max_results: int | None = None, **kwargs: Any
+    ) -> str:
+        try:
+            return await asyncio.to_thread(
+                self._glob, pattern, path, max_results or self._MAX_RESULTS
+            )
+        except (PermissionError, NotADirectoryError) as e:
+            return f"Error: {e}"
+        except Exception as e:
+            return f"Error matching files: {str(e)}"
+
+    def _glob(self, pattern: str, path: str | None, limit: int) -> str:
+        root, index = self._root_and_index(path)
+        index.refresh()
+        matches = []
+        for rel in self._scoped(index, root, index.files):
+            shown = (index.root / rel).relative_to(root).as_posix()
+            if self._matches_glob(shown, pattern):
+                matches.append((index.files[rel][0], shown))
+        if not matches:
+            return f"No files match {pattern!r}"
+
+        matches.sort(key=lambda m: m[0], reverse=True)
+        lines = [shown for _, shown in matches[:limit]]
+        if len(matches) > limit:
+            lines.append(f"... ({len(matches) - limit} more; narrow the pattern or path)")
+        return "\n".join(lines)
@@ -1,12 +1,19 @@
 """Base channel interface for chat platforms."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.channels.dedup import DedupStore
+from nanobot.media.fetch import MediaFetcher
+
+if TYPE_CHECKING:
+    from nanobot.providers.transcription import TranscriptionService
 
 
 class BaseChannel(ABC):
@@ -29,6 +36,11 @@ class BaseChannel(ABC):
         """
         self.config = config
         self.bus = bus
+        self.media_fetcher = MediaFetcher()
+        self.dedup = DedupStore(self.name)
+        self.transcriber: "TranscriptionService | None" = None
+        self._transcribing: set[asyncio.Task] = set()
+        self._chat_tails: dict[str, asyncio.Task] = {}  # chat_id -> last deferred publish
         self._running = False
 
     @abstractmethod
@@ -71,6 +83,10 @@ class BaseChannel(ABC):
             p in allow_list for p in sender_str.split("|") if p
         )
 
+    async def _transcribe(self, path: str | Path) -> str:
+        """Transcript of an audio attachment, or "" when none is available."""
+        return await self.transcriber.transcribe(path) if self.transcriber else ""
+
     async def _handle_message(
         self,
         sender_id: str,
@@ -79,11 +95,15 @@ class BaseChannel(ABC):
         media: list[str] | None = None,
         metadata: dict[str, Any] | None = None,
         session_key: str | None = None,
+        audio: list[str] | None = None,
     ) -> None:
         """
         Handle an incoming message from the chat platform.
 
-        This method checks permissions and forwards to the bus.
+        This method checks permissions and forwards to the bus. Messages with
+        audio to transcribe are forwarded from a background task once the
+        transcripts are appended, so the platform handler is not held up;
+        later messages in the same chat queue behind it to keep their order.
 
         Args:
             sender_id: The sender's identifier.
@@ -92,6 +112,7 @@ class BaseChannel(ABC):
             media: Optional list of media URLs.
             metadata: Optional channel-specific metadata.
             session_key: Optional session key override (e.g. thread-scoped sessions).
+            audio: Optional paths of voice notes/audio among media to transcribe.
         """
         if not self.is_allowed(sender_id):
             logger.warning(
@@ -111,8 +132,44 @@ class BaseChannel(ABC):
             session_key_override=session_key,
         )
 
+        audio = audio if self.transcriber else None
+        previous = self._chat_tails.get(msg.chat_id)
+        if not audio and previous is None:
+            await self.bus.publish_inbound(msg)
+            return
+
+        task = asyncio.create_task(self._publish_in_order(msg, audio or [], previous))
+        self._transcribing.add(task)
+        self._chat_tails[msg.chat_id] = task
+
+        def _done(t: asyncio.Task, chat_id: str = msg.chat_id) -> None:
+            self._transcribing.discard(t)
+            if self._chat_tails.get(chat_id) is t:
+                del self._chat_tails[chat_id]
+
+        task.add_done_callback(_done)
+
+    async def _publish_in_order(
+        self, msg: InboundMessage, audio: list[str], previous: asyncio.Task | None
+    ) -> None:
+        """Append transcripts, wait for the chat's earlier message, then publish."""
+        texts = await asyncio.gather(*(self._transcribe(p) for p in audio))
+        for path, text in zip(audio, texts):
+            if text:
+                logger.debug("{}: transcribed {}: {}...", self.name, Path(path).name, text[:50])
+                msg.content = f"{msg.content}\n[transcription: {text}]"
+        if previous is not None:
+            await asyncio.wait([previous])
         await self.bus.publish_inbound(msg)
 
+    async def cancel_pending(self) -> None:
+        """Cancel messages still waiting on transcription and wait for them to finish."""
+        tasks = list(self._transcribing)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._chat_tails.clear()
+
     @property
     def is_running(self) -> bool:
         """Check if the channel is running."""
@@ -0,0 +1,137 @@
+"""Bounded, optionally persistent message-id deduplication for channels."""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from loguru import logger
+
+
+class DedupStore:
+    """
+    Remembers recently handled message ids so redeliveries are dropped.
+
+    Ids live in an insertion-ordered dict (a ring buffer with O(1) lookup)
+    bounded by max_size and ttl_s. After persist_to() the newest max_size ids
+    are loaded from a shared SQLite table keyed by scope (the channel name)
+    on first use and every new id is written through, so duplicates
+    redelivered after a reconnect or restart are still rejected. Safe to
+    use from threads.
+    """
+
+    def __init__(self, scope: str, max_size: int = 10_000, ttl_s: float = 7 * 24 * 3600):
+        self.scope = scope
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._ids: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self.path: Path | None = None
+        self._conn: sqlite3.Connection | None = None
+        self._writes = 0
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._open()
+            return self._fresh(key, time.time())
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def is_duplicate(self, key: str) -> bool:
+        """Return True if *key* was seen before; otherwise record it and return False."""
+        now = time.time()
+        with self._lock:
+            self._open()
+            if self._fresh(key, now):
+                return True
+            self._record(key, now)
+            return False
+
+    def add(self, key: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._open()
+            if not self._fresh(key, now):
+                self._record(key, now)
+
+    def persist_to(self, path: Path) -> None:
+        """Keep ids in the SQLite database at *path* (opened on first use)."""
+        with self._lock:
+            if self._conn is None:
+                self.path = path
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self.path = None
+
+    def _open(self) -> None:
+        if self.path is None or self._conn is not None:
+            return
+        path, self.path = self.path, None  # don't retry a broken database on every call
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen "
+                "(scope TEXT NOT NULL, key TEXT NOT NULL, ts REAL NOT NULL, PRIMARY KEY (scope, key))"
+            )
+            rows = conn.execute(
+                "SELECT key, ts FROM seen WHERE scope = ? AND ts > ? ORDER BY ts DESC LIMIT ?",
+                (self.scope, time.time() - self.ttl_s, self.max_size),
+            ).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("{}: dedup persistence disabled: {}", self.scope, e)
+            return
+        self._conn = conn
+        # Ids seen before persistence was attached are written through now.
+        for key, ts in self._ids.items():
+            self._write(key, ts)
+        merged = dict(rows)
+        merged.update(self._ids)
+        self._ids = OrderedDict(sorted(merged.items(), key=lambda item: item[1]))
+        self._evict(time.time())
+        self._prune()
+
+    def _fresh(self, key: str, now: float) -> bool:
+        ts = self._ids.get(key)
+        return ts is not None and now - ts <= self.ttl_s
+
+    def _record(self, key: str, now: float) -> None:
+        self._ids.pop(key, None)
+        self._ids[key] = now
+        self._evict(now)
+        if self._conn is not None:
+            self._write(key, now)
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._prune()
+
+    def _write(self, key: str, ts: float) -> None:
+        try:
+            self._conn.execute("INSERT OR REPLACE INTO seen (scope, key, ts) VALUES (?, ?, ?)", (self.scope, key, ts))
+        except sqlite3.Error as e:
+            logger.warning("{}: failed to persist dedup id: {}", self.scope, e)
+
+    def _evict(self, now: float) -> None:
+        while self._ids and (
+            len(self._ids) > self.max_size or now - next(iter(self._ids.values())) > self.ttl_s
+        ):
+            self._ids.popitem(last=False)
+
+    def _prune(self) -> None:
+        """Drop expired rows and anything beyond the newest max_size for this scope."""
+        try:
+            self._conn.execute(
+                "DELETE FROM seen WHERE scope = ? AND (ts <= ? OR key NOT IN "
+                "(SELECT key FROM seen WHERE scope = ? ORDER BY ts DESC LIMIT ?))",
+                (self.scope, time.time() - self.ttl_s, self.scope, self.max_size),
+            )
+        except sqlite3.Error as e:
+            logger.warning("{}: failed to prune dedup ids: {}", self.scope, e)
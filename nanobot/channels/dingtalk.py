@@ -15,6 +15,7 @@ from loguru import logger
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.rate_limit import RateLimiter, retry_after
 from nanobot.config.schema import DingTalkConfig
 
 try:
@@ -113,6 +114,8 @@ class DingTalkChannel(BaseChannel):
         # Access Token management for sending messages
         self._access_token: str | None = None
         self._token_expiry: float = 0
+        # Robot message APIs are throttled per app; stay well below the QPS quota
+        self._limiter = RateLimiter(rate=20, burst=20, chat_rate=1, chat_burst=5)
 
         # Hold references to background tasks to prevent GC
         self._background_tasks: set[asyncio.Task] = set()
@@ -311,7 +314,14 @@ class DingTalkChannel(BaseChannel):
         }
 
         try:
-            resp = await self._http.post(url, json=payload, headers=headers)
+            for attempt in range(2):
+                await self._limiter.acquire(chat_id)
+                resp = await self._http.post(url, json=payload, headers=headers)
+                if resp.status_code != 429 or attempt:
+                    break
+                wait = retry_after(resp.headers)
+                self._limiter.block(wait, chat_id)
+                logger.warning("DingTalk rate limited sending to {}, retrying in {}s", chat_id, wait)
             body = resp.text
             if resp.status_code != 200:
                 logger.error("DingTalk send failed msgKey={} status={} body={}", msg_key, resp.status_code, body[:500])
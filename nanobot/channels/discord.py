@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -12,10 +13,12 @@ from loguru import logger
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.rate_limit import RateLimiter, retry_after
+from nanobot.channels.typing_indicator import TypingIndicator
 from nanobot.config.schema import DiscordConfig
+from nanobot.media import MediaTooLargeError, get_media_store
 
 DISCORD_API_BASE = "https://discord.com/api/v10"
-MAX_ATTACHMENT_BYTES = 20 * 1024 * 1024  # 20MB
 MAX_MESSAGE_LEN = 2000  # Discord message character limit
 
 
@@ -52,8 +55,11 @@ class DiscordChannel(BaseChannel):
         self._ws: websockets.WebSocketClientProtocol | None = None
         self._seq: int | None = None
         self._heartbeat_task: asyncio.Task | None = None
-        self._typing_tasks: dict[str, asyncio.Task] = {}
+        # Discord shows typing for ~10s per call; the endpoint allows about 5 calls per 5s per bot
+        self._typing = TypingIndicator(self._send_typing, interval_s=8, max_per_tick=5, name="Discord")
         self._http: httpx.AsyncClient | None = None
+        # 50 requests/s per bot; message creation allows 5 per 5s per channel
+        self._limiter = RateLimiter(rate=50, burst=50, chat_rate=1, chat_burst=5)
 
     async def start(self) -> None:
         """Start the Discord gateway connection."""
@@ -84,9 +90,7 @@ class DiscordChannel(BaseChannel):
         if self._heartbeat_task:
             self._heartbeat_task.cancel()
             self._heartbeat_task = None
-        for task in self._typing_tasks.values():
-            task.cancel()
-        self._typing_tasks.clear()
+        self._typing.close()
         if self._ws:
             await self._ws.close()
             self._ws = None
@@ -116,24 +120,28 @@ class DiscordChannel(BaseChannel):
                     payload["message_reference"] = {"message_id": msg.reply_to}
                     payload["allowed_mentions"] = {"replied_user": False}
 
-                if not await self._send_payload(url, headers, payload):
+                if not await self._send_payload(url, headers, payload, msg.chat_id):
                     break  # Abort remaining chunks on failure
         finally:
             await self._stop_typing(msg.chat_id)
 
     async def _send_payload(
-        self, url: str, headers: dict[str, str], payload: dict[str, Any]
+        self, url: str, headers: dict[str, str], payload: dict[str, Any], channel_id: str | None = None
     ) -> bool:
-        """Send a single Discord API payload with retry on rate-limit. Returns True on success."""
+        """Send a single Discord API payload within rate limits. Returns True on success."""
         for attempt in range(3):
             try:
+                await self._limiter.acquire(channel_id)
                 response = await self._http.post(url, headers=headers, json=payload)
                 if response.status_code == 429:
                     data = response.json()
-                    retry_after = float(data.get("retry_after", 1.0))
-                    logger.warning("Discord rate limited, retrying in {}s", retry_after)
-                    await asyncio.sleep(retry_after)
+                    wait = retry_after(response.headers, data)
+                    self._limiter.block(wait, None if data.get("global") else channel_id)
+                    logger.warning("Discord rate limited, retrying in {}s", wait)
                     continue
+                if response.headers.get("X-RateLimit-Remaining") == "0":
+                    # Bucket exhausted: hold this channel until Discord resets it
+                    self._limiter.block(retry_after(response.headers), channel_id)
                 response.raise_for_status()
                 return True
             except Exception as e:
@@ -235,38 +243,47 @@ class DiscordChannel(BaseChannel):
 
         content_parts = [content] if content else []
         media_paths: list[str] = []
-        media_dir = Path.home() / ".nanobot" / "media"
-
-        for attachment in payload.get("attachments") or []:
-            url = attachment.get("url")
+        audio_paths: list[str] = []
+        store = get_media_store()
+
+        attachments = [
+            a for a in payload.get("attachments") or [] if a.get("url") and self._http
+        ]
+
+        async def _fetch(attachment: dict[str, Any]) -> Path:
+            mime = attachment.get("content_type")
+            limit = store.limit_for(None, mime)
+            if (attachment.get("size") or 0) > limit:
+                raise MediaTooLargeError(attachment["size"], limit)
+            return await store.download(
+                self._http, attachment["url"], filename=attachment.get("filename") or "attachment",
+                mime=mime, source=f"discord:{channel_id}",
+            )
+
+        results = await self.media_fetcher.fetch_all([partial(_fetch, a) for a in attachments])
+        for attachment, result in zip(attachments, results):
             filename = attachment.get("filename") or "attachment"
-            size = attachment.get("size") or 0
-            if not url or not self._http:
-                continue
-            if size and size > MAX_ATTACHMENT_BYTES:
+            if isinstance(result, MediaTooLargeError):
                 content_parts.append(f"[attachment: {filename} - too large]")
-                continue
-            try:
-                media_dir.mkdir(parents=True, exist_ok=True)
-                file_path = media_dir / f"{attachment.get('id', 'file')}_{filename.replace('/', '_')}"
-                resp = await self._http.get(url)
-                resp.raise_for_status()
-                file_path.write_bytes(resp.content)
-                media_paths.append(str(file_path))
-                content_parts.append(f"[attachment: {file_path}]")
-            except Exception as e:
-                logger.warning("Failed to download Discord attachment: {}", e)
+            elif isinstance(result, BaseException):
+                logger.warning("Failed to download Discord attachment: {}", result)
                 content_parts.append(f"[attachment: {filename} - download failed]")
+            else:
+                media_paths.append(str(result))
+                content_parts.append(f"[attachment: {result}]")
+                if (attachment.get("content_type") or "").startswith("audio/"):
+                    audio_paths.append(str(result))
 
         reply_to = (payload.get("referenced_message") or {}).get("id")
 
-        await self._start_typing(channel_id)
+        self._start_typing(channel_id)
 
         await self._handle_message(
             sender_id=sender_id,
             chat_id=channel_id,
             content="\n".join(p for p in content_parts if p) or "[empty message]",
             media=media_paths,
+            audio=audio_paths,
             metadata={
                 "message_id": str(payload.get("id", "")),
                 "guild_id": payload.get("guild_id"),
@@ -274,27 +291,16 @@ class DiscordChannel(BaseChannel):
             },
         )
 
-    async def _start_typing(self, channel_id: str) -> None:
+    def _start_typing(self, channel_id: str) -> None:
         """Start periodic typing indicator for a channel."""
-        await self._stop_typing(channel_id)
-
-        async def typing_loop() -> None:
-            url = f"{DISCORD_API_BASE}/channels/{channel_id}/typing"
-            headers = {"Authorization": f"Bot {self.config.token}"}
-            while self._running:
-                try:
-                    await self._http.post(url, headers=headers)
-                except asyncio.CancelledError:
-                    return
-                except Exception as e:
-                    logger.debug("Discord typing indicator failed for {}: {}", channel_id, e)
-                    return
-                await asyncio.sleep(8)
-
-        self._typing_tasks[channel_id] = asyncio.create_task(typing_loop())
+        self._typing.start(channel_id)
 
     async def _stop_typing(self, channel_id: str) -> None:
         """Stop typing indicator for a channel."""
-        task = self._typing_tasks.pop(channel_id, None)
-        if task:
-            task.cancel()
+        self._typing.stop(channel_id)
+
+    async def _send_typing(self, channel_id: str) -> None:
+        if not self._running or not self._http:
+            raise RuntimeError("channel stopped")
+        url = f"{DISCORD_API_BASE}/channels/{channel_id}/typing"
+        await self._http.post(url, headers={"Authorization": f"Bot {self.config.token}"})
@@ -1,11 +1,16 @@
-"""Email channel implementation using IMAP polling + SMTP replies."""
+"""Email channel implementation using IMAP IDLE/polling + SMTP replies."""
 
 import asyncio
 import html
 import imaplib
 import re
+import select
 import smtplib
 import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import date
 from email import policy
 from email.header import decode_header, make_header
@@ -21,17 +26,26 @@ from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import EmailConfig
 
+IMAP_IDLE_TIMEOUT_S = 25 * 60  # servers may drop IDLE after 30 minutes (RFC 2177)
+IMAP_MAX_BACKOFF_S = 300
+IMAP_FETCH_BATCH = 50
+SMTP_IDLE_TIMEOUT_S = 60  # reconnect rather than reuse a session the server may have dropped
+SMTP_QUEUE_SIZE = 100
+SMTP_BATCH = 20
+
 
 class EmailChannel(BaseChannel):
     """
     Email channel.
 
     Inbound:
-    - Poll IMAP mailbox for unread messages.
+    - Watch the IMAP mailbox for unread messages over one persistent
+      connection, woken by IDLE (falling back to polling).
     - Convert each message into an inbound event.
 
     Outbound:
-    - Send responses via SMTP back to the sender address.
+    - Send responses via SMTP back to the sender address, queued and sent
+      over one kept-alive connection.
     """
 
     name = "email"
@@ -55,8 +69,14 @@ class EmailChannel(BaseChannel):
         self.config: EmailConfig = config
         self._last_subject_by_chat: dict[str, str] = {}
         self._last_message_id_by_chat: dict[str, str] = {}
-        self._processed_uids: set[str] = set()  # Capped to prevent unbounded growth
-        self._MAX_PROCESSED_UIDS = 100000
+        self.dedup.max_size = 100_000
+        self._imap: imaplib.IMAP4 | None = None
+        self._imap_lock = threading.Lock()
+        self._smtp: smtplib.SMTP | None = None
+        self._smtp_last_used = 0.0
+        self._smtp_queue: asyncio.Queue[tuple[EmailMessage, asyncio.Future[None]]] | None = None
+        self._smtp_task: asyncio.Task | None = None
+        self._smtp_executor: ThreadPoolExecutor | None = None
 
     async def start(self) -> None:
         """Start polling IMAP for inbound emails."""
@@ -71,9 +91,10 @@ class EmailChannel(BaseChannel):
             return
 
         self._running = True
-        logger.info("Starting Email channel (IMAP polling mode)...")
+        logger.info("Starting Email channel (IMAP {} mode)...", "IDLE" if self.config.imap_idle else "polling")
 
         poll_seconds = max(5, int(self.config.poll_interval_seconds))
+        backoff = 0.0
         while self._running:
             try:
                 inbound_items = await asyncio.to_thread(self._fetch_new_messages)
@@ -93,14 +114,34 @@ class EmailChannel(BaseChannel):
                         content=item["content"],
                         metadata=item.get("metadata", {}),
                     )
+                backoff = 0.0
+                if self.config.imap_idle and await asyncio.to_thread(self._idle, IMAP_IDLE_TIMEOUT_S):
+                    continue
             except Exception as e:
-                logger.error("Email polling error: {}", e)
+                backoff = min(max(backoff * 2, 5.0), IMAP_MAX_BACKOFF_S)
+                logger.error("Email polling error (retrying in {}s): {}", backoff, e)
+                await asyncio.sleep(backoff)
+                continue
 
             await asyncio.sleep(poll_seconds)
 
+        await asyncio.to_thread(self._close_imap)
+
     async def stop(self) -> None:
         """Stop polling loop."""
         self._running = False
+        await asyncio.to_thread(self._close_imap)
+        if self._smtp_task:
+            self._smtp_task.cancel()
+            self._smtp_task = None
+        while self._smtp_queue and not self._smtp_queue.empty():
+            _, future = self._smtp_queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("email channel stopped"))
+        if self._smtp_executor:
+            await asyncio.get_running_loop().run_in_executor(self._smtp_executor, self._close_smtp)
+            self._smtp_executor.shutdown(wait=False)
+            self._smtp_executor = None
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send email via SMTP."""
@@ -145,7 +186,7 @@ class EmailChannel(BaseChannel):
             email_msg["References"] = in_reply_to
 
         try:
-            await asyncio.to_thread(self._smtp_send, email_msg)
+            await self._send_queued(email_msg)
         except Exception as e:
             logger.error("Error sending email to {}: {}", to_addr, e)
             raise
@@ -170,23 +211,107 @@ class EmailChannel(BaseChannel):
             return False
         return True
 
+    async def _send_queued(self, msg: EmailMessage) -> None:
+        """Queue *msg* for the SMTP worker and wait until it has been sent."""
+        if self._smtp_queue is None:
+            self._smtp_queue = asyncio.Queue(maxsize=SMTP_QUEUE_SIZE)
+        if self._smtp_task is None or self._smtp_task.done():
+            self._smtp_task = asyncio.create_task(self._smtp_worker())
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        await self._smtp_queue.put((msg, future))
+        await future
+
+    async def _smtp_worker(self) -> None:
+        """Drain the send queue, handing bursts to the SMTP thread in batches."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._smtp_queue.get()]
+            while len(batch) < SMTP_BATCH and not self._smtp_queue.empty():
+                batch.append(self._smtp_queue.get_nowait())
+            try:
+                results = await loop.run_in_executor(
+                    self._smtp_pool(), self._smtp_send_batch, [msg for msg, _ in batch]
+                )
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("email channel stopped"))
+                raise
+            for (_, future), error in zip(batch, results):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+    def _smtp_pool(self) -> ThreadPoolExecutor:
+        # One dedicated thread owns the SMTP connection; the default pool stays free.
+        if self._smtp_executor is None:
+            self._smtp_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nanobot-smtp")
+        return self._smtp_executor
+
+    def _smtp_send_batch(self, messages: list[EmailMessage]) -> list[Exception | None]:
+        results: list[Exception | None] = []
+        for msg in messages:
+            try:
+                self._smtp_send(msg)
+                results.append(None)
+            except Exception as e:
+                results.append(e)
+        return results
+
     def _smtp_send(self, msg: EmailMessage) -> None:
+        """Send one message over the pooled connection, reconnecting once if it has dropped."""
+        if self._smtp is not None and time.monotonic() - self._smtp_last_used > SMTP_IDLE_TIMEOUT_S:
+            self._close_smtp()
+        for attempt in range(2):
+            fresh = self._smtp is None
+            if fresh:
+                self._smtp = self._connect_smtp()
+            try:
+                self._smtp.send_message(msg)
+                self._smtp_last_used = time.monotonic()
+                return
+            except Exception as e:
+                if not self._is_disconnect(e):
+                    raise
+                self._close_smtp()
+                if fresh or attempt:
+                    raise
+                logger.debug("SMTP connection lost, reconnecting: {}", e)
+
+    def _connect_smtp(self) -> smtplib.SMTP:
         timeout = 30
         if self.config.smtp_use_ssl:
-            with smtplib.SMTP_SSL(
-                self.config.smtp_host,
-                self.config.smtp_port,
-                timeout=timeout,
-            ) as smtp:
-                smtp.login(self.config.smtp_username, self.config.smtp_password)
-                smtp.send_message(msg)
-            return
-
-        with smtplib.SMTP(self.config.smtp_host, self.config.smtp_port, timeout=timeout) as smtp:
+            smtp = smtplib.SMTP_SSL(self.config.smtp_host, self.config.smtp_port, timeout=timeout)
+        else:
+            smtp = smtplib.SMTP(self.config.smtp_host, self.config.smtp_port, timeout=timeout)
             if self.config.smtp_use_tls:
                 smtp.starttls(context=ssl.create_default_context())
-            smtp.login(self.config.smtp_username, self.config.smtp_password)
-            smtp.send_message(msg)
+        smtp.login(self.config.smtp_username, self.config.smtp_password)
+        return smtp
+
+    def _close_smtp(self) -> None:
+        smtp, self._smtp = self._smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except Exception:
+            try:
+                smtp.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _is_disconnect(e: Exception) -> bool:
+        if isinstance(e, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(e, smtplib.SMTPResponseException):
+            return e.smtp_code == 421  # service closing transmission channel
+        # SMTPException subclasses OSError; only plain socket errors mean a dead connection
+        return isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
 
     def _fetch_new_messages(self) -> list[dict[str, Any]]:
         """Poll IMAP and return parsed unread messages."""
@@ -195,6 +320,7 @@ class EmailChannel(BaseChannel):
             mark_seen=self.config.mark_seen,
             dedupe=True,
             limit=0,
+            persistent=True,
         )
 
     def fetch_messages_between_dates(
@@ -229,40 +355,162 @@ class EmailChannel(BaseChannel):
         mark_seen: bool,
         dedupe: bool,
         limit: int,
+        persistent: bool = False,
     ) -> list[dict[str, Any]]:
-        """Fetch messages by arbitrary IMAP search criteria."""
-        messages: list[dict[str, Any]] = []
-        mailbox = self.config.imap_mailbox or "INBOX"
+        """
+        Fetch messages by arbitrary IMAP search criteria.
 
+        With persistent=True the channel's long-lived connection is reused
+        (and dropped on any error so the next call reconnects); otherwise a
+        one-off connection is opened and closed.
+        """
+        with self._imap_lock if persistent else nullcontext():
+            client = self._imap if persistent else None
+            if client is None:
+                client = self._connect_imap()
+                if client is None:
+                    return []
+                if persistent:
+                    self._imap = client
+            try:
+                return self._search_and_fetch(client, search_criteria, mark_seen, dedupe, limit)
+            except Exception:
+                if persistent:
+                    self._drop_imap()
+                raise
+            finally:
+                if not persistent:
+                    self._logout(client)
+
+    def _connect_imap(self) -> imaplib.IMAP4 | None:
+        """Connect, log in and select the mailbox; None if the mailbox can't be selected."""
         if self.config.imap_use_ssl:
             client = imaplib.IMAP4_SSL(self.config.imap_host, self.config.imap_port)
         else:
             client = imaplib.IMAP4(self.config.imap_host, self.config.imap_port)
-
         try:
             client.login(self.config.imap_username, self.config.imap_password)
-            status, _ = client.select(mailbox)
-            if status != "OK":
-                return messages
-
-            status, data = client.search(None, *search_criteria)
-            if status != "OK" or not data:
-                return messages
-
-            ids = data[0].split()
-            if limit > 0 and len(ids) > limit:
-                ids = ids[-limit:]
-            for imap_id in ids:
-                status, fetched = client.fetch(imap_id, "(BODY.PEEK[] UID)")
-                if status != "OK" or not fetched:
-                    continue
+            status, _ = client.select(self.config.imap_mailbox or "INBOX")
+        except Exception:
+            self._logout(client)
+            raise
+        if status != "OK":
+            self._logout(client)
+            return None
+        return client
 
-                raw_bytes = self._extract_message_bytes(fetched)
-                if raw_bytes is None:
-                    continue
+    @staticmethod
+    def _logout(client: imaplib.IMAP4) -> None:
+        try:
+            client.logout()
+        except Exception:
+            pass
+
+    def _drop_imap(self) -> None:
+        if self._imap is not None:
+            self._logout(self._imap)
+            self._imap = None
+
+    def _close_imap(self) -> None:
+        with self._imap_lock:
+            self._drop_imap()
+
+    def _idle(self, timeout: float) -> bool:
+        """
+        Wait in IMAP IDLE until the mailbox changes, *timeout* passes or the channel stops.
+
+        Returns False when there is no connection or the server lacks IDLE,
+        so the caller falls back to polling.
+        """
+        with self._imap_lock:
+            client = self._imap
+            if client is None or "IDLE" not in getattr(client, "capabilities", ()):
+                return False
+            try:
+                tag = client._new_tag()
+                client.send(tag + b" IDLE\r\n")
+                if not self._read_imap_line(client).startswith(b"+"):
+                    raise imaplib.IMAP4.error("server rejected IDLE")
+                sock = client.socket()
+                deadline = time.monotonic() + timeout
+                # Wake up every second so stop() doesn't wait for the server.
+                while self._running and time.monotonic() < deadline:
+                    if self._has_buffered_input(client) or select.select([sock], [], [], 1.0)[0]:
+                        break
+                client.send(b"DONE\r\n")
+                while not (line := self._read_imap_line(client)).startswith(tag):
+                    pass
+                if b" OK" not in line:
+                    raise imaplib.IMAP4.error(f"IDLE failed: {line.decode(errors='replace').strip()}")
+            except Exception:
+                self._drop_imap()
+                raise
+            return True
+
+    @staticmethod
+    def _uidvalidity(client: imaplib.IMAP4) -> str:
+        """UIDVALIDITY from the last SELECT ("" if the server didn't send one)."""
+        values = getattr(client, "untagged_responses", {}).get("UIDVALIDITY") or [b""]
+        return values[-1].decode()
+
+    @staticmethod
+    def _has_buffered_input(client: imaplib.IMAP4) -> bool:
+        """
+        True if input is already buffered where select() can't see it.
+
+        A response that arrives in the same packet as the IDLE continuation
+        sits in imaplib's reader (or, over TLS, in the SSL layer) after the
+        "+" line is read. The reader is peeked with the socket briefly
+        non-blocking so an empty buffer doesn't wait for the server.
+        """
+        sock = client.socket()
+        if isinstance(sock, ssl.SSLSocket) and sock.pending():
+            return True
+        timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return bool(client.file.peek(1))
+        except (BlockingIOError, ssl.SSLWantReadError):
+            return False
+        finally:
+            sock.settimeout(timeout)
+
+    @staticmethod
+    def _read_imap_line(client: imaplib.IMAP4) -> bytes:
+        line = client.readline()
+        if not line:
+            raise imaplib.IMAP4.abort("connection closed by server")
+        return line
 
-                uid = self._extract_uid(fetched)
-                if dedupe and uid and uid in self._processed_uids:
+    def _search_and_fetch(
+        self,
+        client: imaplib.IMAP4,
+        search_criteria: tuple[str, ...],
+        mark_seen: bool,
+        dedupe: bool,
+        limit: int,
+    ) -> list[dict[str, Any]]:
+        messages: list[dict[str, Any]] = []
+        mailbox = self.config.imap_mailbox or "INBOX"
+        # UIDs are only unique within one UIDVALIDITY of the mailbox (RFC 3501 2.3.1.1)
+        scope = f"{mailbox}:{self._uidvalidity(client)}"
+
+        status, data = client.search(None, *search_criteria)
+        if status != "OK" or not data:
+            return messages
+
+        ids = data[0].split()
+        if limit > 0 and len(ids) > limit:
+            ids = ids[-limit:]
+        seen_ids: list[bytes] = []
+        for i in range(0, len(ids), IMAP_FETCH_BATCH):
+            # One FETCH round-trip per batch instead of one per message
+            status, fetched = client.fetch(b",".join(ids[i:i + IMAP_FETCH_BATCH]), "(BODY.PEEK[] UID)")
+            if status != "OK" or not fetched:
+                continue
+
+            for imap_id, uid, raw_bytes in self._split_fetch_response(fetched):
+                if dedupe and uid and f"{scope}:{uid}" in self.dedup:
                     continue
 
                 parsed = BytesParser(policy=policy.default).parsebytes(raw_bytes)
@@ -305,19 +553,14 @@ class EmailChannel(BaseChannel):
                 )
 
                 if dedupe and uid:
-                    self._processed_uids.add(uid)
-                    # mark_seen is the primary dedup; this set is a safety net
-                    if len(self._processed_uids) > self._MAX_PROCESSED_UIDS:
-                        # Evict a random half to cap memory; mark_seen is the primary dedup
-                        self._processed_uids = set(list(self._processed_uids)[len(self._processed_uids) // 2:])
+                    # mark_seen is the primary dedup; this store is a safety net
+                    self.dedup.add(f"{scope}:{uid}")
 
                 if mark_seen:
-                    client.store(imap_id, "+FLAGS", "\\Seen")
-        finally:
-            try:
-                client.logout()
-            except Exception:
-                pass
+                    seen_ids.append(imap_id)
+
+        if seen_ids:
+            client.store(b",".join(seen_ids), "+FLAGS", "\\Seen")
 
         return messages
 
@@ -328,21 +571,18 @@ class EmailChannel(BaseChannel):
         return f"{value.day:02d}-{month}-{value.year}"
 
     @staticmethod
-    def _extract_message_bytes(fetched: list[Any]) -> bytes | None:
-        for item in fetched:
-            if isinstance(item, tuple) and len(item) >= 2 and isinstance(item[1], (bytes, bytearray)):
-                return bytes(item[1])
-        return None
-
-    @staticmethod
-    def _extract_uid(fetched: list[Any]) -> str:
-        for item in fetched:
-            if isinstance(item, tuple) and item and isinstance(item[0], (bytes, bytearray)):
-                head = bytes(item[0]).decode("utf-8", errors="ignore")
-                m = re.search(r"UID\s+(\d+)", head)
-                if m:
-                    return m.group(1)
-        return ""
+    def _split_fetch_response(fetched: list[Any]) -> list[tuple[bytes, str, bytes]]:
+        """Split a (batched) FETCH response into (sequence number, UID, raw message) triples."""
+        results = []
+        for pos, item in enumerate(fetched):
+            if not (isinstance(item, tuple) and len(item) >= 2 and isinstance(item[1], (bytes, bytearray))):
+                continue
+            head = bytes(item[0])
+            # Some servers send UID after the message literal, e.g. b" UID 123)"
+            tail = fetched[pos + 1] if pos + 1 < len(fetched) and isinstance(fetched[pos + 1], bytes) else b""
+            m = re.search(rb"UID\s+(\d+)", head) or re.search(rb"UID\s+(\d+)", tail)
+            results.append((head.split(b" ", 1)[0], m.group(1).decode() if m else "", bytes(item[1])))
+        return results
 
     @staticmethod
     def _decode_header_value(value: str) -> str:
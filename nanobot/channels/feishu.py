@@ -1,41 +1,33 @@
-"""Feishu/Lark channel implementation using lark-oapi SDK with WebSocket long connection."""
+"""Feishu/Lark channel: lark-oapi WebSocket long connection for events, async HTTP for the Open API."""
 
 import asyncio
 import json
 import os
 import re
 import threading
-from collections import OrderedDict
+import time
+from functools import partial
 from pathlib import Path
 from typing import Any
+from urllib.parse import unquote
 
+import httpx
 from loguru import logger
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.rate_limit import RateLimiter, retry_after
 from nanobot.config.schema import FeishuConfig
+from nanobot.media import MediaStore, MediaTooLargeError, get_media_store
 
 try:
     import lark_oapi as lark
-    from lark_oapi.api.im.v1 import (
-        CreateFileRequest,
-        CreateFileRequestBody,
-        CreateImageRequest,
-        CreateImageRequestBody,
-        CreateMessageReactionRequest,
-        CreateMessageReactionRequestBody,
-        CreateMessageRequest,
-        CreateMessageRequestBody,
-        Emoji,
-        GetMessageResourceRequest,
-        P2ImMessageReceiveV1,
-    )
+    from lark_oapi.api.im.v1 import P2ImMessageReceiveV1
     FEISHU_AVAILABLE = True
 except ImportError:
     FEISHU_AVAILABLE = False
     lark = None
-    Emoji = None
 
 # Message type display mapping
 MSG_TYPE_MAP = {
@@ -45,6 +37,13 @@ MSG_TYPE_MAP = {
     "sticker": "[sticker]",
 }
 
+FEISHU_API_BASE = "https://open.feishu.cn/open-apis"
+
+# Open Platform error code for "request trigger frequency limit"
+_RATE_LIMITED = 99991400
+# Tenant access token invalid or expired
+_TOKEN_INVALID = {99991661, 99991663, 99991668}
+
 
 def _extract_share_card_content(content_json: dict, msg_type: str) -> str:
     """Extract text representation from share cards and interactive messages."""
@@ -247,6 +246,165 @@ def _extract_post_text(content_json: dict) -> str:
     return text
 
 
+class FeishuAPIError(Exception):
+    """Open Platform call answered with a non-zero code."""
+
+    def __init__(self, code: int, msg: str, retry_after: float = 1.0):
+        super().__init__(f"code={code}, msg={msg}")
+        self.code = code
+        self.msg = msg
+        self.retry_after = retry_after
+
+
+class FeishuClient:
+    """
+    Async Open Platform client for the handful of IM endpoints the channel uses.
+
+    One pooled httpx client serves every call. The tenant access token is
+    cached until shortly before it expires, refreshed by a single caller at
+    a time, and fetched again if the server reports it invalid. Uploads are
+    streamed from disk and resources straight into the given media store.
+    """
+
+    def __init__(self, app_id: str, app_secret: str, base_url: str = FEISHU_API_BASE, timeout: float = 30.0):
+        self.app_id = app_id
+        self.app_secret = app_secret
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._http: httpx.AsyncClient | None = None
+        self._token: str | None = None
+        self._token_expiry = 0.0
+        self._token_lock = asyncio.Lock()
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=self.timeout, limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            )
+        return self._http
+
+    async def tenant_token(self, refresh: bool = False) -> str:
+        async with self._token_lock:
+            if refresh or not self._token or time.monotonic() >= self._token_expiry:
+                resp = await self.http.post(
+                    f"{self.base_url}/auth/v3/tenant_access_token/internal",
+                    json={"app_id": self.app_id, "app_secret": self.app_secret},
+                )
+                body = self._json(resp)
+                if not resp.is_success or body.get("code") != 0:
+                    raise FeishuAPIError(
+                        body.get("code", resp.status_code),
+                        body.get("msg") or f"HTTP {resp.status_code}: {resp.text[:200]}",
+                        self._retry_after(resp),
+                    )
+                self._token = body["tenant_access_token"]
+                # Refresh five minutes early so in-flight calls never carry a stale token
+                self._token_expiry = time.monotonic() + max(60, int(body.get("expire", 7200)) - 300)
+            return self._token
+
+    async def request(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        """Call an endpoint and return its "data" object, raising FeishuAPIError on failure."""
+        refresh = False
+        while True:
+            headers = {"Authorization": f"Bearer {await self.tenant_token(refresh)}"}
+            resp = await self.http.request(method, f"{self.base_url}{path}", headers=headers, **kwargs)
+            body = self._json(resp)
+            code = body.get("code", 0 if resp.is_success else resp.status_code)
+            if code in _TOKEN_INVALID and not refresh:
+                refresh = True
+                continue
+            if code != 0:
+                raise FeishuAPIError(code, body.get("msg", ""), self._retry_after(resp))
+            return body.get("data") or {}
+
+    async def send_message(self, receive_id_type: str, receive_id: str, msg_type: str, content: str) -> None:
+        await self.request(
+            "POST", "/im/v1/messages", params={"receive_id_type": receive_id_type},
+            json={"receive_id": receive_id, "msg_type": msg_type, "content": content},
+        )
+
+    async def add_reaction(self, message_id: str, emoji_type: str) -> None:
+        await self.request(
+            "POST", f"/im/v1/messages/{message_id}/reactions",
+            json={"reaction_type": {"emoji_type": emoji_type}},
+        )
+
+    async def upload_image(self, file_path: str) -> str:
+        with open(file_path, "rb") as f:
+            result = await self.request(
+                "POST", "/im/v1/images",
+                data={"image_type": "message"}, files={"image": (os.path.basename(file_path), f)},
+            )
+        return result["image_key"]
+
+    async def upload_file(self, file_path: str, file_type: str) -> str:
+        file_name = os.path.basename(file_path)
+        with open(file_path, "rb") as f:
+            result = await self.request(
+                "POST", "/im/v1/files",
+                data={"file_type": file_type, "file_name": file_name}, files={"file": (file_name, f)},
+            )
+        return result["file_key"]
+
+    async def download_resource(
+        self,
+        store: MediaStore,
+        message_id: str,
+        file_key: str,
+        resource_type: str,
+        *,
+        default_name: str,
+        source: str = "",
+    ) -> tuple[Path, str]:
+        """Stream a message resource into *store*; returns (path, filename)."""
+        url = f"{self.base_url}/im/v1/messages/{message_id}/resources/{file_key}"
+        refresh = False
+        while True:
+            headers = {"Authorization": f"Bearer {await self.tenant_token(refresh)}"}
+            async with self.http.stream("GET", url, params={"type": resource_type}, headers=headers) as resp:
+                if not resp.is_success or resp.headers.get("content-type", "").startswith("application/json"):
+                    body = self._json(resp, await resp.aread())
+                    code = body.get("code", resp.status_code)
+                    if code in _TOKEN_INVALID and not refresh:
+                        refresh = True
+                        continue
+                    raise FeishuAPIError(code, body.get("msg", f"HTTP {resp.status_code}"), self._retry_after(resp))
+                filename = self._filename(resp.headers.get("content-disposition", "")) or default_name
+                declared = resp.headers.get("content-length")
+                path = await store.put_stream(
+                    resp.aiter_bytes(), kind=resource_type, filename=filename, source=source,
+                    declared_size=int(declared) if declared and declared.isdigit() else None,
+                )
+                return path, filename
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    @staticmethod
+    def _json(resp: httpx.Response, raw: bytes | None = None) -> dict[str, Any]:
+        try:
+            body = json.loads(raw if raw is not None else resp.content)
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    @staticmethod
+    def _retry_after(resp: httpx.Response) -> float:
+        reset = resp.headers.get("x-ogw-ratelimit-reset")
+        return float(reset) if reset and reset.isdigit() else retry_after(resp.headers)
+
+    @staticmethod
+    def _filename(disposition: str) -> str | None:
+        if m := re.search(r"filename\*=(?:UTF-8|utf-8)''([^;]+)", disposition):
+            return unquote(m.group(1).strip())
+        if m := re.search(r'filename="?([^";]+)"?', disposition):
+            return m.group(1).strip()
+        return None
+
+
 class FeishuChannel(BaseChannel):
     """
     Feishu/Lark channel using WebSocket long connection.
@@ -264,11 +422,13 @@ class FeishuChannel(BaseChannel):
     def __init__(self, config: FeishuConfig, bus: MessageBus):
         super().__init__(config, bus)
         self.config: FeishuConfig = config
-        self._client: Any = None
+        self._api: FeishuClient | None = None
         self._ws_client: Any = None
         self._ws_thread: threading.Thread | None = None
-        self._processed_message_ids: OrderedDict[str, None] = OrderedDict()  # Ordered dedup cache
+        self._ws_stop = threading.Event()
         self._loop: asyncio.AbstractEventLoop | None = None
+        # Send-message API: 50 requests/s per app, 5 per second to the same user or group
+        self._limiter = RateLimiter(rate=50, burst=50, chat_rate=5, chat_burst=5)
 
     async def start(self) -> None:
         """Start the Feishu bot with WebSocket long connection."""
@@ -283,12 +443,8 @@ class FeishuChannel(BaseChannel):
         self._running = True
         self._loop = asyncio.get_running_loop()
 
-        # Create Lark client for sending messages
-        self._client = lark.Client.builder() \
-            .app_id(self.config.app_id) \
-            .app_secret(self.config.app_secret) \
-            .log_level(lark.LogLevel.INFO) \
-            .build()
+        # Async Open API client for sending, reactions and media
+        self._api = FeishuClient(self.config.app_id, self.config.app_secret)
 
         # Create event handler (only register message receive, ignore other events)
         event_handler = lark.EventDispatcherHandler.builder(
@@ -306,16 +462,20 @@ class FeishuChannel(BaseChannel):
             log_level=lark.LogLevel.INFO
         )
 
-        # Start WebSocket client in a separate thread with reconnect loop
+        # The SDK's WebSocket client blocks on its own event loop, so it gets a thread;
+        # events are handed to our loop and all API calls stay on it.
+        self._ws_stop.clear()
+
         def run_ws():
+            delay = 1.0
             while self._running:
                 try:
                     self._ws_client.start()
                 except Exception as e:
-                    logger.warning("Feishu WebSocket error: {}", e)
-                if self._running:
-                    import time
-                    time.sleep(5)
+                    logger.warning("Feishu WebSocket error (reconnecting in {}s): {}", delay, e)
+                if self._ws_stop.wait(delay):
+                    break
+                delay = min(delay * 2, 60.0)
 
         self._ws_thread = threading.Thread(target=run_ws, daemon=True)
         self._ws_thread.start()
@@ -336,39 +496,25 @@ class FeishuChannel(BaseChannel):
         Reference: https://github.com/larksuite/oapi-sdk-python/blob/v2_main/lark_oapi/ws/client.py#L86
         """
         self._running = False
+        self._ws_stop.set()
+        if self._api:
+            await self._api.aclose()
+            self._api = None
         logger.info("Feishu bot stopped")
 
-    def _add_reaction_sync(self, message_id: str, emoji_type: str) -> None:
-        """Sync helper for adding reaction (runs in thread pool)."""
-        try:
-            request = CreateMessageReactionRequest.builder() \
-                .message_id(message_id) \
-                .request_body(
-                    CreateMessageReactionRequestBody.builder()
-                    .reaction_type(Emoji.builder().emoji_type(emoji_type).build())
-                    .build()
-                ).build()
-
-            response = self._client.im.v1.message_reaction.create(request)
-
-            if not response.success():
-                logger.warning("Failed to add reaction: code={}, msg={}", response.code, response.msg)
-            else:
-                logger.debug("Added {} reaction to message {}", emoji_type, message_id)
-        except Exception as e:
-            logger.warning("Error adding reaction: {}", e)
-
     async def _add_reaction(self, message_id: str, emoji_type: str = "THUMBSUP") -> None:
         """
         Add a reaction emoji to a message (non-blocking).
 
         Common emoji types: THUMBSUP, OK, EYES, DONE, OnIt, HEART
         """
-        if not self._client or not Emoji:
+        if not self._api:
             return
-
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self._add_reaction_sync, message_id, emoji_type)
+        try:
+            await self._api.add_reaction(message_id, emoji_type)
+            logger.debug("Added {} reaction to message {}", emoji_type, message_id)
+        except Exception as e:
+            logger.warning("Error adding reaction: {}", e)
 
     # Regex to match markdown tables (header + separator + data rows)
     _TABLE_RE = re.compile(
@@ -454,103 +600,27 @@ class FeishuChannel(BaseChannel):
         ".xls": "xls", ".xlsx": "xls", ".ppt": "ppt", ".pptx": "ppt",
     }
 
-    def _upload_image_sync(self, file_path: str) -> str | None:
+    async def _upload_image(self, file_path: str) -> str | None:
         """Upload an image to Feishu and return the image_key."""
         try:
-            with open(file_path, "rb") as f:
-                request = CreateImageRequest.builder() \
-                    .request_body(
-                        CreateImageRequestBody.builder()
-                        .image_type("message")
-                        .image(f)
-                        .build()
-                    ).build()
-                response = self._client.im.v1.image.create(request)
-                if response.success():
-                    image_key = response.data.image_key
-                    logger.debug("Uploaded image {}: {}", os.path.basename(file_path), image_key)
-                    return image_key
-                else:
-                    logger.error("Failed to upload image: code={}, msg={}", response.code, response.msg)
-                    return None
+            image_key = await self._api.upload_image(file_path)
+            logger.debug("Uploaded image {}: {}", os.path.basename(file_path), image_key)
+            return image_key
         except Exception as e:
             logger.error("Error uploading image {}: {}", file_path, e)
             return None
 
-    def _upload_file_sync(self, file_path: str) -> str | None:
+    async def _upload_file(self, file_path: str) -> str | None:
         """Upload a file to Feishu and return the file_key."""
         ext = os.path.splitext(file_path)[1].lower()
-        file_type = self._FILE_TYPE_MAP.get(ext, "stream")
-        file_name = os.path.basename(file_path)
         try:
-            with open(file_path, "rb") as f:
-                request = CreateFileRequest.builder() \
-                    .request_body(
-                        CreateFileRequestBody.builder()
-                        .file_type(file_type)
-                        .file_name(file_name)
-                        .file(f)
-                        .build()
-                    ).build()
-                response = self._client.im.v1.file.create(request)
-                if response.success():
-                    file_key = response.data.file_key
-                    logger.debug("Uploaded file {}: {}", file_name, file_key)
-                    return file_key
-                else:
-                    logger.error("Failed to upload file: code={}, msg={}", response.code, response.msg)
-                    return None
+            file_key = await self._api.upload_file(file_path, self._FILE_TYPE_MAP.get(ext, "stream"))
+            logger.debug("Uploaded file {}: {}", os.path.basename(file_path), file_key)
+            return file_key
         except Exception as e:
             logger.error("Error uploading file {}: {}", file_path, e)
             return None
 
-    def _download_image_sync(self, message_id: str, image_key: str) -> tuple[bytes | None, str | None]:
-        """Download an image from Feishu message by message_id and image_key."""
-        try:
-            request = GetMessageResourceRequest.builder() \
-                .message_id(message_id) \
-                .file_key(image_key) \
-                .type("image") \
-                .build()
-            response = self._client.im.v1.message_resource.get(request)
-            if response.success():
-                file_data = response.file
-                # GetMessageResourceRequest returns BytesIO, need to read bytes
-                if hasattr(file_data, 'read'):
-                    file_data = file_data.read()
-                return file_data, response.file_name
-            else:
-                logger.error("Failed to download image: code={}, msg={}", response.code, response.msg)
-                return None, None
-        except Exception as e:
-            logger.error("Error downloading image {}: {}", image_key, e)
-            return None, None
-
-    def _download_file_sync(
-        self, message_id: str, file_key: str, resource_type: str = "file"
-    ) -> tuple[bytes | None, str | None]:
-        """Download a file/audio/media from a Feishu message by message_id and file_key."""
-        try:
-            request = (
-                GetMessageResourceRequest.builder()
-                .message_id(message_id)
-                .file_key(file_key)
-                .type(resource_type)
-                .build()
-            )
-            response = self._client.im.v1.message_resource.get(request)
-            if response.success():
-                file_data = response.file
-                if hasattr(file_data, "read"):
-                    file_data = file_data.read()
-                return file_data, response.file_name
-            else:
-                logger.error("Failed to download {}: code={}, msg={}", resource_type, response.code, response.msg)
-                return None, None
-        except Exception:
-            logger.exception("Error downloading {} {}", resource_type, file_key)
-            return None, None
-
     async def _download_and_save_media(
         self,
         msg_type: str,
@@ -563,73 +633,81 @@ class FeishuChannel(BaseChannel):
         Returns:
             (file_path, content_text) - file_path is None if download failed
         """
-        loop = asyncio.get_running_loop()
-        media_dir = Path.home() / ".nanobot" / "media"
-        media_dir.mkdir(parents=True, exist_ok=True)
-
-        data, filename = None, None
-
         if msg_type == "image":
-            image_key = content_json.get("image_key")
-            if image_key and message_id:
-                data, filename = await loop.run_in_executor(
-                    None, self._download_image_sync, message_id, image_key
-                )
-                if not filename:
-                    filename = f"{image_key[:16]}.jpg"
-
+            file_key = content_json.get("image_key")
+            default_name = f"{(file_key or '')[:16]}.jpg"
         elif msg_type in ("audio", "file", "media"):
             file_key = content_json.get("file_key")
-            if file_key and message_id:
-                data, filename = await loop.run_in_executor(
-                    None, self._download_file_sync, message_id, file_key, msg_type
-                )
-                if not filename:
-                    ext = {"audio": ".opus", "media": ".mp4"}.get(msg_type, "")
-                    filename = f"{file_key[:16]}{ext}"
+            ext = {"audio": ".opus", "media": ".mp4"}.get(msg_type, "")
+            default_name = f"{(file_key or '')[:16]}{ext}"
+        else:
+            file_key = None
+        if not (file_key and message_id and self._api):
+            return None, f"[{msg_type}: download failed]"
 
-        if data and filename:
-            file_path = media_dir / filename
-            file_path.write_bytes(data)
-            logger.debug("Downloaded {} to {}", msg_type, file_path)
-            return str(file_path), f"[{msg_type}: {filename}]"
-
-        return None, f"[{msg_type}: download failed]"
-
-    def _send_message_sync(self, receive_id_type: str, receive_id: str, msg_type: str, content: str) -> bool:
-        """Send a single message (text/image/file/interactive) synchronously."""
         try:
-            request = CreateMessageRequest.builder() \
-                .receive_id_type(receive_id_type) \
-                .request_body(
-                    CreateMessageRequestBody.builder()
-                    .receive_id(receive_id)
-                    .msg_type(msg_type)
-                    .content(content)
-                    .build()
-                ).build()
-            response = self._client.im.v1.message.create(request)
-            if not response.success():
-                logger.error(
-                    "Failed to send Feishu {} message: code={}, msg={}, log_id={}",
-                    msg_type, response.code, response.msg, response.get_log_id()
-                )
-                return False
-            logger.debug("Feishu {} message sent to {}", msg_type, receive_id)
-            return True
+            file_path, filename = await self._api.download_resource(
+                get_media_store(), message_id, file_key, msg_type,
+                default_name=default_name, source=f"feishu:{message_id}",
+            )
+        except MediaTooLargeError as e:
+            logger.warning("Feishu {} {} rejected: {}", msg_type, default_name, e)
+            return None, f"[{msg_type}: {default_name} - too large]"
         except Exception as e:
-            logger.error("Error sending Feishu {} message: {}", msg_type, e)
-            return False
+            logger.error("Error downloading {} {}: {}", msg_type, file_key, e)
+            return None, f"[{msg_type}: download failed]"
+        logger.debug("Downloaded {} to {}", msg_type, file_path)
+        return str(file_path), f"[{msg_type}: {filename}]"
+
+    async def _download_all(
+        self,
+        items: list[tuple[str, dict]],
+        message_id: str,
+        content_parts: list[str],
+        media_paths: list[str],
+    ) -> None:
+        """Download a message's resources concurrently, appending markers and paths in order."""
+        results = await self.media_fetcher.fetch_all([
+            partial(self._download_and_save_media, msg_type, content_json, message_id)
+            for msg_type, content_json in items
+        ])
+        for (msg_type, _), result in zip(items, results):
+            if isinstance(result, BaseException):
+                logger.warning("Feishu {} download failed: {}", msg_type, result)
+                content_parts.append(f"[{msg_type}: download failed]")
+                continue
+            file_path, content_text = result
+            if file_path:
+                media_paths.append(file_path)
+            content_parts.append(content_text)
+
+    async def _send_message(self, receive_id_type: str, receive_id: str, msg_type: str, content: str) -> bool:
+        """Send a single message within Feishu's rate limits, retrying once when throttled."""
+        for attempt in range(2):
+            await self._limiter.acquire(receive_id)
+            try:
+                await self._api.send_message(receive_id_type, receive_id, msg_type, content)
+                logger.debug("Feishu {} message sent to {}", msg_type, receive_id)
+                return True
+            except FeishuAPIError as e:
+                if e.code != _RATE_LIMITED:
+                    logger.error("Failed to send Feishu {} message: {}", msg_type, e)
+                    return False
+                self._limiter.block(e.retry_after, receive_id)
+                logger.warning("Feishu rate limited sending to {}{}", receive_id, "" if attempt else ", retrying")
+            except Exception as e:
+                logger.error("Error sending Feishu {} message: {}", msg_type, e)
+                return False
+        return False
 
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Feishu, including media (images/files) if present."""
-        if not self._client:
+        if not self._api:
             logger.warning("Feishu client not initialized")
             return
 
         try:
             receive_id_type = "chat_id" if msg.chat_id.startswith("oc_") else "open_id"
-            loop = asyncio.get_running_loop()
 
             for file_path in msg.media:
                 if not os.path.isfile(file_path):
@@ -637,25 +715,22 @@ class FeishuChannel(BaseChannel):
                     continue
                 ext = os.path.splitext(file_path)[1].lower()
                 if ext in self._IMAGE_EXTS:
-                    key = await loop.run_in_executor(None, self._upload_image_sync, file_path)
+                    key = await self._upload_image(file_path)
                     if key:
-                        await loop.run_in_executor(
-                            None, self._send_message_sync,
+                        await self._send_message(
                             receive_id_type, msg.chat_id, "image", json.dumps({"image_key": key}, ensure_ascii=False),
                         )
                 else:
-                    key = await loop.run_in_executor(None, self._upload_file_sync, file_path)
+                    key = await self._upload_file(file_path)
                     if key:
                         media_type = "audio" if ext in self._AUDIO_EXTS else "file"
-                        await loop.run_in_executor(
-                            None, self._send_message_sync,
+                        await self._send_message(
                             receive_id_type, msg.chat_id, media_type, json.dumps({"file_key": key}, ensure_ascii=False),
                         )
 
             if msg.content and msg.content.strip():
                 card = {"config": {"wide_screen_mode": True}, "elements": self._build_card_elements(msg.content)}
-                await loop.run_in_executor(
-                    None, self._send_message_sync,
+                await self._send_message(
                     receive_id_type, msg.chat_id, "interactive", json.dumps(card, ensure_ascii=False),
                 )
 
@@ -679,13 +754,8 @@ class FeishuChannel(BaseChannel):
 
             # Deduplication check
             message_id = message.message_id
-            if message_id in self._processed_message_ids:
+            if self.dedup.is_duplicate(message_id):
                 return
-            self._processed_message_ids[message_id] = None
-
-            # Trim cache
-            while len(self._processed_message_ids) > 1000:
-                self._processed_message_ids.popitem(last=False)
 
             # Skip bot messages
             if sender.sender_type == "bot":
@@ -718,19 +788,12 @@ class FeishuChannel(BaseChannel):
                 if text:
                     content_parts.append(text)
                 # Download images embedded in post
-                for img_key in image_keys:
-                    file_path, content_text = await self._download_and_save_media(
-                        "image", {"image_key": img_key}, message_id
-                    )
-                    if file_path:
-                        media_paths.append(file_path)
-                    content_parts.append(content_text)
+                await self._download_all(
+                    [("image", {"image_key": k}) for k in image_keys], message_id, content_parts, media_paths
+                )
 
             elif msg_type in ("image", "audio", "file", "media"):
-                file_path, content_text = await self._download_and_save_media(msg_type, content_json, message_id)
-                if file_path:
-                    media_paths.append(file_path)
-                content_parts.append(content_text)
+                await self._download_all([(msg_type, content_json)], message_id, content_parts, media_paths)
 
             elif msg_type in ("share_chat", "share_user", "interactive", "share_calendar_event", "system", "merge_forward"):
                 # Handle share cards and interactive messages
@@ -753,6 +816,7 @@ class FeishuChannel(BaseChannel):
                 chat_id=reply_to,
                 content=content,
                 media=media_paths,
+                audio=media_paths if msg_type == "audio" else None,
                 metadata={
                     "message_id": message_id,
                     "chat_type": chat_type,
@@ -11,6 +11,9 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import Config
+from nanobot.media import MediaFetcher, configure_media_store
+from nanobot.providers.transcription import TranscriptionService
+from nanobot.utils.helpers import get_data_path
 
 
 class ChannelManager:
@@ -29,7 +32,14 @@ class ChannelManager:
         self.channels: dict[str, BaseChannel] = {}
         self._dispatch_task: asyncio.Task | None = None
 
+        configure_media_store(config.channels.media)
         self._init_channels()
+        media = config.channels.media
+        self.transcriber = TranscriptionService.from_config(config)
+        for channel in self.channels.values():
+            channel.media_fetcher = MediaFetcher(media.max_concurrent_downloads, media.download_timeout_s)
+            channel.transcriber = self.transcriber
+            channel.dedup.persist_to(get_data_path() / "dedup.db")
 
     def _init_channels(self) -> None:
         """Initialize channels based on config."""
@@ -38,11 +48,7 @@ class ChannelManager:
         if self.config.channels.telegram.enabled:
             try:
                 from nanobot.channels.telegram import TelegramChannel
-                self.channels["telegram"] = TelegramChannel(
-                    self.config.channels.telegram,
-                    self.bus,
-                    groq_api_key=self.config.providers.groq.api_key,
-                )
+                self.channels["telegram"] = TelegramChannel(self.config.channels.telegram, self.bus)
                 logger.info("Telegram channel enabled")
             except ImportError as e:
                 logger.warning("Telegram channel not available: {}", e)
@@ -200,9 +206,14 @@ class ChannelManager:
         for name, channel in self.channels.items():
             try:
                 await channel.stop()
+                await channel.cancel_pending()
                 logger.info("Stopped {} channel", name)
             except Exception as e:
                 logger.error("Error stopping {}: {}", name, e)
+            channel.dedup.close()
+
+        if self.transcriber:
+            await self.transcriber.aclose()
 
     async def _dispatch_outbound(self) -> None:
         """Dispatch outbound messages to the appropriate channel."""
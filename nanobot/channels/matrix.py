@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import mimetypes
+from functools import partial
 from pathlib import Path
 from typing import Any, TypeAlias
 
@@ -38,7 +39,9 @@ except ImportError as e:
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.typing_indicator import TypingIndicator
 from nanobot.config.loader import get_data_dir
+from nanobot.media import MediaTooLargeError, get_media_store
 from nanobot.utils.helpers import safe_filename
 
 TYPING_NOTICE_TIMEOUT_MS = 30_000
@@ -152,7 +155,7 @@ class MatrixChannel(BaseChannel):
         super().__init__(config, bus)
         self.client: AsyncClient | None = None
         self._sync_task: asyncio.Task | None = None
-        self._typing_tasks: dict[str, asyncio.Task] = {}
+        self._typing_indicator: TypingIndicator | None = None
         self._restrict_to_workspace = restrict_to_workspace
         self._workspace = workspace.expanduser().resolve() if workspace else None
         self._server_upload_limit_bytes: int | None = None
@@ -194,8 +197,7 @@ class MatrixChannel(BaseChannel):
     async def stop(self) -> None:
         """Stop the Matrix channel with graceful sync shutdown."""
         self._running = False
-        for room_id in list(self._typing_tasks):
-            await self._stop_typing_keepalive(room_id, clear_typing=False)
+        self._typing.close()
         if self.client:
             self.client.stop_sync_forever()
         if self._sync_task:
@@ -417,30 +419,27 @@ class MatrixChannel(BaseChannel):
         except Exception:
             pass
 
+    @property
+    def _typing(self) -> TypingIndicator:
+        if self._typing_indicator is None:
+            self._typing_indicator = TypingIndicator(
+                self._keep_typing, interval_s=TYPING_KEEPALIVE_INTERVAL_MS / 1000, name="Matrix",
+            )
+        return self._typing_indicator
+
+    async def _keep_typing(self, room_id: str) -> None:
+        await self._set_typing(room_id, True)
+
     async def _start_typing_keepalive(self, room_id: str) -> None:
         """Start periodic typing refresh (spec-recommended keepalive)."""
-        await self._stop_typing_keepalive(room_id, clear_typing=False)
-        await self._set_typing(room_id, True)
         if not self._running:
+            self._typing.stop(room_id)
+            await self._set_typing(room_id, True)
             return
-
-        async def loop() -> None:
-            try:
-                while self._running:
-                    await asyncio.sleep(TYPING_KEEPALIVE_INTERVAL_MS / 1000)
-                    await self._set_typing(room_id, True)
-            except asyncio.CancelledError:
-                pass
-
-        self._typing_tasks[room_id] = asyncio.create_task(loop())
+        self._typing.start(room_id)
 
     async def _stop_typing_keepalive(self, room_id: str, *, clear_typing: bool) -> None:
-        if task := self._typing_tasks.pop(room_id, None):
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+        self._typing.stop(room_id)
         if clear_typing:
             await self._set_typing(room_id, False)
 
@@ -489,11 +488,6 @@ class MatrixChannel(BaseChannel):
             return self._is_bot_mentioned(event)
         return False
 
-    def _media_dir(self) -> Path:
-        d = get_data_dir() / "media" / "matrix"
-        d.mkdir(parents=True, exist_ok=True)
-        return d
-
     @staticmethod
     def _event_source_content(event: RoomMessage) -> dict[str, Any]:
         source = getattr(event, "source", None)
@@ -559,19 +553,6 @@ class MatrixChannel(BaseChannel):
                 return candidate
         return _DEFAULT_ATTACH_NAME if attachment_type == "file" else attachment_type
 
-    def _build_attachment_path(self, event: MatrixMediaEvent, attachment_type: str,
-                               filename: str, mime: str | None) -> Path:
-        safe_name = safe_filename(Path(filename).name) or _DEFAULT_ATTACH_NAME
-        suffix = Path(safe_name).suffix
-        if not suffix and mime:
-            if guessed := mimetypes.guess_extension(mime, strict=False):
-                safe_name, suffix = f"{safe_name}{guessed}", guessed
-        stem = (Path(safe_name).stem or attachment_type)[:72]
-        suffix = suffix[:16]
-        event_id = safe_filename(str(getattr(event, "event_id", "") or "evt").lstrip("$"))
-        event_prefix = (event_id[:24] or "evt").strip("_")
-        return self._media_dir() / f"{event_prefix}_{stem}{suffix}"
-
     async def _download_media_bytes(self, mxc_url: str) -> bytes | None:
         if not self.client:
             return None
@@ -636,9 +617,12 @@ class MatrixChannel(BaseChannel):
         if len(data) > limit_bytes:
             return None, _ATTACH_TOO_LARGE.format(filename)
 
-        path = self._build_attachment_path(event, atype, filename, mime)
         try:
-            path.write_bytes(data)
+            path = await get_media_store(get_data_dir() / "media").put_bytes(
+                data, kind=atype, filename=filename, mime=mime, source=f"matrix:{room.room_id}",
+            )
+        except MediaTooLargeError:
+            return None, _ATTACH_TOO_LARGE.format(filename)
         except OSError:
             return None, fail
 
@@ -675,7 +659,11 @@ class MatrixChannel(BaseChannel):
     async def _on_media_message(self, room: MatrixRoom, event: MatrixMediaEvent) -> None:
         if event.sender == self.config.user_id or not self._should_process_message(room, event):
             return
-        attachment, marker = await self._fetch_media_attachment(room, event)
+        [result] = await self.media_fetcher.fetch_all([partial(self._fetch_media_attachment, room, event)])
+        if isinstance(result, BaseException):
+            logger.warning("Matrix attachment fetch failed: {}", result)
+            result = (None, _ATTACH_FAILED.format(self._event_filename(event, self._event_attachment_type(event))))
+        attachment, marker = result
         parts: list[str] = []
         if isinstance(body := getattr(event, "body", None), str) and body.strip():
             parts.append(body.strip())
@@ -693,6 +681,7 @@ class MatrixChannel(BaseChannel):
                 content="\n".join(parts),
                 media=[attachment["path"]] if attachment else [],
                 metadata=meta,
+                audio=[attachment["path"]] if attachment and attachment["type"] == "audio" else None,
             )
         except Exception:
             await self._stop_typing_keepalive(room.room_id, clear_typing=True)
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import asyncio
 import json
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
@@ -31,7 +30,6 @@ try:
 except ImportError:
     MSGPACK_AVAILABLE = False
 
-MAX_SEEN_MESSAGE_IDS = 2000
 CURSOR_SAVE_DEBOUNCE_S = 0.5
 
 
@@ -236,8 +234,6 @@ class MochatChannel(BaseChannel):
         self._cold_sessions: set[str] = set()
         self._session_by_converse: dict[str, str] = {}
 
-        self._seen_set: dict[str, set[str]] = {}
-        self._seen_queue: dict[str, deque[str]] = {}
         self._delay_states: dict[str, DelayState] = {}
 
         self._fallback_mode = False
@@ -673,7 +669,7 @@ class MochatChannel(BaseChannel):
 
         message_id = _str_field(payload, "messageId")
         seen_key = f"{target_kind}:{target_id}"
-        if message_id and self._remember_message_id(seen_key, message_id):
+        if message_id and self.dedup.is_duplicate(f"{seen_key}:{message_id}"):
             return
 
         raw_body = normalize_mochat_content(payload.get("content")) or "[empty message]"
@@ -708,17 +704,6 @@ class MochatChannel(BaseChannel):
 
     # ---- dedup / buffering -------------------------------------------------
 
-    def _remember_message_id(self, key: str, message_id: str) -> bool:
-        seen_set = self._seen_set.setdefault(key, set())
-        seen_queue = self._seen_queue.setdefault(key, deque())
-        if message_id in seen_set:
-            return True
-        seen_set.add(message_id)
-        seen_queue.append(message_id)
-        while len(seen_queue) > MAX_SEEN_MESSAGE_IDS:
-            seen_set.discard(seen_queue.popleft())
-        return False
-
     async def _enqueue_delayed_entry(self, key: str, target_id: str, target_kind: str, entry: MochatBufferedEntry) -> None:
         state = self._delay_states.setdefault(key, DelayState())
         async with state.lock:
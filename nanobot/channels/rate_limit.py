@@ -0,0 +1,132 @@
+"""Outbound rate limiting for chat channels."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations.
+
+    reserve() always takes a token and returns how long the caller must wait
+    for it; tokens may go negative, so concurrent callers queue up in order
+    instead of all retrying at the same moment.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _fill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def reserve(self, now: float) -> float:
+        self._fill(now)
+        self.tokens -= 1
+        owed = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return self.blocked_for(now) + owed
+
+    def block(self, seconds: float, now: float) -> None:
+        """Empty the bucket and start refilling only after *seconds*."""
+        self._fill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, now + seconds)
+
+    def blocked_for(self, now: float) -> float:
+        return max(0.0, self.updated - now)
+
+
+class RateLimiter:
+    """
+    Schedules outbound API calls within a platform's documented limits.
+
+    Every call takes a token from a global bucket (per bot) and, when a key is
+    given, from that chat's bucket, sleeping until both allow it. Server hints
+    (429 Retry-After, "remaining: 0" headers) are fed back with block(), which
+    pauses the chat, or the whole bot when no key is given. Idle chat buckets
+    are evicted beyond max_chats.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        chat_rate: float | None = None,
+        chat_burst: float = 1,
+        max_chats: int = 1024,
+    ):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_chats = max_chats
+        self._global = TokenBucket(rate, burst)
+        self._chats: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    def _chat(self, key: str, rate: float | None = None, burst: float | None = None) -> TokenBucket | None:
+        if (bucket := self._chats.get(key)) is not None:
+            self._chats.move_to_end(key)
+            return bucket
+        rate = rate or self.chat_rate
+        if not rate:
+            return None
+        bucket = self._chats[key] = TokenBucket(rate, burst or self.chat_burst)
+        while len(self._chats) > self.max_chats:
+            self._chats.popitem(last=False)
+        return bucket
+
+    def _buckets(self, key: str | None, rate: float | None = None, burst: float | None = None) -> list[TokenBucket]:
+        chat = self._chat(key, rate, burst) if key else None
+        return [self._global, chat] if chat else [self._global]
+
+    async def acquire(self, key: str | None = None, *, rate: float | None = None, burst: float | None = None) -> None:
+        """Wait until one more call for *key* is allowed (rate/burst override the chat defaults)."""
+        buckets = self._buckets(key, rate, burst)
+        now = time.monotonic()
+        delay = max(b.reserve(now) for b in buckets)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        # A 429 seen by another call while we slept pauses us too.
+        while (blocked := max(b.blocked_for(time.monotonic()) for b in buckets)) > 0:
+            await asyncio.sleep(blocked)
+
+    def block(self, seconds: float, key: str | None = None) -> None:
+        """Pause calls for *key*, or every call when key is None, for *seconds*."""
+        now = time.monotonic()
+        bucket = self._chat(key) if key else self._global
+        (bucket or self._global).block(seconds, now)
+
+
+def retry_after(headers: Mapping[str, str] | None = None, body: Any = None, default: float = 1.0) -> float:
+    """
+    Seconds to wait according to a rate-limited response.
+
+    Understands the Retry-After header (seconds or HTTP date), Discord's
+    X-RateLimit-Reset-After and JSON retry_after, and Telegram's
+    parameters.retry_after.
+    """
+    if isinstance(body, dict):
+        for value in (body.get("retry_after"), (body.get("parameters") or {}).get("retry_after")):
+            if value is not None:
+                try:
+                    return max(0.0, float(value))
+                except (TypeError, ValueError):
+                    pass
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    for name in ("retry-after", "x-ratelimit-reset-after"):
+        if not (value := headers.get(name)):
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return default
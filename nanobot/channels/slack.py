@@ -5,6 +5,7 @@ import re
 from typing import Any
 
 from loguru import logger
+from slack_sdk.errors import SlackApiError
 from slack_sdk.socket_mode.request import SocketModeRequest
 from slack_sdk.socket_mode.response import SocketModeResponse
 from slack_sdk.socket_mode.websockets import SocketModeClient
@@ -14,6 +15,7 @@ from slackify_markdown import slackify_markdown
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.rate_limit import RateLimiter, retry_after
 from nanobot.config.schema import SlackConfig
 
 
@@ -28,6 +30,8 @@ class SlackChannel(BaseChannel):
         self._web_client: AsyncWebClient | None = None
         self._socket_client: SocketModeClient | None = None
         self._bot_user_id: str | None = None
+        # chat.postMessage: about one message per second per channel, short bursts allowed
+        self._limiter = RateLimiter(rate=20, burst=20, chat_rate=1, chat_burst=3)
 
     async def start(self) -> None:
         """Start the Slack Socket Mode client."""
@@ -86,16 +90,18 @@ class SlackChannel(BaseChannel):
             thread_ts_param = thread_ts if use_thread else None
 
             if msg.content:
-                await self._web_client.chat_postMessage(
-                    channel=msg.chat_id,
+                await self._call(
+                    self._web_client.chat_postMessage,
+                    msg.chat_id,
                     text=self._to_mrkdwn(msg.content),
                     thread_ts=thread_ts_param,
                 )
 
             for media_path in msg.media or []:
                 try:
-                    await self._web_client.files_upload_v2(
-                        channel=msg.chat_id,
+                    await self._call(
+                        self._web_client.files_upload_v2,
+                        msg.chat_id,
                         file=media_path,
                         thread_ts=thread_ts_param,
                     )
@@ -104,6 +110,19 @@ class SlackChannel(BaseChannel):
         except Exception as e:
             logger.error("Error sending Slack message: {}", e)
 
+    async def _call(self, method, channel: str, **kwargs):
+        """Call a Web API method within Slack's rate limits, retrying once on HTTP 429."""
+        for attempt in range(2):
+            await self._limiter.acquire(channel)
+            try:
+                return await method(channel=channel, **kwargs)
+            except SlackApiError as e:
+                if e.response.status_code != 429 or attempt:
+                    raise
+                wait = retry_after(e.response.headers)
+                self._limiter.block(wait, channel)
+                logger.warning("Slack rate limited in {}, retrying in {}s", channel, wait)
+
     async def _on_socket_request(
         self,
         client: SocketModeClient,
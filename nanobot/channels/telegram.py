@@ -4,16 +4,23 @@ from __future__ import annotations
 
 import asyncio
 import re
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
 
 from loguru import logger
 from telegram import BotCommand, ReplyParameters, Update
+from telegram.error import RetryAfter
 from telegram.ext import Application, CommandHandler, ContextTypes, MessageHandler, filters
 from telegram.request import HTTPXRequest
 
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.rate_limit import RateLimiter
+from nanobot.channels.typing_indicator import TypingIndicator
 from nanobot.config.schema import TelegramConfig
+from nanobot.media import MediaTooLargeError, get_media_store
 
 
 def _markdown_to_telegram_html(text: str) -> str:
@@ -116,18 +123,15 @@ class TelegramChannel(BaseChannel):
         BotCommand("help", "Show available commands"),
     ]
 
-    def __init__(
-        self,
-        config: TelegramConfig,
-        bus: MessageBus,
-        groq_api_key: str = "",
-    ):
+    def __init__(self, config: TelegramConfig, bus: MessageBus):
         super().__init__(config, bus)
         self.config: TelegramConfig = config
-        self.groq_api_key = groq_api_key
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
-        self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        # Telegram shows "typing" for 5s per call; sendChatAction counts toward the ~30 msg/s bot limit
+        # Bot API: about 30 messages/s overall
+        self._limiter = RateLimiter(rate=30, burst=30)
+        self._typing = TypingIndicator(self._send_typing, interval_s=4, max_per_tick=20, name="Telegram")
         self._media_group_buffers: dict[str, dict] = {}
         self._media_group_tasks: dict[str, asyncio.Task] = {}
 
@@ -192,8 +196,7 @@ class TelegramChannel(BaseChannel):
         self._running = False
 
         # Cancel all typing indicators
-        for chat_id in list(self._typing_tasks):
-            self._stop_typing(chat_id)
+        self._typing.close()
 
         for task in self._media_group_tasks.values():
             task.cancel()
@@ -252,17 +255,13 @@ class TelegramChannel(BaseChannel):
                     "audio": self._app.bot.send_audio,
                 }.get(media_type, self._app.bot.send_document)
                 param = "photo" if media_type == "photo" else media_type if media_type in ("voice", "audio") else "document"
-                with open(media_path, 'rb') as f:
-                    await sender(
-                        chat_id=chat_id,
-                        **{param: f},
-                        reply_parameters=reply_params
-                    )
+                await self._call(sender, chat_id, **{param: Path(media_path)}, reply_parameters=reply_params)
             except Exception as e:
                 filename = media_path.rsplit("/", 1)[-1]
                 logger.error("Failed to send media {}: {}", media_path, e)
-                await self._app.bot.send_message(
-                    chat_id=chat_id,
+                await self._call(
+                    self._app.bot.send_message,
+                    chat_id,
                     text=f"[Failed to send: {filename}]",
                     reply_parameters=reply_params
                 )
@@ -272,8 +271,9 @@ class TelegramChannel(BaseChannel):
             for chunk in _split_message(msg.content):
                 try:
                     html = _markdown_to_telegram_html(chunk)
-                    await self._app.bot.send_message(
-                        chat_id=chat_id,
+                    await self._call(
+                        self._app.bot.send_message,
+                        chat_id,
                         text=html,
                         parse_mode="HTML",
                         reply_parameters=reply_params
@@ -281,14 +281,32 @@ class TelegramChannel(BaseChannel):
                 except Exception as e:
                     logger.warning("HTML parse failed, falling back to plain text: {}", e)
                     try:
-                        await self._app.bot.send_message(
-                            chat_id=chat_id,
+                        await self._call(
+                            self._app.bot.send_message,
+                            chat_id,
                             text=chunk,
                             reply_parameters=reply_params
                         )
                     except Exception as e2:
                         logger.error("Error sending Telegram message: {}", e2)
 
+    async def _call(self, method, chat_id: int, **kwargs):
+        """Call a Bot API send method within Telegram's flood limits, retrying once on RetryAfter."""
+        key = str(chat_id)
+        # Groups (negative ids) allow 20 messages per minute, private chats about one per second
+        rate, burst = (20 / 60, 5) if chat_id < 0 else (1.0, 3)
+        for attempt in range(2):
+            await self._limiter.acquire(key, rate=rate, burst=burst)
+            try:
+                return await method(chat_id=chat_id, **kwargs)
+            except RetryAfter as e:
+                wait = e.retry_after
+                wait = wait.total_seconds() if isinstance(wait, timedelta) else float(wait)
+                self._limiter.block(wait, key)
+                if attempt:
+                    raise
+                logger.warning("Telegram flood control for {}, retrying in {}s", chat_id, wait)
+
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
         if not update.message or not update.effective_user:
@@ -344,6 +362,7 @@ class TelegramChannel(BaseChannel):
         # Build content from text and/or media
         content_parts = []
         media_paths = []
+        audio_paths: list[str] = []
 
         # Text content
         if message.text:
@@ -371,33 +390,21 @@ class TelegramChannel(BaseChannel):
         # Download media if present
         if media_file and self._app:
             try:
-                file = await self._app.bot.get_file(media_file.file_id)
-                ext = self._get_extension(media_type, getattr(media_file, 'mime_type', None))
-
-                # Save to workspace/media/
-                from pathlib import Path
-                media_dir = Path.home() / ".nanobot" / "media"
-                media_dir.mkdir(parents=True, exist_ok=True)
-
-                file_path = media_dir / f"{media_file.file_id[:16]}{ext}"
-                await file.download_to_drive(str(file_path))
+                [file_path] = await self.media_fetcher.fetch_all(
+                    [partial(self._download_media, media_file, media_type, chat_id)]
+                )
+                if isinstance(file_path, BaseException):
+                    raise file_path
 
                 media_paths.append(str(file_path))
-
-                # Handle voice transcription
                 if media_type == "voice" or media_type == "audio":
-                    from nanobot.providers.transcription import GroqTranscriptionProvider
-                    transcriber = GroqTranscriptionProvider(api_key=self.groq_api_key)
-                    transcription = await transcriber.transcribe(file_path)
-                    if transcription:
-                        logger.info("Transcribed {}: {}...", media_type, transcription[:50])
-                        content_parts.append(f"[transcription: {transcription}]")
-                    else:
-                        content_parts.append(f"[{media_type}: {file_path}]")
-                else:
-                    content_parts.append(f"[{media_type}: {file_path}]")
+                    audio_paths.append(str(file_path))  # transcribed before the message is forwarded
+                content_parts.append(f"[{media_type}: {file_path}]")
 
                 logger.debug("Downloaded {} to {}", media_type, file_path)
+            except MediaTooLargeError as e:
+                logger.warning("Telegram {} rejected: {}", media_type, e)
+                content_parts.append(f"[{media_type}: too large]")
             except Exception as e:
                 logger.error("Failed to download media: {}", e)
                 content_parts.append(f"[{media_type}: download failed]")
@@ -414,7 +421,7 @@ class TelegramChannel(BaseChannel):
             if key not in self._media_group_buffers:
                 self._media_group_buffers[key] = {
                     "sender_id": sender_id, "chat_id": str_chat_id,
-                    "contents": [], "media": [],
+                    "contents": [], "media": [], "audio": [],
                     "metadata": {
                         "message_id": message.message_id, "user_id": user.id,
                         "username": user.username, "first_name": user.first_name,
@@ -426,6 +433,7 @@ class TelegramChannel(BaseChannel):
             if content and content != "[empty message]":
                 buf["contents"].append(content)
             buf["media"].extend(media_paths)
+            buf["audio"].extend(audio_paths)
             if key not in self._media_group_tasks:
                 self._media_group_tasks[key] = asyncio.create_task(self._flush_media_group(key))
             return
@@ -439,6 +447,7 @@ class TelegramChannel(BaseChannel):
             chat_id=str_chat_id,
             content=content,
             media=media_paths,
+            audio=audio_paths,
             metadata={
                 "message_id": message.message_id,
                 "user_id": user.id,
@@ -458,38 +467,46 @@ class TelegramChannel(BaseChannel):
             await self._handle_message(
                 sender_id=buf["sender_id"], chat_id=buf["chat_id"],
                 content=content, media=list(dict.fromkeys(buf["media"])),
-                metadata=buf["metadata"],
+                metadata=buf["metadata"], audio=list(dict.fromkeys(buf["audio"])),
             )
         finally:
             self._media_group_tasks.pop(key, None)
 
     def _start_typing(self, chat_id: str) -> None:
         """Start sending 'typing...' indicator for a chat."""
-        # Cancel any existing typing task for this chat
-        self._stop_typing(chat_id)
-        self._typing_tasks[chat_id] = asyncio.create_task(self._typing_loop(chat_id))
+        self._typing.start(chat_id)
 
     def _stop_typing(self, chat_id: str) -> None:
         """Stop the typing indicator for a chat."""
-        task = self._typing_tasks.pop(chat_id, None)
-        if task and not task.done():
-            task.cancel()
+        self._typing.stop(chat_id)
 
-    async def _typing_loop(self, chat_id: str) -> None:
-        """Repeatedly send 'typing' action until cancelled."""
-        try:
-            while self._app:
-                await self._app.bot.send_chat_action(chat_id=int(chat_id), action="typing")
-                await asyncio.sleep(4)
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            logger.debug("Typing indicator stopped for {}: {}", chat_id, e)
+    async def _send_typing(self, chat_id: str) -> None:
+        if not self._app:
+            raise RuntimeError("bot stopped")
+        await self._app.bot.send_chat_action(chat_id=int(chat_id), action="typing")
 
     async def _on_error(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Log polling / handler errors instead of silently swallowing them."""
         logger.error("Telegram error: {}", context.error)
 
+    async def _download_media(self, media_file, media_type: str, chat_id: int) -> Path:
+        """Download a message attachment into the shared media store."""
+        store = get_media_store()
+        mime = getattr(media_file, 'mime_type', None)
+        limit = store.limit_for(media_type, mime)
+        if (media_file.file_size or 0) > limit:
+            raise MediaTooLargeError(media_file.file_size, limit)
+        file = await self._app.bot.get_file(media_file.file_id)
+        ext = self._get_extension(media_type, mime)
+
+        tmp_path = store.temp_path()
+        await file.download_to_drive(str(tmp_path))
+        return await store.put_file(
+            tmp_path, kind=media_type, mime=mime,
+            filename=getattr(media_file, 'file_name', None) or f"{media_type}{ext}",
+            source=f"telegram:{chat_id}",
+        )
+
     def _get_extension(self, media_type: str, mime_type: str | None) -> str:
         """Get file extension based on media type."""
         if mime_type:
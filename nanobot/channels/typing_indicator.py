@@ -0,0 +1,92 @@
+"""Shared "typing…" indicator refresh for chat channels."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+
+class TypingIndicator:
+    """
+    Keeps the typing indicator alive for every chat a channel is working on.
+
+    One ticker task per channel replaces a sleep loop per chat: each tick
+    refreshes the chats whose indicator is about to lapse, concurrently but
+    at most max_per_tick at a time so bursts stay inside platform rate
+    limits (the rest go first on the next tick). start() only registers the
+    chat and wakes the ticker, which sends the first refresh, so inbound
+    handling never waits on the typing API. A chat drops out when the
+    channel calls stop(), when a refresh fails, or after timeout_s.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[None]],
+        interval_s: float,
+        timeout_s: float = 600.0,
+        max_per_tick: int = 10,
+        name: str = "",
+    ):
+        self.send = send
+        self.interval_s = interval_s
+        self.timeout_s = timeout_s
+        self.max_per_tick = max_per_tick
+        self.name = name
+        self.active: dict[str, tuple[float, float]] = {}  # chat_id -> (started, last refresh)
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    def __contains__(self, chat_id: str) -> bool:
+        return chat_id in self.active
+
+    def start(self, chat_id: str) -> None:
+        """Show the indicator on the next tick (right away) and keep refreshing it until stop()."""
+        self.active[chat_id] = (time.monotonic(), float("-inf"))
+        self._wake.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self, chat_id: str) -> None:
+        self.active.pop(chat_id, None)
+
+    def close(self) -> None:
+        """Forget all chats and stop the ticker."""
+        self.active.clear()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _refresh(self, chat_id: str) -> bool:
+        try:
+            await self.send(chat_id)
+            return True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug("{} typing indicator stopped for {}: {}", self.name, chat_id, e)
+            self.active.pop(chat_id, None)
+            return False
+
+    async def _run(self) -> None:
+        while self.active:
+            self._wake.clear()
+            now = time.monotonic()
+            due: list[str] = []
+            for chat_id, (started, last) in list(self.active.items()):
+                if now - started > self.timeout_s:
+                    logger.debug("{} typing indicator timed out for {}", self.name, chat_id)
+                    del self.active[chat_id]
+                elif now - last >= self.interval_s:
+                    due.append(chat_id)
+            due.sort(key=lambda c: self.active[c][1])
+            batch = due[: self.max_per_tick]
+            for chat_id in batch:
+                self.active[chat_id] = (self.active[chat_id][0], now)
+            await asyncio.gather(*(self._refresh(c) for c in batch))
+            if not self.active:
+                break
+            try:
+                await asyncio.wait_for(self._wake.wait(), min(self.interval_s, 1.0))
+            except asyncio.TimeoutError:
+                pass
@@ -1,8 +1,8 @@
 """WhatsApp channel implementation using Node.js bridge."""
 
 import asyncio
+import base64
 import json
-from collections import OrderedDict
 
 from loguru import logger
 
@@ -10,6 +10,7 @@ from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import WhatsAppConfig
+from nanobot.media import MediaTooLargeError, get_media_store
 
 
 class WhatsAppChannel(BaseChannel):
@@ -27,7 +28,6 @@ class WhatsAppChannel(BaseChannel):
         self.config: WhatsAppConfig = config
         self._ws = None
         self._connected = False
-        self._processed_message_ids: OrderedDict[str, None] = OrderedDict()
 
     async def start(self) -> None:
         """Start the WhatsApp channel by connecting to the bridge."""
@@ -111,27 +111,35 @@ class WhatsAppChannel(BaseChannel):
             content = data.get("content", "")
             message_id = data.get("id", "")
 
-            if message_id:
-                if message_id in self._processed_message_ids:
-                    return
-                self._processed_message_ids[message_id] = None
-                while len(self._processed_message_ids) > 1000:
-                    self._processed_message_ids.popitem(last=False)
+            if message_id and self.dedup.is_duplicate(message_id):
+                return
 
             # Extract just the phone number or lid as chat_id
             user_id = pn if pn else sender
             sender_id = user_id.split("@")[0] if "@" in user_id else user_id
             logger.info("Sender {}", sender)
 
-            # Handle voice transcription if it's a voice message
-            if content == "[Voice Message]":
-                logger.info("Voice message received from {}, but direct download from bridge is not yet supported.", sender_id)
-                content = "[Voice Message: Transcription not available for WhatsApp yet]"
+            # Voice notes arrive base64-encoded from the bridge and are transcribed before forwarding
+            media: list[str] = []
+            if audio := data.get("audio"):
+                try:
+                    path = await get_media_store().put_bytes(
+                        base64.b64decode(audio.get("data", "")), kind="voice",
+                        mime=audio.get("mimetype"), source=f"whatsapp:{message_id}",
+                    )
+                    media.append(str(path))
+                    content = f"[voice: {path}]"
+                except MediaTooLargeError as e:
+                    logger.warning("WhatsApp voice message rejected: {}", e)
+                except Exception as e:
+                    logger.error("Failed to store WhatsApp voice message: {}", e)
 
             await self._handle_message(
                 sender_id=sender_id,
                 chat_id=sender,  # Use full LID for replies
                 content=content,
+                media=media,
+                audio=media,
                 metadata={
                     "message_id": message_id,
                     "timestamp": data.get("timestamp"),
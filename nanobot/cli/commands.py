@@ -236,6 +236,19 @@ def _make_provider(config: Config):
     )
 
 
+def _make_cron(config: Config):
+    """Create the cron service with the configured concurrency and missed-run policy."""
+    from nanobot.config.loader import get_data_dir
+    from nanobot.cron.service import CronService
+
+    cron = config.gateway.cron
+    return CronService(
+        get_data_dir() / "cron" / "jobs.json",
+        max_concurrent=cron.max_concurrent,
+        missed_runs=cron.missed_runs,
+    )
+
+
 # ============================================================================
 # Gateway / Server
 # ============================================================================
@@ -250,8 +263,7 @@ def gateway(
     from nanobot.agent.loop import AgentLoop
     from nanobot.bus.queue import MessageBus
     from nanobot.channels.manager import ChannelManager
-    from nanobot.config.loader import get_data_dir, load_config
-    from nanobot.cron.service import CronService
+    from nanobot.config.loader import load_config
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
     from nanobot.session.manager import SessionManager
@@ -269,8 +281,7 @@ def gateway(
     session_manager = SessionManager(config.workspace_path)
 
     # Create cron service first (callback set after agent creation)
-    cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = _make_cron(config)
 
     # Create agent with cron service
     agent = AgentLoop(
@@ -286,6 +297,7 @@ def gateway(
         brave_api_key=config.tools.web.search.api_key or None,
         web_proxy=config.tools.web.proxy or None,
         exec_config=config.tools.exec,
+        subagent_config=config.agents.defaults.subagents,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         session_manager=session_manager,
@@ -376,6 +388,8 @@ def gateway(
         on_notify=on_heartbeat_notify,
         interval_s=hb_cfg.interval_s,
         enabled=hb_cfg.enabled,
+        max_interval_s=hb_cfg.max_interval_s,
+        watch_interval_s=5.0 if hb_cfg.watch else 0,
     )
 
     if channels.enabled_channels:
@@ -393,6 +407,8 @@ def gateway(
         try:
             await cron.start()
             await heartbeat.start()
+            if resumed := await agent.subagents.resume_pending():
+                console.print(f"[green]✓[/green] Resumed {resumed} background subagent(s)")
             await asyncio.gather(
                 agent.run(),
                 channels.start_all(),
@@ -428,8 +444,7 @@ def agent(
 
     from nanobot.agent.loop import AgentLoop
     from nanobot.bus.queue import MessageBus
-    from nanobot.config.loader import get_data_dir, load_config
-    from nanobot.cron.service import CronService
+    from nanobot.config.loader import load_config
 
     config = load_config()
     sync_workspace_templates(config.workspace_path)
@@ -438,8 +453,7 @@ def agent(
     provider = _make_provider(config)
 
     # Create cron service for tool usage (no callback needed for CLI unless running)
-    cron_store_path = get_data_dir() / "cron" / "jobs.json"
-    cron = CronService(cron_store_path)
+    cron = _make_cron(config)
 
     if logs:
         logger.enable("nanobot")
@@ -459,6 +473,7 @@ def agent(
         brave_api_key=config.tools.web.search.api_key or None,
         web_proxy=config.tools.web.proxy or None,
         exec_config=config.tools.exec,
+        subagent_config=config.agents.defaults.subagents,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         mcp_servers=config.tools.mcp_servers,
@@ -785,11 +800,9 @@ def cron_list(
     all: bool = typer.Option(False, "--all", "-a", help="Include disabled jobs"),
 ):
     """List scheduled jobs."""
-    from nanobot.config.loader import get_data_dir
-    from nanobot.cron.service import CronService
+    from nanobot.config.loader import load_config
 
-    store_path = get_data_dir() / "cron" / "jobs.json"
-    service = CronService(store_path)
+    service = _make_cron(load_config())
 
     jobs = service.list_jobs(include_disabled=all)
 
@@ -846,8 +859,7 @@ def cron_add(
     channel: str = typer.Option(None, "--channel", help="Channel for delivery (e.g. 'telegram', 'whatsapp')"),
 ):
     """Add a scheduled job."""
-    from nanobot.config.loader import get_data_dir
-    from nanobot.cron.service import CronService
+    from nanobot.config.loader import load_config
     from nanobot.cron.types import CronSchedule
 
     if tz and not cron_expr:
@@ -867,8 +879,7 @@ def cron_add(
         console.print("[red]Error: Must specify --every, --cron, or --at[/red]")
         raise typer.Exit(1)
 
-    store_path = get_data_dir() / "cron" / "jobs.json"
-    service = CronService(store_path)
+    service = _make_cron(load_config())
 
     try:
         job = service.add_job(
@@ -891,11 +902,9 @@ def cron_remove(
     job_id: str = typer.Argument(..., help="Job ID to remove"),
 ):
     """Remove a scheduled job."""
-    from nanobot.config.loader import get_data_dir
-    from nanobot.cron.service import CronService
+    from nanobot.config.loader import load_config
 
-    store_path = get_data_dir() / "cron" / "jobs.json"
-    service = CronService(store_path)
+    service = _make_cron(load_config())
 
     if service.remove_job(job_id):
         console.print(f"[green]✓[/green] Removed job {job_id}")
@@ -909,11 +918,9 @@ def cron_enable(
     disable: bool = typer.Option(False, "--disable", help="Disable instead of enable"),
 ):
     """Enable or disable a job."""
-    from nanobot.config.loader import get_data_dir
-    from nanobot.cron.service import CronService
+    from nanobot.config.loader import load_config
 
-    store_path = get_data_dir() / "cron" / "jobs.json"
-    service = CronService(store_path)
+    service = _make_cron(load_config())
 
     job = service.enable_job(job_id, enabled=not disable)
     if job:
@@ -933,8 +940,7 @@ def cron_run(
 
     from nanobot.agent.loop import AgentLoop
     from nanobot.bus.queue import MessageBus
-    from nanobot.config.loader import get_data_dir, load_config
-    from nanobot.cron.service import CronService
+    from nanobot.config.loader import load_config
     from nanobot.cron.types import CronJob
     logger.disable("nanobot")
 
@@ -954,13 +960,13 @@ def cron_run(
         brave_api_key=config.tools.web.search.api_key or None,
         web_proxy=config.tools.web.proxy or None,
         exec_config=config.tools.exec,
+        subagent_config=config.agents.defaults.subagents,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         mcp_servers=config.tools.mcp_servers,
         channels_config=config.channels,
     )
 
-    store_path = get_data_dir() / "cron" / "jobs.json"
-    service = CronService(store_path)
+    service = _make_cron(load_config())
 
     result_holder = []
 
@@ -94,6 +94,7 @@ class EmailConfig(Base):
     imap_password: str = ""
     imap_mailbox: str = "INBOX"
     imap_use_ssl: bool = True
+    imap_idle: bool = True  # Push via IMAP IDLE when the server supports it; otherwise poll
 
     # SMTP (send)
     smtp_host: str = ""
@@ -200,11 +201,36 @@ class MatrixConfig(Base):
     group_allow_from: list[str] = Field(default_factory=list)
     allow_room_mentions: bool = False
 
+class MediaConfig(Base):
+    """Shared store for media received by channels (~/.nanobot/media)."""
+
+    quota_mb: int = 2048  # Least recently used files are deleted beyond this
+    max_image_mb: int = 20
+    max_audio_mb: int = 25
+    max_video_mb: int = 50
+    max_file_mb: int = 50
+    max_concurrent_downloads: int = 4  # Per channel
+    download_timeout_s: int = 60  # Per message; attachments still downloading are dropped
+
+
+class TranscriptionConfig(Base):
+    """Voice note transcription shared by all channels."""
+
+    provider: Literal["groq", "openai", "local"] = "groq"  # local = faster-whisper, offline
+    model: str = ""  # Default: whisper-large-v3 (groq), whisper-1 (openai), base (local)
+    api_base: str | None = None  # For openai: any compatible server, e.g. a self-hosted Whisper
+    max_concurrent: int = 2
+    max_queue: int = 16  # Further voice notes are forwarded without a transcript
+    chunk_seconds: int = 600  # Split length for files over the provider's upload limit (needs ffmpeg)
+
+
 class ChannelsConfig(Base):
     """Configuration for chat channels."""
 
     send_progress: bool = True    # stream agent's text progress to the channel
     send_tool_hints: bool = False  # stream tool-call hints (e.g. read_file("…"))
+    media: MediaConfig = Field(default_factory=MediaConfig)
+    transcription: TranscriptionConfig = Field(default_factory=TranscriptionConfig)
     whatsapp: WhatsAppConfig = Field(default_factory=WhatsAppConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     discord: DiscordConfig = Field(default_factory=DiscordConfig)
@@ -217,6 +243,15 @@ class ChannelsConfig(Base):
     matrix: MatrixConfig = Field(default_factory=MatrixConfig)
 
 
+class SubagentConfig(Base):
+    """Background subagent pool configuration."""
+
+    max_concurrent: int = 3  # Subagents running at once; further spawns wait in a queue
+    max_per_session: int = 5  # Running + queued subagents allowed per chat session
+    max_iterations: int = 15
+    progress_interval: int = 60  # Seconds between progress updates to the origin chat (0 = off)
+
+
 class AgentDefaults(Base):
     """Default agent configuration."""
 
@@ -228,6 +263,7 @@ class AgentDefaults(Base):
     max_tool_iterations: int = 40
     memory_window: int = 100
     reasoning_effort: str | None = None  # low / medium / high — enables LLM thinking mode
+    subagents: SubagentConfig = Field(default_factory=SubagentConfig)
 
 
 class AgentsConfig(Base):
@@ -271,6 +307,15 @@ class HeartbeatConfig(Base):
 
     enabled: bool = True
     interval_s: int = 30 * 60  # 30 minutes
+    max_interval_s: int = 2 * 60 * 60  # Idle checks back off up to this (set to interval_s to disable)
+    watch: bool = True  # Check right away when HEARTBEAT.md is edited
+
+
+class CronConfig(Base):
+    """Cron service configuration."""
+
+    max_concurrent: int = 4  # Due jobs running at once
+    missed_runs: Literal["skip", "run_once"] = "skip"  # Runs that fell due while stopped
 
 
 class GatewayConfig(Base):
@@ -279,6 +324,7 @@ class GatewayConfig(Base):
     host: str = "0.0.0.0"
     port: int = 18790
     heartbeat: HeartbeatConfig = Field(default_factory=HeartbeatConfig)
+    cron: CronConfig = Field(default_factory=CronConfig)
 
 
 class WebSearchConfig(Base):
@@ -311,6 +357,10 @@ class MCPServerConfig(Base):
     url: str = ""  # HTTP: streamable HTTP endpoint URL
     headers: dict[str, str] = Field(default_factory=dict)  # HTTP: Custom HTTP Headers
     tool_timeout: int = 30  # Seconds before a tool call is cancelled
+    connect_timeout: int = 30  # Seconds allowed for startup + handshake
+    ping_interval: int = 30  # Seconds between health-check pings of a live session
+    max_result_bytes: int = 50_000  # Larger results are truncated and kept for read_result (0 = no limit)
+    lazy: bool = False  # Register tools from the cached manifest; start the server on first use
 
 
 class ToolsConfig(Base):
@@ -1,15 +1,19 @@
 """Cron service for scheduling agent tasks."""
 
 import asyncio
-import json
+import bisect
+import heapq
 import time
 import uuid
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Literal
 
 from loguru import logger
 
+from nanobot.cron.store import CronJobStore
 from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
 
 
@@ -17,6 +21,47 @@ def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+@lru_cache(maxsize=256)
+def _zone(tz: str) -> tzinfo:
+    from zoneinfo import ZoneInfo
+
+    return ZoneInfo(tz)
+
+
+class _CompiledCron:
+    """A parsed cron expression plus a short buffer of its upcoming fire times."""
+
+    LOOKAHEAD = 5
+
+    def __init__(self, expr: str, tz: tzinfo):
+        from croniter import croniter
+
+        self.tz = tz
+        self._iter = croniter(expr, datetime.now(tz))
+        self._upcoming: list[int] = []  # ascending fire times (ms) after _base_ms
+        self._base_ms = 0
+
+    def next_after(self, now_ms: int) -> int:
+        """First fire time strictly after now_ms."""
+        if now_ms < self._base_ms or not self._upcoming or now_ms >= self._upcoming[-1]:
+            self._iter.set_current(datetime.fromtimestamp(now_ms / 1000, tz=self.tz))
+            self._upcoming = [
+                int(self._iter.get_next(datetime).timestamp() * 1000) for _ in range(self.LOOKAHEAD)
+            ]
+            self._base_ms = now_ms
+        return self._upcoming[bisect.bisect_right(self._upcoming, now_ms)]
+
+
+@lru_cache(maxsize=1024)
+def _compile_cron(expr: str, tz: str | None, local_offset: timedelta | None) -> _CompiledCron:
+    """Compiled schedule shared by every job with the same expression and zone.
+
+    Jobs without a tz follow the host's local time; its current UTC offset is
+    part of the key so a DST switch compiles a fresh schedule.
+    """
+    return _CompiledCron(expr, _zone(tz) if tz else timezone(local_offset))
+
+
 def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
     """Compute next run time in ms."""
     if schedule.kind == "at":
@@ -30,16 +75,9 @@ def _compute_next_run(schedule: CronSchedule, now_ms: int) -> int | None:
 
     if schedule.kind == "cron" and schedule.expr:
         try:
-            from zoneinfo import ZoneInfo
-
-            from croniter import croniter
             # Use caller-provided reference time for deterministic scheduling
-            base_time = now_ms / 1000
-            tz = ZoneInfo(schedule.tz) if schedule.tz else datetime.now().astimezone().tzinfo
-            base_dt = datetime.fromtimestamp(base_time, tz=tz)
-            cron = croniter(schedule.expr, base_dt)
-            next_dt = cron.get_next(datetime)
-            return int(next_dt.timestamp() * 1000)
+            offset = None if schedule.tz else datetime.fromtimestamp(now_ms / 1000).astimezone().utcoffset()
+            return _compile_cron(schedule.expr, schedule.tz, offset).next_after(now_ms)
         except Exception:
             return None
 
@@ -53,130 +91,104 @@ def _validate_schedule_for_add(schedule: CronSchedule) -> None:
 
     if schedule.kind == "cron" and schedule.tz:
         try:
-            from zoneinfo import ZoneInfo
-
-            ZoneInfo(schedule.tz)
+            _zone(schedule.tz)
         except Exception:
             raise ValueError(f"unknown timezone '{schedule.tz}'") from None
 
 
+@dataclass
+class CronStats:
+    """Execution counters and scheduling lag (start time minus due time)."""
+
+    runs: int = 0
+    errors: int = 0
+    skipped: int = 0  # due while the previous run of the same job was still going
+    total_lag_ms: int = 0
+    max_lag_ms: int = 0
+    last_lag_ms: int = 0
+
+    def record(self, lag_ms: int, ok: bool) -> None:
+        self.runs += 1
+        self.errors += 0 if ok else 1
+        self.total_lag_ms += lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self.last_lag_ms = lag_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**self.__dict__, "avg_lag_ms": self.total_lag_ms // self.runs if self.runs else 0}
+
+
 class CronService:
-    """Service for managing and executing scheduled jobs."""
+    """
+    Service for managing and executing scheduled jobs.
+
+    Due times live in a min-heap of (next_run_at_ms, job_id) entries; an
+    entry is stale, and dropped when it surfaces, once its job is removed,
+    disabled or rescheduled. Due jobs run as tasks, at most max_concurrent
+    at once, and a job that comes due while its previous run is still going
+    is skipped rather than run twice.
+
+    missed_runs decides what happens to runs that fell due while the
+    service was down: "skip" reschedules from now, "run_once" runs each such
+    job once right after start.
+
+    Jobs are persisted in a SQLite database next to store_path (jobs.db for
+    jobs.json) that the gateway and CLI commands write concurrently; each
+    change touches only its own row, and the in-memory copy is reloaded
+    only when another process has committed.
+    """
 
     def __init__(
         self,
         store_path: Path,
-        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None
+        on_job: Callable[[CronJob], Coroutine[Any, Any, str | None]] | None = None,
+        max_concurrent: int = 4,
+        missed_runs: Literal["skip", "run_once"] = "skip",
     ):
         self.store_path = store_path
         self.on_job = on_job
+        self.missed_runs = missed_runs
+        self.stats = CronStats()
+        self._db = CronJobStore(
+            store_path if store_path.suffix == ".db" else store_path.with_suffix(".db"),
+            legacy_json=store_path if store_path.suffix == ".json" else None,
+        )
         self._store: CronStore | None = None
-        self._last_mtime: float = 0.0
+        self._by_id: dict[str, CronJob] = {}
+        self._data_version: int | None = None
         self._timer_task: asyncio.Task | None = None
         self._running = False
+        self._heap: list[tuple[int, str]] | None = None  # rebuilt lazily after (re)loads
+        self._slots = asyncio.Semaphore(max(1, max_concurrent))
+        self._running_jobs: dict[str, asyncio.Task] = {}
 
     def _load_store(self) -> CronStore:
-        """Load jobs from disk. Reloads automatically if file was modified externally."""
-        if self._store and self.store_path.exists():
-            mtime = self.store_path.stat().st_mtime
-            if mtime != self._last_mtime:
-                logger.info("Cron: jobs.json modified externally, reloading")
-                self._store = None
-        if self._store:
+        """Load jobs from the database. Reloads automatically if another process changed it."""
+        version = self._db.data_version()
+        if self._store and version == self._data_version:
             return self._store
-
-        if self.store_path.exists():
-            try:
-                data = json.loads(self.store_path.read_text(encoding="utf-8"))
-                jobs = []
-                for j in data.get("jobs", []):
-                    jobs.append(CronJob(
-                        id=j["id"],
-                        name=j["name"],
-                        enabled=j.get("enabled", True),
-                        schedule=CronSchedule(
-                            kind=j["schedule"]["kind"],
-                            at_ms=j["schedule"].get("atMs"),
-                            every_ms=j["schedule"].get("everyMs"),
-                            expr=j["schedule"].get("expr"),
-                            tz=j["schedule"].get("tz"),
-                        ),
-                        payload=CronPayload(
-                            kind=j["payload"].get("kind", "agent_turn"),
-                            message=j["payload"].get("message", ""),
-                            deliver=j["payload"].get("deliver", False),
-                            channel=j["payload"].get("channel"),
-                            to=j["payload"].get("to"),
-                        ),
-                        state=CronJobState(
-                            next_run_at_ms=j.get("state", {}).get("nextRunAtMs"),
-                            last_run_at_ms=j.get("state", {}).get("lastRunAtMs"),
-                            last_status=j.get("state", {}).get("lastStatus"),
-                            last_error=j.get("state", {}).get("lastError"),
-                        ),
-                        created_at_ms=j.get("createdAtMs", 0),
-                        updated_at_ms=j.get("updatedAtMs", 0),
-                        delete_after_run=j.get("deleteAfterRun", False),
-                    ))
-                self._store = CronStore(jobs=jobs)
-            except Exception as e:
-                logger.warning("Failed to load cron store: {}", e)
-                self._store = CronStore()
-        else:
+        if self._store:
+            logger.info("Cron: jobs changed by another process, reloading")
+        try:
+            self._store = CronStore(jobs=self._db.load())
+        except Exception as e:
+            logger.warning("Failed to load cron store: {}", e)
             self._store = CronStore()
-
+        self._by_id = {j.id: j for j in self._store.jobs}
+        self._data_version = version
+        self._heap = None
         return self._store
 
     def _save_store(self) -> None:
-        """Save jobs to disk."""
-        if not self._store:
-            return
-
-        self.store_path.parent.mkdir(parents=True, exist_ok=True)
-
-        data = {
-            "version": self._store.version,
-            "jobs": [
-                {
-                    "id": j.id,
-                    "name": j.name,
-                    "enabled": j.enabled,
-                    "schedule": {
-                        "kind": j.schedule.kind,
-                        "atMs": j.schedule.at_ms,
-                        "everyMs": j.schedule.every_ms,
-                        "expr": j.schedule.expr,
-                        "tz": j.schedule.tz,
-                    },
-                    "payload": {
-                        "kind": j.payload.kind,
-                        "message": j.payload.message,
-                        "deliver": j.payload.deliver,
-                        "channel": j.payload.channel,
-                        "to": j.payload.to,
-                    },
-                    "state": {
-                        "nextRunAtMs": j.state.next_run_at_ms,
-                        "lastRunAtMs": j.state.last_run_at_ms,
-                        "lastStatus": j.state.last_status,
-                        "lastError": j.state.last_error,
-                    },
-                    "createdAtMs": j.created_at_ms,
-                    "updatedAtMs": j.updated_at_ms,
-                    "deleteAfterRun": j.delete_after_run,
-                }
-                for j in self._store.jobs
-            ]
-        }
+        """Persist the run state of every job (used after bulk rescheduling)."""
+        if self._store:
+            self._db.save_states(self._store.jobs)
 
-        self.store_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-        self._last_mtime = self.store_path.stat().st_mtime
-    
     async def start(self) -> None:
         """Start the cron service."""
         self._running = True
         self._load_store()
-        self._recompute_next_runs()
+        self._recompute_next_runs(keep_missed=self.missed_runs == "run_once")
         self._save_store()
         self._arm_timer()
         logger.info("Cron service started with {} jobs", len(self._store.jobs if self._store else []))
@@ -187,23 +199,45 @@ class CronService:
         if self._timer_task:
             self._timer_task.cancel()
             self._timer_task = None
+        for task in self._running_jobs.values():
+            task.cancel()
 
-    def _recompute_next_runs(self) -> None:
-        """Recompute next run times for all enabled jobs."""
+    def _recompute_next_runs(self, keep_missed: bool = False) -> None:
+        """Recompute next run times for all enabled jobs, optionally keeping overdue ones due."""
         if not self._store:
             return
         now = _now_ms()
         for job in self._store.jobs:
-            if job.enabled:
+            if job.enabled and not (keep_missed and job.state.next_run_at_ms):
                 job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+        self._heap = None
+
+    def _job(self, job_id: str) -> CronJob | None:
+        return self._by_id.get(job_id)
+
+    def _schedule(self, job: CronJob) -> None:
+        """Push the job's current next run onto the heap."""
+        if self._heap is not None and job.enabled and job.state.next_run_at_ms:
+            heapq.heappush(self._heap, (job.state.next_run_at_ms, job.id))
+
+    def _live_heap(self) -> list[tuple[int, str]]:
+        """The heap with stale entries popped off its top."""
+        if self._heap is None:
+            jobs = self._store.jobs if self._store else []
+            self._heap = [(j.state.next_run_at_ms, j.id) for j in jobs if j.enabled and j.state.next_run_at_ms]
+            heapq.heapify(self._heap)
+        while self._heap:
+            at_ms, job_id = self._heap[0]
+            job = self._job(job_id)
+            if job and job.enabled and job.state.next_run_at_ms == at_ms:
+                break
+            heapq.heappop(self._heap)
+        return self._heap
 
     def _get_next_wake_ms(self) -> int | None:
         """Get the earliest next run time across all jobs."""
-        if not self._store:
-            return None
-        times = [j.state.next_run_at_ms for j in self._store.jobs
-                 if j.enabled and j.state.next_run_at_ms]
-        return min(times) if times else None
+        heap = self._live_heap()
+        return heap[0][0] if heap else None
 
     def _arm_timer(self) -> None:
         """Schedule the next timer tick."""
@@ -225,27 +259,42 @@ class CronService:
         self._timer_task = asyncio.create_task(tick())
 
     async def _on_timer(self) -> None:
-        """Handle timer tick - run due jobs."""
+        """Handle timer tick - start every due job."""
         self._load_store()
         if not self._store:
             return
 
         now = _now_ms()
-        due_jobs = [
-            j for j in self._store.jobs
-            if j.enabled and j.state.next_run_at_ms and now >= j.state.next_run_at_ms
-        ]
-
-        for job in due_jobs:
-            await self._execute_job(job)
+        while (heap := self._live_heap()) and heap[0][0] <= now:
+            due_ms, job_id = heapq.heappop(heap)
+            job = self._job(job_id)
+            if job_id in self._running_jobs:
+                # Previous run still going: skip this occurrence instead of overlapping it
+                self.stats.skipped += 1
+                job.state.last_status = "skipped"
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, now)
+                self._schedule(job)
+                self._db.save_states([job])
+                logger.warning("Cron: job '{}' still running, skipping run due at {}", job.name, due_ms)
+                continue
+            self._running_jobs[job_id] = asyncio.create_task(self._run_due(job, due_ms))
 
-        self._save_store()
         self._arm_timer()
 
-    async def _execute_job(self, job: CronJob) -> None:
+    async def _run_due(self, job: CronJob, due_ms: int) -> None:
+        """Run one due job within the concurrency limit, then persist and reschedule it."""
+        try:
+            async with self._slots:
+                await self._execute_job(job, due_ms=due_ms)
+            self._arm_timer()
+        finally:
+            self._running_jobs.pop(job.id, None)
+
+    async def _execute_job(self, job: CronJob, due_ms: int | None = None) -> None:
         """Execute a single job."""
         start_ms = _now_ms()
         logger.info("Cron: executing job '{}' ({})", job.name, job.id)
+        ok = True
 
         try:
             response = None
@@ -257,23 +306,48 @@ class CronService:
             logger.info("Cron: job '{}' completed", job.name)
 
         except Exception as e:
+            ok = False
             job.state.last_status = "error"
             job.state.last_error = str(e)
             logger.error("Cron: job '{}' failed: {}", job.name, e)
 
+        if due_ms is not None:
+            lag_ms = max(0, start_ms - due_ms)
+            self.stats.record(lag_ms, ok)
+            if lag_ms > 5000:
+                logger.warning("Cron: job '{}' started {}ms late", job.name, lag_ms)
+
         job.state.last_run_at_ms = start_ms
         job.updated_at_ms = _now_ms()
 
+        # The store may have been reloaded while the job ran: apply results to the live copy
+        self._load_store()
+        current = self._job(job.id)
+        if current is None:
+            return  # removed meanwhile
+        if current is not job:
+            current.state.last_status = job.state.last_status
+            current.state.last_error = job.state.last_error
+            current.state.last_run_at_ms = job.state.last_run_at_ms
+            current.updated_at_ms = job.updated_at_ms
+            job = current
+
         # Handle one-shot jobs
         if job.schedule.kind == "at":
             if job.delete_after_run:
                 self._store.jobs = [j for j in self._store.jobs if j.id != job.id]
+                self._by_id.pop(job.id, None)
+                self._db.delete(job.id)
             else:
                 job.enabled = False
                 job.state.next_run_at_ms = None
+                self._db.upsert(job)
         else:
-            # Compute next run
-            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            if job.enabled:
+                # Compute next run
+                job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+                self._schedule(job)
+            self._db.save_states([job])
 
     # ========== Public API ==========
 
@@ -317,7 +391,9 @@ class CronService:
         )
 
         store.jobs.append(job)
-        self._save_store()
+        self._by_id[job.id] = job
+        self._schedule(job)
+        self._db.upsert(job)
         self._arm_timer()
 
         logger.info("Cron: added job '{}' ({})", name, job.id)
@@ -326,12 +402,11 @@ class CronService:
     def remove_job(self, job_id: str) -> bool:
         """Remove a job by ID."""
         store = self._load_store()
-        before = len(store.jobs)
-        store.jobs = [j for j in store.jobs if j.id != job_id]
-        removed = len(store.jobs) < before
+        removed = self._by_id.pop(job_id, None) is not None
 
         if removed:
-            self._save_store()
+            store.jobs = [j for j in store.jobs if j.id != job_id]
+            self._db.delete(job_id)
             self._arm_timer()
             logger.info("Cron: removed job {}", job_id)
 
@@ -339,32 +414,33 @@ class CronService:
 
     def enable_job(self, job_id: str, enabled: bool = True) -> CronJob | None:
         """Enable or disable a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                job.enabled = enabled
-                job.updated_at_ms = _now_ms()
-                if enabled:
-                    job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
-                else:
-                    job.state.next_run_at_ms = None
-                self._save_store()
-                self._arm_timer()
-                return job
-        return None
+        self._load_store()
+        job = self._job(job_id)
+        if job is None:
+            return None
+        job.enabled = enabled
+        job.updated_at_ms = _now_ms()
+        if enabled:
+            job.state.next_run_at_ms = _compute_next_run(job.schedule, _now_ms())
+            self._schedule(job)
+        else:
+            job.state.next_run_at_ms = None
+        self._db.upsert(job)
+        self._arm_timer()
+        return job
 
     async def run_job(self, job_id: str, force: bool = False) -> bool:
         """Manually run a job."""
-        store = self._load_store()
-        for job in store.jobs:
-            if job.id == job_id:
-                if not force and not job.enabled:
-                    return False
-                await self._execute_job(job)
-                self._save_store()
-                self._arm_timer()
-                return True
-        return False
+        self._load_store()
+        job = self._job(job_id)
+        if job is None or (not force and not job.enabled):
+            return False
+        if job.id in self._running_jobs:
+            logger.warning("Cron: job '{}' is already running", job.name)
+            return False
+        await self._execute_job(job)
+        self._arm_timer()
+        return True
 
     def status(self) -> dict:
         """Get service status."""
@@ -372,5 +448,7 @@ class CronService:
         return {
             "enabled": self._running,
             "jobs": len(store.jobs),
+            "running": len(self._running_jobs),
             "next_wake_at_ms": self._get_next_wake_ms(),
+            **self.stats.to_dict(),
         }
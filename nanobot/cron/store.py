@@ -0,0 +1,170 @@
+"""SQLite-backed persistence for cron jobs."""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.cron.types import CronJob, CronJobState, CronPayload, CronSchedule
+
+
+def _spec_to_dict(job: CronJob) -> dict[str, Any]:
+    return {
+        "id": job.id,
+        "name": job.name,
+        "enabled": job.enabled,
+        "schedule": {
+            "kind": job.schedule.kind,
+            "atMs": job.schedule.at_ms,
+            "everyMs": job.schedule.every_ms,
+            "expr": job.schedule.expr,
+            "tz": job.schedule.tz,
+        },
+        "payload": {
+            "kind": job.payload.kind,
+            "message": job.payload.message,
+            "deliver": job.payload.deliver,
+            "channel": job.payload.channel,
+            "to": job.payload.to,
+        },
+        "createdAtMs": job.created_at_ms,
+        "updatedAtMs": job.updated_at_ms,
+        "deleteAfterRun": job.delete_after_run,
+    }
+
+
+def _state_to_dict(state: CronJobState) -> dict[str, Any]:
+    return {
+        "nextRunAtMs": state.next_run_at_ms,
+        "lastRunAtMs": state.last_run_at_ms,
+        "lastStatus": state.last_status,
+        "lastError": state.last_error,
+    }
+
+
+def _job_from_dict(j: dict[str, Any], state: dict[str, Any]) -> CronJob:
+    return CronJob(
+        id=j["id"],
+        name=j["name"],
+        enabled=j.get("enabled", True),
+        schedule=CronSchedule(
+            kind=j["schedule"]["kind"],
+            at_ms=j["schedule"].get("atMs"),
+            every_ms=j["schedule"].get("everyMs"),
+            expr=j["schedule"].get("expr"),
+            tz=j["schedule"].get("tz"),
+        ),
+        payload=CronPayload(
+            kind=j["payload"].get("kind", "agent_turn"),
+            message=j["payload"].get("message", ""),
+            deliver=j["payload"].get("deliver", False),
+            channel=j["payload"].get("channel"),
+            to=j["payload"].get("to"),
+        ),
+        state=CronJobState(
+            next_run_at_ms=state.get("nextRunAtMs"),
+            last_run_at_ms=state.get("lastRunAtMs"),
+            last_status=state.get("lastStatus"),
+            last_error=state.get("lastError"),
+        ),
+        created_at_ms=j.get("createdAtMs", 0),
+        updated_at_ms=j.get("updatedAtMs", 0),
+        delete_after_run=j.get("deleteAfterRun", False),
+    )
+
+
+class CronJobStore:
+    """
+    Cron job table shared by the gateway and CLI processes.
+
+    One row per job, with the user-edited definition (spec) and the
+    scheduler-owned run state in separate columns, so the gateway recording
+    a run never overwrites a concurrent edit from the CLI. Every write is
+    its own WAL transaction; other processes' commits are detected cheaply
+    through PRAGMA data_version. A legacy jobs.json next to the database is
+    imported on first open.
+    """
+
+    def __init__(self, path: Path, legacy_json: Path | None = None):
+        self.path = path
+        self.legacy_json = legacy_json
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, spec TEXT NOT NULL, state TEXT NOT NULL)"
+            )
+            self._conn = conn
+            self._import_legacy()
+        return self._conn
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database."""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self) -> list[CronJob]:
+        jobs = []
+        for spec, state in self.conn.execute("SELECT spec, state FROM jobs ORDER BY rowid"):
+            try:
+                jobs.append(_job_from_dict(json.loads(spec), json.loads(state)))
+            except Exception as e:
+                logger.warning("Cron: skipping unreadable job row: {}", e)
+        return jobs
+
+    def upsert(self, job: CronJob) -> None:
+        """Write a job's definition and state."""
+        self.conn.execute(
+            "INSERT INTO jobs (id, spec, state) VALUES (?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET spec = excluded.spec, state = excluded.state",
+            (job.id, self._dump(_spec_to_dict(job)), self._dump(_state_to_dict(job.state))),
+        )
+
+    def save_states(self, jobs: list[CronJob]) -> None:
+        """Write only the run state of existing jobs, in one transaction."""
+        with self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "UPDATE jobs SET state = ? WHERE id = ?",
+                [(self._dump(_state_to_dict(j.state)), j.id) for j in jobs],
+            )
+
+    def delete(self, job_id: str) -> bool:
+        return self.conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,)).rowcount > 0
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _dump(data: dict[str, Any]) -> str:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    def _import_legacy(self) -> None:
+        legacy = self.legacy_json
+        if not legacy or not legacy.exists():
+            return
+        if self._conn.execute("SELECT 1 FROM jobs LIMIT 1").fetchone():
+            return
+        try:
+            data = json.loads(legacy.read_text(encoding="utf-8"))
+            rows = [
+                (j["id"], self._dump(_spec_to_dict(job)), self._dump(_state_to_dict(job.state)))
+                for j in data.get("jobs", [])
+                for job in [_job_from_dict(j, j.get("state", {}))]
+            ]
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("INSERT OR IGNORE INTO jobs (id, spec, state) VALUES (?, ?, ?)", rows)
+            legacy.rename(legacy.with_name(legacy.name + ".migrated"))
+            logger.info("Cron: imported {} jobs from {}", len(rows), legacy.name)
+        except Exception as e:
+            logger.warning("Cron: failed to import {}: {}", legacy, e)
@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import re
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Coroutine
 
@@ -37,6 +41,53 @@ _HEARTBEAT_TOOL = [
 ]
 
 
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+_EMPTY_LINE_RE = re.compile(r"^\s*(?:[-*+]\s*(?:\[[ xX]?\])?|\d+[.)]|[-*_]{3,})?\s*$")
+_DONE_ITEM_RE = re.compile(r"^\s*[-*+]\s*\[[xX]\]")
+
+
+@lru_cache(maxsize=1)
+def _template_lines() -> frozenset[str]:
+    """Prose lines of the bundled HEARTBEAT.md, which never count as tasks."""
+    from importlib.resources import files as pkg_files
+
+    try:
+        text = (pkg_files("nanobot") / "templates" / "HEARTBEAT.md").read_text(encoding="utf-8")
+    except Exception:
+        return frozenset()
+    return frozenset(line.strip() for line in text.splitlines() if line.strip())
+
+
+def _is_task_line(line: str) -> bool:
+    return (
+        not _EMPTY_LINE_RE.match(line)
+        and not _DONE_ITEM_RE.match(line)
+        and line.strip() not in _template_lines()
+    )
+
+
+def has_pending_tasks(content: str) -> bool:
+    """Cheap check for anything that could be a task, so empty files never reach the LLM.
+
+    Any text counts except comments, headings, blank list items, rules,
+    checked-off items, the bundled template's own prose, and whatever sits
+    under a "Completed" heading.
+    """
+    completed_level = None
+    for line in _COMMENT_RE.sub("", content).splitlines():
+        heading = _HEADING_RE.match(line.strip())
+        if heading:
+            level = len(heading.group(1))
+            if completed_level is not None and level <= completed_level:
+                completed_level = None
+            if completed_level is None and "completed" in heading.group(2).lower():
+                completed_level = level
+        elif completed_level is None and _is_task_line(line):
+            return True
+    return False
+
+
 class HeartbeatService:
     """
     Periodic heartbeat service that wakes the agent to check for tasks.
@@ -48,6 +99,12 @@ class HeartbeatService:
     Phase 2 (execution): only triggered when Phase 1 returns ``run``.  The
     ``on_execute`` callback runs the task through the full agent loop and
     returns the result to deliver.
+
+    Phase 1 is skipped without a model call when the file holds no task
+    text at all, or when its content hash matches the last ``skip`` decision
+    (re-asked after ``skip_ttl_s`` in case tasks are time-dependent). While
+    idle the interval doubles up to ``max_interval_s``; the file is polled
+    every ``watch_interval_s`` so an edit triggers a check right away.
     """
 
     def __init__(
@@ -59,6 +116,9 @@ class HeartbeatService:
         on_notify: Callable[[str], Coroutine[Any, Any, None]] | None = None,
         interval_s: int = 30 * 60,
         enabled: bool = True,
+        max_interval_s: int | None = None,
+        watch_interval_s: float = 5.0,
+        skip_ttl_s: int = 6 * 60 * 60,
     ):
         self.workspace = workspace
         self.provider = provider
@@ -67,6 +127,13 @@ class HeartbeatService:
         self.on_notify = on_notify
         self.interval_s = interval_s
         self.enabled = enabled
+        self.max_interval_s = max(interval_s, max_interval_s or interval_s)
+        self.watch_interval_s = watch_interval_s
+        self.skip_ttl_s = skip_ttl_s
+        self.current_interval_s = interval_s
+        self.llm_calls = 0
+        self._last_skip: tuple[str, float] | None = None  # (content sha256, monotonic time)
+        self._file_sig: tuple[int, int] | None = None
         self._running = False
         self._task: asyncio.Task | None = None
 
@@ -82,11 +149,19 @@ class HeartbeatService:
                 return None
         return None
 
+    def _stat_heartbeat_file(self) -> tuple[int, int] | None:
+        try:
+            st = self.heartbeat_file.stat()
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
     async def _decide(self, content: str) -> tuple[str, str]:
         """Phase 1: ask LLM to decide skip/run via virtual tool call.
 
         Returns (action, tasks) where action is 'skip' or 'run'.
         """
+        self.llm_calls += 1
         response = await self.provider.chat(
             messages=[
                 {"role": "system", "content": "You are a heartbeat agent. Call the heartbeat tool to report your decision."},
@@ -127,9 +202,10 @@ class HeartbeatService:
 
     async def _run_loop(self) -> None:
         """Main heartbeat loop."""
+        self._file_sig = self._stat_heartbeat_file()
         while self._running:
             try:
-                await asyncio.sleep(self.interval_s)
+                await self._wait_for_tick()
                 if self._running:
                     await self._tick()
             except asyncio.CancelledError:
@@ -137,11 +213,45 @@ class HeartbeatService:
             except Exception as e:
                 logger.error("Heartbeat error: {}", e)
 
+    async def _wait_for_tick(self) -> None:
+        """Sleep for the current interval, returning early if HEARTBEAT.md changes."""
+        deadline = time.monotonic() + self.current_interval_s
+        while (remaining := deadline - time.monotonic()) > 0:
+            if not self.watch_interval_s:
+                await asyncio.sleep(remaining)
+                return
+            await asyncio.sleep(min(remaining, self.watch_interval_s))
+            sig = self._stat_heartbeat_file()
+            if sig != self._file_sig:
+                self._file_sig = sig
+                logger.debug("Heartbeat: HEARTBEAT.md changed, checking now")
+                self.current_interval_s = self.interval_s
+                return
+
+    def _idle(self) -> None:
+        """Back off while there is nothing to do."""
+        self.current_interval_s = min(self.max_interval_s, self.current_interval_s * 2)
+
     async def _tick(self) -> None:
         """Execute a single heartbeat tick."""
         content = self._read_heartbeat_file()
         if not content:
             logger.debug("Heartbeat: HEARTBEAT.md missing or empty")
+            self._idle()
+            return
+        if not has_pending_tasks(content):
+            logger.debug("Heartbeat: no tasks in HEARTBEAT.md")
+            self._idle()
+            return
+
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if (
+            self._last_skip
+            and self._last_skip[0] == digest
+            and time.monotonic() - self._last_skip[1] < self.skip_ttl_s
+        ):
+            logger.debug("Heartbeat: HEARTBEAT.md unchanged since last skip")
+            self._idle()
             return
 
         logger.info("Heartbeat: checking for tasks...")
@@ -151,8 +261,12 @@ class HeartbeatService:
 
             if action != "run":
                 logger.info("Heartbeat: OK (nothing to report)")
+                self._last_skip = (digest, time.monotonic())
+                self._idle()
                 return
 
+            self._last_skip = None
+            self.current_interval_s = self.interval_s
             logger.info("Heartbeat: tasks found, executing...")
             if self.on_execute:
                 response = await self.on_execute(tasks)
@@ -165,7 +279,7 @@ class HeartbeatService:
     async def trigger_now(self) -> str | None:
         """Manually trigger a heartbeat."""
         content = self._read_heartbeat_file()
-        if not content:
+        if not content or not has_pending_tasks(content):
             return None
         action, tasks = await self._decide(content)
         if action != "run" or not self.on_execute:
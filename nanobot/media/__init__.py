@@ -0,0 +1,11 @@
+"""Shared storage for media received from chat channels."""
+
+from nanobot.media.fetch import MediaFetcher
+from nanobot.media.store import (
+    MediaStore,
+    MediaTooLargeError,
+    configure_media_store,
+    get_media_store,
+)
+
+__all__ = ["MediaFetcher", "MediaStore", "MediaTooLargeError", "configure_media_store", "get_media_store"]
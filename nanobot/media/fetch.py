@@ -0,0 +1,53 @@
+"""Concurrent attachment downloads for a single inbound message."""
+
+import asyncio
+from typing import Awaitable, Callable, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+class MediaFetcher:
+    """
+    Runs a message's attachment downloads side by side.
+
+    Each channel owns one fetcher: max_concurrent bounds downloads across
+    all of that channel's messages, and every fetch_all() call gets
+    deadline_s to finish. Whatever is still running at the deadline is
+    cancelled, so one stuck attachment can't hold back the whole message.
+    """
+
+    def __init__(self, max_concurrent: int = 4, deadline_s: float = 60.0):
+        self.max_concurrent = max_concurrent
+        self.deadline_s = deadline_s
+        self._sem = asyncio.Semaphore(max(1, max_concurrent))
+
+    async def fetch_all(self, jobs: Sequence[Callable[[], Awaitable[T]]]) -> list[T | BaseException]:
+        """
+        Run jobs concurrently and return their results in order.
+
+        A job that raised is represented by its exception; one that missed
+        the deadline by a TimeoutError.
+        """
+        if not jobs:
+            return []
+
+        async def _run(job: Callable[[], Awaitable[T]]) -> T:
+            async with self._sem:
+                return await job()
+
+        tasks = [asyncio.create_task(_run(job)) for job in jobs]
+        _, pending = await asyncio.wait(tasks, timeout=self.deadline_s)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results: list[T | BaseException] = []
+        for task in tasks:
+            if task in pending:
+                results.append(TimeoutError(f"download did not finish within {self.deadline_s:g}s"))
+            elif (exc := task.exception()) is not None:
+                results.append(exc)
+            else:
+                results.append(task.result())
+        return results
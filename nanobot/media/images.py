@@ -0,0 +1,127 @@
+"""Downscale and encode images before they are sent to a vision model."""
+
+import asyncio
+import base64
+import io
+import mimetypes
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - exercised only without the extra
+    Image = ImageOps = None
+
+# Longest edge each provider family actually looks at; larger images are
+# resized server-side, so sending more pixels only costs upload time.
+_MAX_DIMENSION = {
+    "claude": 1568,
+    "gemini": 3072,
+    "gpt": 2048,
+    "o1": 2048,
+    "o3": 2048,
+    "o4": 2048,
+}
+DEFAULT_MAX_DIMENSION = 1568
+_PASSTHROUGH_BYTES = 1024 * 1024  # small images within the dimension limit are sent untouched
+
+
+def max_dimension_for(model: str | None) -> int:
+    """Longest image edge worth sending to *model*."""
+    name = (model or "").lower().rsplit("/", 1)[-1]
+    return next((dim for prefix, dim in _MAX_DIMENSION.items() if name.startswith(prefix)), DEFAULT_MAX_DIMENSION)
+
+
+class ImageEncoder:
+    """
+    Turns image files into (mime, base64) payloads for data URLs, with a cache.
+
+    Images larger than max_dimension (or over 1 MB) are EXIF-rotated,
+    downscaled and re-encoded as JPEG, or PNG when they have transparency.
+    Results are cached by (path, mtime, size); media store files are named
+    by their SHA-256, so the key is effectively the content hash. Without
+    Pillow the original bytes are passed through, still cached.
+    """
+
+    _pool: ThreadPoolExecutor | None = None
+
+    def __init__(self, max_dimension: int = DEFAULT_MAX_DIMENSION, quality: int = 85,
+                 cache_bytes: int = 64 * 1024 * 1024):
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self.cache_bytes = cache_bytes
+        self._cache: OrderedDict[tuple, tuple[str, str]] = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _executor(cls) -> ThreadPoolExecutor:
+        if cls._pool is None:
+            cls._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="nanobot-image")
+        return cls._pool
+
+    async def prepare(self, paths: list[str]) -> None:
+        """Encode images off the event loop so later encode() calls hit the cache."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor(), self.encode, p) for p in paths))
+
+    def encode(self, path: str | Path) -> tuple[str, str] | None:
+        """Return (mime, base64 data) for an image file, or None if it isn't one."""
+        p = Path(path)
+        mime, _ = mimetypes.guess_type(p.name)
+        if not mime or not mime.startswith("image/"):
+            return None
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        key = (str(p), st.st_mtime_ns, st.st_size, self.max_dimension)
+        with self._lock:
+            if (hit := self._cache.get(key)) is not None:
+                self._cache.move_to_end(key)
+                return hit
+
+        try:
+            data = p.read_bytes()
+        except OSError:
+            return None
+        try:
+            mime, data = self._shrink(data, mime)
+        except Exception as e:
+            logger.warning("Could not preprocess image {}: {}", p.name, e)
+        result = (mime, base64.b64encode(data).decode())
+
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = result
+                self._cached_bytes += len(result[1])
+            while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+                _, (_, old) = self._cache.popitem(last=False)
+                self._cached_bytes -= len(old)
+        return result
+
+    def _shrink(self, data: bytes, mime: str) -> tuple[str, bytes]:
+        if Image is None:
+            return mime, data
+        with Image.open(io.BytesIO(data)) as img:
+            if max(img.size) <= self.max_dimension and len(data) <= _PASSTHROUGH_BYTES:
+                return mime, data
+            resized = max(img.size) > self.max_dimension
+            img = ImageOps.exif_transpose(img)
+            img.thumbnail((self.max_dimension, self.max_dimension), Image.Resampling.LANCZOS)
+            out = io.BytesIO()
+            if img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info:
+                img.save(out, format="PNG", optimize=True)
+                new_mime = "image/png"
+            else:
+                img.convert("RGB").save(out, format="JPEG", quality=self.quality, optimize=True)
+                new_mime = "image/jpeg"
+        encoded = out.getvalue()
+        if not resized and len(encoded) >= len(data):
+            return mime, data
+        logger.debug("Image {}x{} re-encoded: {} -> {} bytes", *img.size, len(data), len(encoded))
+        return new_mime, encoded
@@ -0,0 +1,408 @@
+"""Content-addressed store for media received from chat channels."""
+
+import asyncio
+import hashlib
+import mimetypes
+import os
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator
+
+from loguru import logger
+
+from nanobot.utils.helpers import get_data_path, safe_filename
+
+if TYPE_CHECKING:
+    import httpx
+
+    from nanobot.config.schema import MediaConfig
+
+MB = 1024 * 1024
+_CHUNK = 64 * 1024
+
+# Channel-specific attachment types mapped onto the kinds that have size caps.
+_KIND_ALIASES = {"photo": "image", "sticker": "image", "voice": "audio", "media": "video"}
+
+
+class MediaTooLargeError(Exception):
+    """Raised when an attachment exceeds the size cap for its kind."""
+
+    def __init__(self, size: int, limit: int):
+        super().__init__(f"{size} bytes exceeds the {limit} byte limit")
+        self.size = size
+        self.limit = limit
+
+
+def media_kind(kind: str | None, mime: str | None = None) -> str:
+    """Normalize a channel's attachment type to image/audio/video/file."""
+    kind = _KIND_ALIASES.get(kind or "", kind or "")
+    if kind in ("image", "audio", "video"):
+        return kind
+    prefix = (mime or "").split("/", 1)[0]
+    return prefix if prefix in ("image", "audio", "video") else "file"
+
+
+def image_size(path: Path) -> tuple[int, int] | None:
+    """Read (width, height) from a PNG, GIF, JPEG or WebP header without decoding it."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(32)
+            if head.startswith(b"\x89PNG\r\n\x1a\n") and len(head) >= 24:
+                return struct.unpack(">II", head[16:24])
+            if head[:6] in (b"GIF87a", b"GIF89a"):
+                return struct.unpack("<HH", head[6:10])
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                chunk = head[12:16]
+                if chunk == b"VP8 ":
+                    w, h = struct.unpack("<HH", head[26:30])
+                    return w & 0x3FFF, h & 0x3FFF
+                if chunk == b"VP8L":
+                    bits = int.from_bytes(head[21:25], "little")
+                    return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+                if chunk == b"VP8X":
+                    return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+            if head[:2] == b"\xff\xd8":
+                f.seek(2)
+                while marker := f.read(2):
+                    if len(marker) < 2 or marker[0] != 0xFF:
+                        return None
+                    length = struct.unpack(">H", f.read(2))[0]
+                    if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                        h, w = struct.unpack(">xHH", f.read(5))
+                        return w, h
+                    f.seek(length - 2, os.SEEK_CUR)
+    except (OSError, struct.error):
+        pass
+    return None
+
+
+class MediaStore:
+    """
+    Shared on-disk store for inbound attachments.
+
+    Files live at <root>/<sha256[:2]>/<sha256><ext>, so the same photo
+    forwarded ten times is stored once. A SQLite index next to them records
+    size, mime type, image dimensions, original name, source and last access;
+    when the total size passes quota_bytes, the least recently used files are
+    deleted until usage is back under 90% of the quota. Files written by older
+    versions directly under <root> are adopted into the index on first open
+    so they age out the same way.
+    """
+
+    _INDEX = "index.db"
+
+    def __init__(
+        self,
+        root: Path,
+        quota_bytes: int = 2048 * MB,
+        max_bytes: dict[str, int] | None = None,
+    ):
+        self.root = root
+        self.quota_bytes = quota_bytes
+        self.max_bytes = {"image": 20 * MB, "audio": 25 * MB, "video": 50 * MB, "file": 50 * MB}
+        self.max_bytes.update(max_bytes or {})
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._total = 0
+
+    def limit_for(self, kind: str | None, mime: str | None = None) -> int:
+        return self.max_bytes[media_kind(kind, mime)]
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    async def put_bytes(
+        self,
+        data: bytes,
+        *,
+        kind: str | None = None,
+        filename: str | None = None,
+        mime: str | None = None,
+        source: str = "",
+    ) -> Path:
+        """Store an attachment already held in memory and return its path."""
+        limit = self.limit_for(kind, mime)
+        if len(data) > limit:
+            raise MediaTooLargeError(len(data), limit)
+        tmp = await asyncio.to_thread(self.temp_path)
+        try:
+            await asyncio.to_thread(tmp.write_bytes, data)
+            return await asyncio.to_thread(
+                self._commit, tmp, hashlib.sha256(data).hexdigest(), len(data), kind, filename, mime, source,
+            )
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    async def put_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        *,
+        kind: str | None = None,
+        filename: str | None = None,
+        mime: str | None = None,
+        source: str = "",
+        declared_size: int | None = None,
+    ) -> Path:
+        """Stream an attachment to disk, hashing as it goes; aborts as soon as the cap is crossed."""
+        limit = self.limit_for(kind, mime)
+        if declared_size and declared_size > limit:
+            raise MediaTooLargeError(declared_size, limit)
+        tmp = await asyncio.to_thread(self.temp_path)
+        digest, size = hashlib.sha256(), 0
+        f = await asyncio.to_thread(open, tmp, "wb")
+        try:
+            try:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > limit:
+                        raise MediaTooLargeError(size, limit)
+                    digest.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+            return await asyncio.to_thread(
+                self._commit, tmp, digest.hexdigest(), size, kind, filename, mime, source,
+            )
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    async def put_file(
+        self,
+        path: Path,
+        *,
+        kind: str | None = None,
+        filename: str | None = None,
+        mime: str | None = None,
+        source: str = "",
+    ) -> Path:
+        """Move a downloaded file (e.g. from temp_path()) into the store."""
+        limit = self.limit_for(kind, mime)
+        size = path.stat().st_size
+        if size > limit:
+            path.unlink(missing_ok=True)
+            raise MediaTooLargeError(size, limit)
+        digest = await asyncio.to_thread(self._hash_file, path)
+        try:
+            return await asyncio.to_thread(self._commit, path, digest, size, kind, filename, mime, source)
+        finally:
+            path.unlink(missing_ok=True)
+
+    async def download(
+        self,
+        client: "httpx.AsyncClient",
+        url: str,
+        *,
+        kind: str | None = None,
+        filename: str | None = None,
+        mime: str | None = None,
+        source: str = "",
+        headers: dict[str, str] | None = None,
+    ) -> Path:
+        """Stream a URL into the store with the size cap applied before and during transfer."""
+        async with client.stream("GET", url, headers=headers, follow_redirects=True) as resp:
+            resp.raise_for_status()
+            mime = mime or (resp.headers.get("content-type") or "").split(";")[0].strip() or None
+            declared = resp.headers.get("content-length")
+            return await self.put_stream(
+                resp.aiter_bytes(_CHUNK), kind=kind, filename=filename, mime=mime, source=source,
+                declared_size=int(declared) if declared and declared.isdigit() else None,
+            )
+
+    def temp_path(self) -> Path:
+        """A fresh path inside the store for SDKs that can only download to a file."""
+        tmp = self.root / "tmp"
+        tmp.mkdir(parents=True, exist_ok=True)
+        return tmp / uuid.uuid4().hex
+
+    # ------------------------------------------------------------------
+    # Lookup and maintenance
+    # ------------------------------------------------------------------
+
+    def info(self, path: str | Path) -> dict[str, Any] | None:
+        """Index metadata for a stored file, or None if it isn't tracked."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT sha, size, mime, kind, width, height, name, source, created, accessed "
+                "FROM media WHERE path = ?", (str(path),),
+            ).fetchone()
+        if not row:
+            return None
+        keys = ("sha256", "size", "mime", "kind", "width", "height", "name", "source", "created", "accessed")
+        return dict(zip(keys, row))
+
+    def touch(self, path: str | Path) -> None:
+        """Mark a stored file as used so the collector keeps it longer."""
+        with self._lock:
+            self.conn.execute("UPDATE media SET accessed = ? WHERE path = ?", (time.time(), str(path)))
+
+    def usage(self) -> int:
+        with self._lock:
+            self._open()
+            return self._total
+
+    def gc(self, target_bytes: int | None = None) -> tuple[int, int]:
+        """Delete least recently used files until usage <= target. Returns (files, bytes) removed."""
+        with self._lock:
+            self._open()
+            return self._gc_locked(self.quota_bytes if target_bytes is None else target_bytes)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ------------------------------------------------------------------
+    # Internals (called with the index open; _commit/_gc take the lock)
+    # ------------------------------------------------------------------
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            index = self.root / self._INDEX
+            fresh = not index.exists()
+            conn = sqlite3.connect(index, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS media (sha TEXT PRIMARY KEY, path TEXT NOT NULL, "
+                "size INTEGER NOT NULL, mime TEXT, kind TEXT, width INTEGER, height INTEGER, "
+                "name TEXT, source TEXT, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS media_accessed ON media (accessed)")
+            conn.execute("CREATE INDEX IF NOT EXISTS media_path ON media (path)")
+            self._conn = conn
+            if fresh:
+                self._adopt_legacy()
+            stale = time.time() - 3600  # other processes may be writing newer ones
+            for leftover in (self.root / "tmp").glob("*"):
+                try:
+                    if leftover.stat().st_mtime < stale:
+                        leftover.unlink()
+                except OSError:
+                    pass
+            self._total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM media").fetchone()[0]
+        return self._conn
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _suffix(filename: str | None, mime: str | None) -> str:
+        suffix = Path(safe_filename(filename or "")).suffix.lower()
+        if not suffix and mime:
+            suffix = mimetypes.guess_extension(mime, strict=False) or ""
+        return suffix if 1 < len(suffix) <= 16 and suffix[1:].isalnum() else ""
+
+    def _commit(
+        self,
+        src: Path,
+        sha: str,
+        size: int,
+        kind: str | None,
+        filename: str | None,
+        mime: str | None,
+        source: str,
+    ) -> Path:
+        """Move a fully written temp file into place; only the rename and index update hold the lock."""
+        mime = mime or (mimetypes.guess_type(filename)[0] if filename else None)
+        kind = media_kind(kind, mime)
+        path = self.root / sha[:2] / f"{sha}{self._suffix(filename, mime)}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        dims = image_size(src) if kind == "image" else None
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT path, size FROM media WHERE sha = ?", (sha,)).fetchone()
+            if row and Path(row[0]).is_file():
+                self.conn.execute("UPDATE media SET accessed = ? WHERE sha = ?", (now, sha))
+                logger.debug("Media {} already stored as {}", filename or sha[:12], row[0])
+                return Path(row[0])
+
+            os.replace(src, path)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (sha, str(path), size, mime, kind, *(dims or (None, None)), filename, source, now, now),
+            )
+            self._total += size - (row[1] if row else 0)
+            if self._total > self.quota_bytes:
+                self._gc_locked(int(self.quota_bytes * 0.9), keep=sha)
+        return path
+
+    def _gc_locked(self, target: int, keep: str | None = None) -> tuple[int, int]:
+        removed = freed = 0
+        rows = self.conn.execute("SELECT sha, path, size FROM media ORDER BY accessed").fetchall()
+        for sha, path, size in rows:
+            if self._total <= target:
+                break
+            if sha == keep:
+                continue
+            try:
+                Path(path).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("Media GC could not delete {}: {}", path, e)
+                continue
+            self.conn.execute("DELETE FROM media WHERE sha = ?", (sha,))
+            self._total -= size
+            removed += 1
+            freed += size
+        if removed:
+            logger.info("Media GC removed {} files ({:.1f} MB), {:.1f} MB in use",
+                        removed, freed / MB, self._total / MB)
+        return removed, freed
+
+    def _adopt_legacy(self) -> None:
+        """Index files left by the old per-channel download code, keyed by path and aged by mtime."""
+        rows = []
+        for path in self.root.rglob("*"):
+            rel = path.relative_to(self.root)
+            if rel.parts[0] == "tmp" or rel.name.startswith(self._INDEX) or not path.is_file():
+                continue
+            st = path.stat()
+            rows.append((f"legacy:{rel.as_posix()}", str(path), st.st_size, mimetypes.guess_type(path.name)[0],
+                         None, None, None, path.name, "legacy", st.st_mtime, st.st_mtime))
+        if rows:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("INSERT OR IGNORE INTO media VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            logger.info("Media store: indexed {} existing files under {}", len(rows), self.root)
+
+
+_settings: dict[str, Any] = {}
+_stores: dict[Path, MediaStore] = {}
+
+
+def configure_media_store(config: "MediaConfig") -> None:
+    """Apply quota and size caps from config to all stores handed out by get_media_store()."""
+    _settings.update(
+        quota_bytes=config.quota_mb * MB,
+        max_bytes={
+            "image": config.max_image_mb * MB,
+            "audio": config.max_audio_mb * MB,
+            "video": config.max_video_mb * MB,
+            "file": config.max_file_mb * MB,
+        },
+    )
+    for store in _stores.values():
+        store.quota_bytes = _settings["quota_bytes"]
+        store.max_bytes.update(_settings["max_bytes"])
+
+
+def get_media_store(root: Path | None = None) -> MediaStore:
+    """The process-wide store for <root> (default ~/.nanobot/media)."""
+    root = root or get_data_path() / "media"
+    if root not in _stores:
+        _stores[root] = MediaStore(root, **_settings)
+    return _stores[root]
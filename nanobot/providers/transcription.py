@@ -1,64 +1,276 @@
-"""Voice transcription provider using Groq."""
+"""Voice transcription: Whisper-compatible backends behind a shared, cached service."""
 
+import asyncio
+import hashlib
 import os
+import shutil
+import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING, Protocol
 
 import httpx
 from loguru import logger
 
+if TYPE_CHECKING:
+    from nanobot.config.schema import Config
 
-class GroqTranscriptionProvider:
+
+class TranscriptionBackend(Protocol):
+    """Anything that can turn one audio file into text."""
+
+    name: str
+    max_upload_bytes: int  # 0 = no limit, the backend reads long files itself
+
+    async def transcribe_file(self, path: Path) -> str: ...
+
+    async def aclose(self) -> None: ...
+
+
+class OpenAITranscriptionProvider:
     """
-    Voice transcription provider using Groq's Whisper API.
+    Client for OpenAI-compatible /audio/transcriptions endpoints.
 
-    Groq offers extremely fast transcription with a generous free tier.
+    Works with OpenAI, Groq and self-hosted Whisper servers (whisper.cpp,
+    faster-whisper-server, ...). One HTTP client is reused for every call.
     """
 
-    def __init__(self, api_key: str | None = None):
-        self.api_key = api_key or os.environ.get("GROQ_API_KEY")
-        self.api_url = "https://api.groq.com/openai/v1/audio/transcriptions"
+    name = "openai"
+    max_upload_bytes = 24 * 1024 * 1024
+
+    def __init__(self, api_key: str | None, api_url: str, model: str = "whisper-1", timeout: float = 120.0):
+        self.api_key = api_key
+        self.api_url = api_url
+        self.model = model
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+
+    async def transcribe_file(self, path: Path) -> str:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        with open(path, "rb") as f:
+            response = await self._client.post(
+                self.api_url,
+                headers=headers,
+                files={"file": (path.name, f), "model": (None, self.model)},
+            )
+        response.raise_for_status()
+        return response.json().get("text", "")
 
     async def transcribe(self, file_path: str | Path) -> str:
-        """
-        Transcribe an audio file using Groq.
+        """Transcribe a single file, returning "" on any error."""
+        path = Path(file_path)
+        if not path.exists():
+            logger.error("Audio file not found: {}", file_path)
+            return ""
+        try:
+            return await self.transcribe_file(path)
+        except Exception as e:
+            logger.error("{} transcription error: {}", self.name, e)
+            return ""
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class GroqTranscriptionProvider(OpenAITranscriptionProvider):
+    """
+    Voice transcription provider using Groq's Whisper API.
 
-        Args:
-            file_path: Path to the audio file.
+    Groq offers extremely fast transcription with a generous free tier.
+    """
+
+    name = "groq"
+
+    def __init__(self, api_key: str | None = None, model: str = "whisper-large-v3"):
+        super().__init__(
+            api_key or os.environ.get("GROQ_API_KEY"),
+            "https://api.groq.com/openai/v1/audio/transcriptions",
+            model,
+        )
 
-        Returns:
-            Transcribed text.
-        """
+    async def transcribe(self, file_path: str | Path) -> str:
         if not self.api_key:
             logger.warning("Groq API key not configured for transcription")
             return ""
+        return await super().transcribe(file_path)
+
+
+class LocalWhisperProvider:
+    """Offline transcription with faster-whisper, run in a worker thread."""
 
+    name = "local"
+    max_upload_bytes = 0
+
+    def __init__(self, model: str = "base", device: str = "auto", compute_type: str = "int8"):
+        self.model = model
+        self.device = device
+        self.compute_type = compute_type
+        self._model = None
+
+    def _run(self, path: Path) -> str:
+        if self._model is None:
+            try:
+                from faster_whisper import WhisperModel
+            except ImportError as e:
+                raise RuntimeError(
+                    "Local transcription needs faster-whisper. Run: pip install nanobot-ai[whisper]"
+                ) from e
+            self._model = WhisperModel(self.model, device=self.device, compute_type=self.compute_type)
+        segments, _ = self._model.transcribe(str(path))
+        return " ".join(s.text.strip() for s in segments).strip()
+
+    async def transcribe_file(self, path: Path) -> str:
+        return await asyncio.to_thread(self._run, path)
+
+    async def aclose(self) -> None:
+        self._model = None
+
+
+class TranscriptionService:
+    """
+    Shared transcription front end for all channels.
+
+    At most max_concurrent files are transcribed at once and max_queue more
+    may wait; beyond that a request returns "" immediately, so a burst of
+    voice notes can't stall message handling. Results are cached on disk by
+    the SHA-256 of the audio, and concurrent requests for the same audio
+    share one task, which is only cancelled once every waiter has given up.
+    Files over the backend's upload limit are re-encoded
+    to 16 kHz mono Opus and split into chunk_seconds pieces with ffmpeg.
+    """
+
+    def __init__(
+        self,
+        backend: TranscriptionBackend,
+        cache_dir: Path | None = None,
+        max_concurrent: int = 2,
+        max_queue: int = 16,
+        chunk_seconds: int = 600,
+    ):
+        self.backend = backend
+        self.cache_dir = cache_dir
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.chunk_seconds = chunk_seconds
+        self._sem = asyncio.Semaphore(max_concurrent)
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+        self._waiters: dict[asyncio.Task[str], int] = {}
+
+    @classmethod
+    def from_config(cls, config: "Config") -> "TranscriptionService | None":
+        """Build the service configured under channels.transcription, or None if unusable."""
+        from nanobot.utils.helpers import get_data_path
+
+        tc = config.channels.transcription
+        backend: TranscriptionBackend
+        if tc.provider == "local":
+            backend = LocalWhisperProvider(tc.model or "base")
+        elif tc.provider == "openai":
+            prov = config.providers.openai
+            base = (tc.api_base or prov.api_base or "https://api.openai.com/v1").rstrip("/")
+            backend = OpenAITranscriptionProvider(prov.api_key, f"{base}/audio/transcriptions", tc.model or "whisper-1")
+        else:
+            if not (config.providers.groq.api_key or os.environ.get("GROQ_API_KEY")):
+                return None
+            backend = GroqTranscriptionProvider(config.providers.groq.api_key, tc.model or "whisper-large-v3")
+        return cls(
+            backend,
+            cache_dir=get_data_path() / "transcriptions",
+            max_concurrent=tc.max_concurrent,
+            max_queue=tc.max_queue,
+            chunk_seconds=tc.chunk_seconds,
+        )
+
+    async def transcribe(self, file_path: str | Path) -> str:
+        """Transcribe an audio file; returns "" if it fails or the queue is full."""
         path = Path(file_path)
-        if not path.exists():
-            logger.error("Audio file not found: {}", file_path)
+        try:
+            digest = await asyncio.to_thread(self._hash_file, path)
+        except OSError as e:
+            logger.error("Audio file not readable: {}", e)
             return ""
-
+        if (cached := self._cache_get(digest)) is not None:
+            return cached
+        if (task := self._inflight.get(digest)) is None:
+            if len(self._inflight) >= self.max_concurrent + self.max_queue:
+                logger.warning("Transcription queue full, skipping {}", path.name)
+                return ""
+            task = self._inflight[digest] = asyncio.create_task(self._run(digest, path))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
         try:
-            async with httpx.AsyncClient() as client:
-                with open(path, "rb") as f:
-                    files = {
-                        "file": (path.name, f),
-                        "model": (None, "whisper-large-v3"),
-                    }
-                    headers = {
-                        "Authorization": f"Bearer {self.api_key}",
-                    }
-
-                    response = await client.post(
-                        self.api_url,
-                        headers=headers,
-                        files=files,
-                        timeout=60.0
-                    )
-
-                    response.raise_for_status()
-                    data = response.json()
-                    return data.get("text", "")
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                task.cancel()  # no-op once done; otherwise nobody is left to wait for it
 
+    async def _run(self, digest: str, path: Path) -> str:
+        try:
+            async with self._sem:
+                text = await self._transcribe_chunks(path)
+            self._cache_put(digest, text)
+            return text
         except Exception as e:
-            logger.error("Groq transcription error: {}", e)
+            logger.error("{} transcription error: {}", self.backend.name, e)
             return ""
+        finally:
+            self._inflight.pop(digest, None)
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+    async def _transcribe_chunks(self, path: Path) -> str:
+        limit = self.backend.max_upload_bytes
+        if not limit or path.stat().st_size <= limit:
+            return await self.backend.transcribe_file(path)
+        with tempfile.TemporaryDirectory(prefix="nanobot-audio-") as tmp:
+            chunks = await self._split(path, Path(tmp))
+            texts = [await self.backend.transcribe_file(chunk) for chunk in chunks]
+        return " ".join(t.strip() for t in texts if t.strip())
+
+    async def _split(self, path: Path, out_dir: Path) -> list[Path]:
+        ffmpeg = shutil.which("ffmpeg")
+        if not ffmpeg:
+            logger.warning("{} exceeds the upload limit and ffmpeg is not installed to split it", path.name)
+            return [path]
+        proc = await asyncio.create_subprocess_exec(
+            ffmpeg, "-nostdin", "-loglevel", "error", "-i", str(path),
+            "-vn", "-ac", "1", "-ar", "16000", "-c:a", "libopus", "-b:a", "32k",
+            "-f", "segment", "-segment_time", str(self.chunk_seconds), str(out_dir / "part%04d.ogg"),
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, err = await proc.communicate()
+        if proc.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {err.decode(errors='replace').strip()[:200]}")
+        return sorted(out_dir.glob("part*.ogg"))
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _cache_path(self, digest: str) -> Path | None:
+        return self.cache_dir / f"{digest}.txt" if self.cache_dir else None
+
+    def _cache_get(self, digest: str) -> str | None:
+        path = self._cache_path(digest)
+        try:
+            return path.read_text(encoding="utf-8") if path else None
+        except OSError:
+            return None
+
+    def _cache_put(self, digest: str, text: str) -> None:
+        if not text or not (path := self._cache_path(digest)):
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+        except OSError as e:
+            logger.warning("Could not cache transcription: {}", e)
@@ -0,0 +1,61 @@
+import pytest
+
+from nanobot.agent.tools.batch import ReadFilesTool
+
+
+def _make_tree(root) -> None:
+    (root / "src").mkdir()
+    (root / "src" / "a.py").write_text("print('a')\n", encoding="utf-8")
+    (root / "src" / "b.py").write_text("print('b')\n", encoding="utf-8")
+    (root / "notes.md").write_text("x" * 3000, encoding="utf-8")
+
+
+@pytest.mark.asyncio
+async def test_read_files_expands_globs_and_reports_errors(tmp_path) -> None:
+    _make_tree(tmp_path)
+    tool = ReadFilesTool(workspace=tmp_path)
+
+    result = await tool.execute(paths=["src/*.py", "src/a.py", "missing.txt", "*.rs"])
+
+    assert "=== src/a.py (11 bytes) ===\nprint('a')" in result
+    assert "=== src/b.py (11 bytes) ===\nprint('b')" in result
+    assert result.count("src/a.py") == 1
+    assert "=== missing.txt ===\nError: File not found" in result
+    assert "=== *.rs ===\nError: No files match" in result
+    assert result.endswith("[read_files: 4 entries, 22 bytes returned]")
+
+
+@pytest.mark.asyncio
+async def test_read_files_glob_skips_binaries_without_building_trigrams(tmp_path) -> None:
+    _make_tree(tmp_path)
+    (tmp_path / "src" / "blob.py").write_bytes(b"\x00\x01\x02")
+    tool = ReadFilesTool(workspace=tmp_path)
+
+    result = await tool.execute(paths=["src/*.py"])
+    assert "blob.py" not in result
+    assert "=== src/a.py (11 bytes) ===" in result
+    assert not tool._index._grams
+
+    result = await tool.execute(paths=["src/blob.py"])
+    assert "=== src/blob.py ===\nError: Binary file (3 bytes)" in result
+
+@pytest.mark.asyncio
+async def test_read_files_shares_byte_budget(tmp_path) -> None:
+    _make_tree(tmp_path)
+    tool = ReadFilesTool(workspace=tmp_path)
+
+    result = await tool.execute(paths=["notes.md", "src/a.py"], max_bytes=1000)
+
+    assert "=== notes.md (3000 bytes, truncated to 1000) ===" in result
+    assert "print('a')" not in result
+    assert "not read: src/a.py" in result
+
+
+@pytest.mark.asyncio
+async def test_read_files_honors_allowed_dir(tmp_path) -> None:
+    _make_tree(tmp_path)
+    tool = ReadFilesTool(workspace=tmp_path, allowed_dir=tmp_path)
+
+    result = await tool.execute(paths=["/etc/hostname", "/etc/*.conf"])
+
+    assert result.count("outside allowed directory") == 2
@@ -1,4 +1,6 @@
 import asyncio
+import json
+import time
 
 import pytest
 
@@ -57,3 +59,122 @@ async def test_running_service_honors_external_disable(tmp_path) -> None:
         assert called == []
     finally:
         service.stop()
+
+
+@pytest.mark.asyncio
+async def test_due_jobs_run_concurrently_within_limit(tmp_path) -> None:
+    starts: list[float] = []
+
+    async def on_job(job) -> None:
+        starts.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(0.3)
+
+    service = CronService(tmp_path / "cron" / "jobs.json", on_job=on_job, max_concurrent=2)
+    at_ms = int(time.time() * 1000) + 100
+    for i in range(3):
+        service.add_job(name=f"job{i}", schedule=CronSchedule(kind="at", at_ms=at_ms), message="hi")
+    await service.start()
+    try:
+        await asyncio.sleep(0.25)
+        assert len(starts) == 2  # third job waits for a slot
+        assert service.status()["running"] == 3
+        await asyncio.sleep(0.3)
+        assert len(starts) == 3
+    finally:
+        service.stop()
+    assert service.stats.runs == 2  # the third was cancelled by stop() mid-run
+    assert service.stats.max_lag_ms < 200
+
+
+@pytest.mark.asyncio
+async def test_due_job_still_running_is_skipped(tmp_path) -> None:
+    service = CronService(tmp_path / "cron" / "jobs.json")
+    job = service.add_job(name="slow", schedule=CronSchedule(kind="every", every_ms=60_000), message="hi")
+    job.state.next_run_at_ms = 1
+    service._heap = None
+    busy = asyncio.create_task(asyncio.sleep(10))
+    service._running_jobs[job.id] = busy
+    try:
+        await service._on_timer()
+    finally:
+        busy.cancel()
+    assert service.stats.skipped == 1
+    assert job.state.last_status == "skipped"
+    assert job.state.next_run_at_ms > 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy,expected", [("skip", 0), ("run_once", 1)])
+async def test_missed_runs_policy(tmp_path, policy, expected) -> None:
+    store_path = tmp_path / "cron" / "jobs.json"
+    setup = CronService(store_path)
+    job = setup.add_job(name="hourly", schedule=CronSchedule(kind="every", every_ms=3_600_000), message="hi")
+    job.state.next_run_at_ms = 1_000  # fell due while the gateway was down
+    setup._save_store()
+
+    called: list[str] = []
+
+    async def on_job(job) -> None:
+        called.append(job.id)
+
+    service = CronService(store_path, on_job=on_job, missed_runs=policy)
+    await service.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        service.stop()
+    assert len(called) == expected
+    assert service.list_jobs()[0].state.next_run_at_ms > 1_000
+
+
+def test_legacy_json_store_is_imported(tmp_path) -> None:
+    store_path = tmp_path / "cron" / "jobs.json"
+    store_path.parent.mkdir()
+    store_path.write_text(json.dumps({"version": 1, "jobs": [{
+        "id": "abc12345", "name": "old", "enabled": True,
+        "schedule": {"kind": "every", "everyMs": 60000},
+        "payload": {"kind": "agent_turn", "message": "hello"},
+        "state": {"lastStatus": "ok"},
+    }]}), encoding="utf-8")
+
+    jobs = CronService(store_path).list_jobs()
+    assert [(j.id, j.name, j.state.last_status) for j in jobs] == [("abc12345", "old", "ok")]
+    assert not store_path.exists() and (tmp_path / "cron" / "jobs.json.migrated").exists()
+    assert CronService(store_path).list_jobs()[0].id == "abc12345"
+
+
+def test_concurrent_writers_see_each_other_without_clobbering(tmp_path) -> None:
+    store_path = tmp_path / "cron" / "jobs.json"
+    gateway, cli = CronService(store_path), CronService(store_path)
+    job = gateway.add_job(name="a", schedule=CronSchedule(kind="every", every_ms=60_000), message="hi")
+    assert [j.id for j in cli.list_jobs()] == [job.id]
+
+    cli.enable_job(job.id, enabled=False)
+    job.state.last_status = "ok"
+    gateway._db.save_states([job])  # the gateway recording a run must not re-enable it
+    reloaded = gateway.list_jobs(include_disabled=True)[0]
+    assert reloaded.enabled is False and reloaded.state.last_status == "ok"
+
+    assert cli.remove_job(job.id)
+    assert gateway.list_jobs(include_disabled=True) == []
+
+
+def test_compiled_cron_matches_croniter_and_is_shared() -> None:
+    from datetime import datetime
+    from zoneinfo import ZoneInfo
+
+    from croniter import croniter
+
+    from nanobot.cron.service import _compile_cron, _compute_next_run
+
+    schedule = CronSchedule(kind="cron", expr="30 2 * * *", tz="Europe/Berlin")
+    now = 1_711_760_000_000  # the night Berlin springs forward
+    for _ in range(10):
+        expected = croniter(schedule.expr, datetime.fromtimestamp(now / 1000, tz=ZoneInfo(schedule.tz)))
+        assert _compute_next_run(schedule, now) == int(expected.get_next(datetime).timestamp() * 1000)
+        now += 6 * 3600 * 1000
+
+    _compile_cron.cache_clear()
+    for _ in range(3):
+        _compute_next_run(CronSchedule(kind="cron", expr="0 9 * * *", tz="UTC"), now)
+    assert _compile_cron.cache_info().misses == 1
@@ -0,0 +1,63 @@
+import sqlite3
+import time
+from pathlib import Path
+
+from nanobot.channels.dedup import DedupStore
+
+
+def test_is_duplicate_records_first_sighting() -> None:
+    store = DedupStore("test")
+
+    assert store.is_duplicate("m1") is False
+    assert store.is_duplicate("m1") is True
+    assert "m1" in store
+    assert "m2" not in store
+
+
+def test_size_bound_evicts_oldest() -> None:
+    store = DedupStore("test", max_size=3)
+    for key in ("a", "b", "c", "d"):
+        store.add(key)
+
+    assert len(store) == 3
+    assert "a" not in store
+    assert "d" in store
+
+
+def test_expired_ids_are_not_duplicates() -> None:
+    store = DedupStore("test", ttl_s=60)
+    store._ids["old"] = time.time() - 120
+
+    assert store.is_duplicate("old") is False
+    assert store.is_duplicate("old") is True
+
+
+def test_ids_survive_restart(tmp_path: Path) -> None:
+    db = tmp_path / "dedup.db"
+    first = DedupStore("feishu")
+    first.add("early")  # seen before persistence was attached
+    first.persist_to(db)
+    first.add("m1")
+    first.close()
+
+    second = DedupStore("feishu")
+    second.persist_to(db)
+    assert second.is_duplicate("m1") is True
+    assert second.is_duplicate("early") is True
+
+    other = DedupStore("whatsapp")
+    other.persist_to(db)
+    assert other.is_duplicate("m1") is False
+
+
+def test_persisted_rows_are_pruned_to_max_size(tmp_path: Path) -> None:
+    db = tmp_path / "dedup.db"
+    store = DedupStore("email", max_size=5)
+    store.persist_to(db)
+    for i in range(1000):
+        store.add(f"uid{i}")
+    store.close()
+
+    with sqlite3.connect(db) as conn:
+        keys = {k for (k,) in conn.execute("SELECT key FROM seen WHERE scope = 'email'")}
+    assert keys == {f"uid{i}" for i in range(995, 1000)}
@@ -1,5 +1,11 @@
+import asyncio
 from email.message import EmailMessage
 from datetime import date
+import imaplib
+import smtplib
+import socket
+import threading
+import time
 
 import pytest
 
@@ -366,3 +372,249 @@ def test_fetch_messages_between_dates_uses_imap_since_before_without_mark_seen(m
     assert fake.search_args is not None
     assert fake.search_args[1:] == ("SINCE", "06-Feb-2026", "BEFORE", "07-Feb-2026")
     assert fake.store_calls == []
+
+
+class _PersistentIMAP:
+    def __init__(self, raws: dict[bytes, bytes], capabilities: tuple[str, ...] = ()) -> None:
+        self.raws = raws
+        self.capabilities = capabilities
+        self.fetch_calls: list[bytes] = []
+        self.store_calls: list[tuple[bytes, str, str]] = []
+        self.logouts = 0
+        self.sent: list[bytes] = []
+        self.sock = None
+        self.file = None
+        self.untagged_responses: dict[str, list[bytes]] = {}
+        self.uidvalidity = b"7"
+
+    def attach(self) -> socket.socket:
+        """Connect to a fake server that ends IDLE when DONE is sent; returns the server end."""
+        self.server, self.sock = socket.socketpair()
+        self.file = self.sock.makefile("rb")
+        return self.server
+
+    def login(self, _user: str, _pw: str):
+        return "OK", [b"logged in"]
+
+    def select(self, _mailbox: str):
+        self.untagged_responses = {"UIDVALIDITY": [self.uidvalidity]}
+        return "OK", [b"3"]
+
+    def search(self, *_args):
+        return "OK", [b" ".join(self.raws)]
+
+    def fetch(self, ids: bytes, _parts: str):
+        self.fetch_calls.append(ids)
+        response: list = []
+        for imap_id in ids.split(b","):
+            response += [(imap_id + b" (UID 10" + imap_id + b" BODY[] {200}", self.raws[imap_id]), b")"]
+        return "OK", response
+
+    def store(self, imap_id: bytes, op: str, flags: str):
+        self.store_calls.append((imap_id, op, flags))
+        return "OK", [b""]
+
+    def logout(self):
+        self.logouts += 1
+        return "BYE", [b""]
+
+    def _new_tag(self) -> bytes:
+        return b"A001"
+
+    def send(self, data: bytes) -> None:
+        self.sent.append(data)
+        if data == b"DONE\r\n":
+            self.server.sendall(b"A001 OK IDLE terminated\r\n")
+
+    def readline(self) -> bytes:
+        return self.file.readline()
+
+    def socket(self):
+        return self.sock
+
+
+def test_fetch_new_messages_reuses_connection_and_batches(monkeypatch) -> None:
+    fake = _PersistentIMAP({
+        b"1": _make_raw_email(subject="One"),
+        b"2": _make_raw_email(subject="Two"),
+        b"3": _make_raw_email(subject="Three"),
+    })
+    connects: list[object] = []
+
+    def _factory(_h, _p):
+        connects.append(fake)
+        return fake
+
+    monkeypatch.setattr("nanobot.channels.email.imaplib.IMAP4_SSL", _factory)
+
+    channel = EmailChannel(_make_config(), MessageBus())
+    items = channel._fetch_new_messages()
+
+    assert [i["subject"] for i in items] == ["One", "Two", "Three"]
+    assert [i["metadata"]["uid"] for i in items] == ["101", "102", "103"]
+    assert fake.fetch_calls == [b"1,2,3"]
+    assert fake.store_calls == [(b"1,2,3", "+FLAGS", "\\Seen")]
+
+    assert channel._fetch_new_messages() == []
+    assert len(connects) == 1
+    assert fake.logouts == 0
+
+    channel._close_imap()
+    assert fake.logouts == 1
+
+
+def test_persistent_connection_is_dropped_after_error(monkeypatch) -> None:
+    fake = _PersistentIMAP({b"1": _make_raw_email()})
+    connects: list[object] = []
+
+    def _factory(_h, _p):
+        connects.append(fake)
+        return fake
+
+    monkeypatch.setattr("nanobot.channels.email.imaplib.IMAP4_SSL", _factory)
+    channel = EmailChannel(_make_config(), MessageBus())
+
+    def _broken_search(*_args):
+        raise imaplib.IMAP4.abort("socket error")
+
+    original = fake.search
+    fake.search = _broken_search
+    with pytest.raises(imaplib.IMAP4.abort):
+        channel._fetch_new_messages()
+    assert channel._imap is None
+
+    fake.search = original
+    assert len(channel._fetch_new_messages()) == 1
+    assert len(connects) == 2
+
+
+def test_dedup_key_includes_uidvalidity(monkeypatch) -> None:
+    fake = _PersistentIMAP({b"1": _make_raw_email()})
+    monkeypatch.setattr("nanobot.channels.email.imaplib.IMAP4_SSL", lambda _h, _p: fake)
+    config = _make_config()
+    config.mark_seen = False
+    channel = EmailChannel(config, MessageBus())
+
+    assert len(channel._fetch_new_messages()) == 1
+    assert "INBOX:7:101" in channel.dedup
+    assert channel._fetch_new_messages() == []
+
+    # The mailbox was recreated: the same UID now names a different message.
+    channel._close_imap()
+    fake.uidvalidity = b"8"
+    assert len(channel._fetch_new_messages()) == 1
+
+
+def _idle_channel(fake: _PersistentIMAP) -> EmailChannel:
+    channel = EmailChannel(_make_config(), MessageBus())
+    channel._running = True
+    channel._imap = fake
+    return channel
+
+
+def test_idle_returns_when_server_pushes() -> None:
+    fake = _PersistentIMAP({}, capabilities=("IMAP4REV1", "IDLE"))
+    server = fake.attach()
+    server.sendall(b"+ idling\r\n")
+    push = threading.Timer(0.2, server.sendall, [b"* 4 EXISTS\r\n"])
+    push.start()
+
+    started = time.monotonic()
+    try:
+        assert _idle_channel(fake)._idle(timeout=5) is True
+    finally:
+        push.join()
+        server.close()
+        fake.sock.close()
+    assert time.monotonic() - started < 1.0
+    assert fake.sent == [b"A001 IDLE\r\n", b"DONE\r\n"]
+
+
+def test_idle_sees_response_buffered_with_the_continuation() -> None:
+    fake = _PersistentIMAP({}, capabilities=("IMAP4REV1", "IDLE"))
+    server = fake.attach()
+    # "+" and the EXISTS arrive in one recv, so EXISTS is already in imaplib's reader
+    server.sendall(b"+ idling\r\n* 1 EXISTS\r\n")
+
+    started = time.monotonic()
+    try:
+        assert _idle_channel(fake)._idle(timeout=3) is True
+    finally:
+        server.close()
+        fake.sock.close()
+    assert time.monotonic() - started < 1.0
+    assert fake.sent == [b"A001 IDLE\r\n", b"DONE\r\n"]
+
+
+def test_idle_unsupported_falls_back_to_polling() -> None:
+    channel = EmailChannel(_make_config(), MessageBus())
+    channel._imap = _PersistentIMAP({}, capabilities=("IMAP4REV1",))
+
+    assert channel._idle(timeout=5) is False
+
+
+class _PooledSMTP:
+    instances: list["_PooledSMTP"] = []
+
+    def __init__(self, _host: str, _port: int, timeout: int = 30) -> None:
+        self.sent: list[EmailMessage] = []
+        self.logins = 0
+        self.fail_next = False
+        self.quit_called = False
+        self.threads: set[str] = set()
+        _PooledSMTP.instances.append(self)
+
+    def starttls(self, context=None):
+        return None
+
+    def login(self, _user: str, _pw: str):
+        self.logins += 1
+
+    def send_message(self, msg: EmailMessage):
+        self.threads.add(threading.current_thread().name)
+        if self.fail_next:
+            self.fail_next = False
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(msg)
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.mark.asyncio
+async def test_send_reuses_one_smtp_connection_for_a_burst(monkeypatch) -> None:
+    _PooledSMTP.instances = []
+    monkeypatch.setattr("nanobot.channels.email.smtplib.SMTP", _PooledSMTP)
+    channel = EmailChannel(_make_config(), MessageBus())
+
+    await asyncio.gather(*(
+        channel.send(OutboundMessage(channel="email", chat_id=f"user{i}@example.com", content=f"Hi {i}"))
+        for i in range(5)
+    ))
+    await channel.send(OutboundMessage(channel="email", chat_id="late@example.com", content="Later"))
+
+    assert len(_PooledSMTP.instances) == 1
+    smtp = _PooledSMTP.instances[0]
+    assert smtp.logins == 1
+    assert sorted(m["To"] for m in smtp.sent) == sorted(
+        [f"user{i}@example.com" for i in range(5)] + ["late@example.com"]
+    )
+    assert all(name.startswith("nanobot-smtp") for name in smtp.threads)
+
+    await channel.stop()
+    assert smtp.quit_called is True
+
+
+@pytest.mark.asyncio
+async def test_send_reconnects_when_smtp_connection_dropped(monkeypatch) -> None:
+    _PooledSMTP.instances = []
+    monkeypatch.setattr("nanobot.channels.email.smtplib.SMTP", _PooledSMTP)
+    channel = EmailChannel(_make_config(), MessageBus())
+
+    await channel.send(OutboundMessage(channel="email", chat_id="a@example.com", content="one"))
+    _PooledSMTP.instances[0].fail_next = True
+    await channel.send(OutboundMessage(channel="email", chat_id="b@example.com", content="two"))
+
+    assert len(_PooledSMTP.instances) == 2
+    assert [m["To"] for m in _PooledSMTP.instances[1].sent] == ["b@example.com"]
+    await channel.stop()
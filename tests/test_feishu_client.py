@@ -0,0 +1,137 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from nanobot.channels.feishu import FeishuAPIError, FeishuClient
+from nanobot.media import MediaStore
+
+
+class _FakeOpenAPI:
+    def __init__(self) -> None:
+        self.token_calls = 0
+        self.requests: list[httpx.Request] = []
+        self.reject_token: str | None = None
+        self.rate_limited = False
+        self.token_down = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/auth/v3/tenant_access_token/internal"):
+            self.token_calls += 1
+            if self.token_down:
+                return httpx.Response(503, text="upstream unavailable")
+            return httpx.Response(200, json={"code": 0, "tenant_access_token": f"t{self.token_calls}", "expire": 7200})
+        self.requests.append(request)
+        if request.headers["Authorization"] == f"Bearer {self.reject_token}":
+            return httpx.Response(400, json={"code": 99991663, "msg": "Invalid access token"})
+        if self.rate_limited:
+            return httpx.Response(
+                429, json={"code": 99991400, "msg": "frequency limit"}, headers={"x-ogw-ratelimit-reset": "3"},
+            )
+        if path.endswith("/resources/file_key_1"):
+            return httpx.Response(
+                200, content=b"%PDF-1.4 data",
+                headers={"content-type": "application/pdf",
+                         "content-disposition": "attachment; filename*=UTF-8''report%20Q3.pdf"},
+            )
+        if path.endswith("/im/v1/files"):
+            return httpx.Response(200, json={"code": 0, "msg": "success", "data": {"file_key": "fk_1"}})
+        return httpx.Response(200, json={"code": 0, "msg": "success", "data": {"message_id": "om_1"}})
+
+
+def _client(api: _FakeOpenAPI) -> FeishuClient:
+    client = FeishuClient("app", "secret", base_url="https://open.test/open-apis")
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    return client
+
+
+@pytest.mark.asyncio
+async def test_tenant_token_is_cached_across_calls() -> None:
+    api = _FakeOpenAPI()
+    client = _client(api)
+
+    await client.send_message("chat_id", "oc_1", "text", '{"text": "a"}')
+    await client.send_message("chat_id", "oc_1", "text", '{"text": "b"}')
+
+    assert api.token_calls == 1
+    assert all(r.headers["Authorization"] == "Bearer t1" for r in api.requests)
+    assert api.requests[0].url.params["receive_id_type"] == "chat_id"
+    assert json.loads(api.requests[0].content)["receive_id"] == "oc_1"
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_refreshed_once() -> None:
+    api = _FakeOpenAPI()
+    client = _client(api)
+    await client.tenant_token()
+    api.reject_token = "t1"
+
+    await client.add_reaction("om_1", "THUMBSUP")
+
+    assert api.token_calls == 2
+    assert [r.headers["Authorization"] for r in api.requests] == ["Bearer t1", "Bearer t2"]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_error_carries_reset_hint() -> None:
+    api = _FakeOpenAPI()
+    api.rate_limited = True
+    client = _client(api)
+
+    with pytest.raises(FeishuAPIError) as exc:
+        await client.send_message("open_id", "ou_1", "text", "{}")
+
+    assert exc.value.code == 99991400
+    assert exc.value.retry_after == 3
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_download_resource_streams_into_media_store(tmp_path: Path) -> None:
+    store = MediaStore(tmp_path / "media")
+    api = _FakeOpenAPI()
+    client = _client(api)
+
+    path, filename = await client.download_resource(
+        store, "om_1", "file_key_1", "file", default_name="file_key_1", source="feishu:om_1",
+    )
+
+    assert filename == "report Q3.pdf"
+    assert path.read_bytes() == b"%PDF-1.4 data"
+    assert api.requests[-1].url.params["type"] == "file"
+    store.close()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_token_http_error_is_reported_with_status() -> None:
+    api = _FakeOpenAPI()
+    api.token_down = True
+    client = _client(api)
+
+    with pytest.raises(FeishuAPIError) as exc:
+        await client.tenant_token()
+
+    assert exc.value.code == 503
+    assert "upstream unavailable" in exc.value.msg
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_the_file_and_survives_a_token_retry(tmp_path: Path) -> None:
+    api = _FakeOpenAPI()
+    client = _client(api)
+    await client.tenant_token()
+    api.reject_token = "t1"
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF-1.4 " + b"x" * 200_000)
+
+    assert await client.upload_file(str(report), "pdf") == "fk_1"
+
+    assert len(api.requests) == 2  # rejected once, then resent with a fresh token
+    assert all(b"x" * 200_000 in r.content for r in api.requests)
+    await client.aclose()
@@ -0,0 +1,137 @@
+import time
+
+import pytest
+
+from nanobot.agent.tools.filesystem import (
+    EditFileTool,
+    ListDirTool,
+    ReadFileTool,
+    _find_similar_block,
+    _LineIndex,
+)
+
+
+def _source(n: int) -> str:
+    return "".join(f"    value_{i} = compute(arg_{i}, other={i % 7})\n" for i in range(n))
+
+
+def test_not_found_message_points_at_near_miss_block() -> None:
+    content = _source(200)
+    old_text = "".join(f"    value_{i} = compute(arg_{i}, other=9)\n" for i in range(120, 124))
+
+    msg = EditFileTool._not_found_message(old_text, content, "a.py")
+
+    assert "Best match" in msg
+    assert "at line 121" in msg
+    assert "+    value_120 = compute(arg_120, other=1)" in msg
+
+
+def test_not_found_message_reports_no_similar_text() -> None:
+    msg = EditFileTool._not_found_message("completely unrelated\nwords here\n", _source(50), "a.py")
+    assert "No similar text found" in msg
+
+
+def test_find_similar_block_uses_exact_line_anchors() -> None:
+    lines = ["def a():\n", "    return 1\n", "\n", "def b():\n", "    x = 2\n", "    return x\n"]
+    old = ["def b():\n", "    x = 3\n", "    return x\n"]
+    ratio, start = _find_similar_block(old, lines)
+    assert start == 3
+    assert ratio > 0.8
+
+
+def test_find_similar_block_is_fast_on_large_files() -> None:
+    lines = _source(20_000).splitlines(keepends=True)
+    old = [f"    value_{i} = compute(arg_{i}, other=-1)\n" for i in range(15_000, 15_010)]
+
+    started = time.monotonic()
+    ratio, start = _find_similar_block(old, lines)
+
+    assert start == 15_000
+    assert ratio > 0.9
+    assert time.monotonic() - started < 2.0
+
+
+@pytest.mark.asyncio
+async def test_read_file_returns_small_files_unchanged(tmp_path) -> None:
+    (tmp_path / "a.txt").write_text("one\ntwo\n", encoding="utf-8")
+    tool = ReadFileTool(workspace=tmp_path)
+    assert await tool.execute(path="a.txt") == "one\ntwo\n"
+
+
+@pytest.mark.asyncio
+async def test_read_file_line_window(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(_LineIndex, "CHUNK", 64)
+    (tmp_path / "log.txt").write_text("".join(f"line {i}\n" for i in range(1, 1001)), encoding="utf-8")
+    tool = ReadFileTool(workspace=tmp_path)
+
+    result = await tool.execute(path="log.txt", offset=500, limit=3)
+    assert result.startswith("line 500\nline 501\nline 502\n\n")
+    assert "Use offset=503 to continue" in result
+
+    # Second window reuses the cached checkpoints and reports the total once known
+    result = await tool.execute(path="log.txt", offset=999)
+    assert result.startswith("line 999\nline 1000\n\n")
+    assert "lines 999-1000 of 1000" in result
+    assert len(tool._indexes) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_file_byte_cap_and_stale_index(tmp_path) -> None:
+    path = tmp_path / "big.txt"
+    path.write_text("x" * 50 + "\n" + "y" * 50 + "\n" + "z" * 50 + "\n", encoding="utf-8")
+    tool = ReadFileTool(workspace=tmp_path, max_bytes=110)
+
+    result = await tool.execute(path="big.txt")
+    assert "z" not in result
+    assert "truncated at 110 bytes" in result
+    assert "Use offset=3 to continue" in result
+
+    path.write_text("short\n", encoding="utf-8")
+    assert "beyond end of file" in await tool.execute(path="big.txt", offset=3)
+
+
+@pytest.mark.asyncio
+async def test_read_file_rejects_binary(tmp_path) -> None:
+    (tmp_path / "blob.bin").write_bytes(b"\x89PNG\x00\x00data")
+    result = await ReadFileTool(workspace=tmp_path).execute(path="blob.bin")
+    assert "binary" in result
+
+
+@pytest.mark.asyncio
+async def test_list_dir_recursive_with_details(tmp_path) -> None:
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "a.py").write_text("abc", encoding="utf-8")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref", encoding="utf-8")
+    tool = ListDirTool(workspace=tmp_path)
+
+    assert await tool.execute(path=".") == "📁 .git\n📁 src"
+
+    lines = (await tool.execute(path=".", depth=3, details=True)).splitlines()
+    assert [line.split("  ")[0] for line in lines] == [
+        "📁 .git", "📁 src", "📁 src/pkg", "📄 src/pkg/a.py",
+    ]
+    assert lines[-1].split("  ")[1] == "3"
+
+    (tmp_path / "dangling").symlink_to(tmp_path / "missing")
+    lines = (await tool.execute(path=".", details=True)).splitlines()
+    assert "📄 dangling  ?  ?" in lines
+
+
+@pytest.mark.asyncio
+async def test_read_file_continues_a_cut_line_by_column(tmp_path) -> None:
+    (tmp_path / "wide.txt").write_text("a" * 100 + "b" * 100 + "c" * 20 + "\nnext\n", encoding="utf-8")
+    tool = ReadFileTool(workspace=tmp_path, max_bytes=100)
+
+    first = await tool.execute(path="wide.txt")
+    assert first.startswith("a" * 100 + "\n\n")
+    assert "Line 1 was cut; use offset=1, column=101" in first
+
+    second = await tool.execute(path="wide.txt", offset=1, column=101)
+    assert second.startswith("b" * 100 + "\n\n")
+    assert "column=201" in second
+
+    third = await tool.execute(path="wide.txt", offset=1, column=201)
+    assert third.startswith("c" * 20 + "\nnext")
+
+    assert "beyond end of line" in await tool.execute(path="wide.txt", offset=2, column=10)
@@ -115,3 +115,90 @@ async def test_trigger_now_returns_none_when_decision_is_skip(tmp_path) -> None:
     )
 
     assert await service.trigger_now() is None
+
+
+def test_has_pending_tasks_ignores_template_scaffolding() -> None:
+    from importlib.resources import files
+
+    from nanobot.heartbeat.service import has_pending_tasks
+
+    template = (files("nanobot") / "templates" / "HEARTBEAT.md").read_text(encoding="utf-8")
+    assert not has_pending_tasks(template)
+    assert not has_pending_tasks(template + "- [x] old task\nwatered the plants\n")
+    assert not has_pending_tasks("# Tasks\n\n- [ ]\n- [x] done\n---\n")
+    assert has_pending_tasks(template.replace("<!-- Add", "- [ ] check inbox\n<!-- Add"))
+    assert has_pending_tasks("check the weather every morning")
+
+
+def test_has_pending_tasks_sees_tasks_outside_active_tasks() -> None:
+    from importlib.resources import files
+
+    from nanobot.heartbeat.service import has_pending_tasks
+
+    template = (files("nanobot") / "templates" / "HEARTBEAT.md").read_text(encoding="utf-8")
+    intro = "Add tasks below that you want the agent to work on periodically.\n"
+    assert has_pending_tasks(template.replace(intro, intro + "Check the weather every morning.\n"))
+    assert has_pending_tasks(template + "\n## Weekly\n\nback up photos on Sunday\n")
+    assert has_pending_tasks("## Completed\n- [x] done\n# Later\nrenew passport\n")
+
+
+@pytest.mark.asyncio
+async def test_tick_skips_llm_for_empty_or_unchanged_file(tmp_path) -> None:
+    skip = LLMResponse(
+        content="",
+        tool_calls=[ToolCallRequest(id="hb_1", name="heartbeat", arguments={"action": "skip"})],
+    )
+    service = HeartbeatService(
+        workspace=tmp_path,
+        provider=DummyProvider([skip, skip]),
+        model="openai/gpt-4o-mini",
+        interval_s=60,
+        max_interval_s=200,
+    )
+    heartbeat = tmp_path / "HEARTBEAT.md"
+
+    heartbeat.write_text("## Active Tasks\n<!-- none -->\n", encoding="utf-8")
+    await service._tick()
+    assert service.llm_calls == 0
+    assert service.current_interval_s == 120
+
+    heartbeat.write_text("- [ ] water plants on Friday", encoding="utf-8")
+    await service._tick()
+    await service._tick()
+    assert service.llm_calls == 1
+    assert service.current_interval_s == 200
+
+    heartbeat.write_text("- [ ] water plants on Saturday", encoding="utf-8")
+    await service._tick()
+    assert service.llm_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_file_edit_wakes_the_loop(tmp_path) -> None:
+    heartbeat = tmp_path / "HEARTBEAT.md"
+    heartbeat.write_text("", encoding="utf-8")
+    executed = asyncio.Event()
+
+    async def _on_execute(tasks: str) -> str:
+        executed.set()
+        return ""
+
+    run = LLMResponse(
+        content="",
+        tool_calls=[ToolCallRequest(id="hb_1", name="heartbeat", arguments={"action": "run", "tasks": "x"})],
+    )
+    service = HeartbeatService(
+        workspace=tmp_path,
+        provider=DummyProvider([run]),
+        model="openai/gpt-4o-mini",
+        on_execute=_on_execute,
+        interval_s=9999,
+        watch_interval_s=0.05,
+    )
+    await service.start()
+    try:
+        await asyncio.sleep(0.1)
+        heartbeat.write_text("- [ ] do thing", encoding="utf-8")
+        await asyncio.wait_for(executed.wait(), timeout=5)
+    finally:
+        service.stop()
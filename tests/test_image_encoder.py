@@ -0,0 +1,51 @@
+import base64
+import io
+
+import pytest
+
+from nanobot.agent.context import ContextBuilder
+from nanobot.media.images import ImageEncoder, max_dimension_for
+
+
+def test_max_dimension_depends_on_model() -> None:
+    assert max_dimension_for("anthropic/claude-opus-4-5") == 1568
+    assert max_dimension_for("openrouter/openai/gpt-4o") == 2048
+    assert max_dimension_for("gemini/gemini-2.5-pro") == 3072
+    assert max_dimension_for("deepseek-chat") == 1568
+
+
+def test_large_photo_is_downscaled_and_reencoded(tmp_path) -> None:
+    pil_image = pytest.importorskip("PIL.Image")
+    path = tmp_path / "photo.png"
+    pil_image.new("RGB", (4000, 3000), (200, 100, 50)).save(path)
+
+    mime, b64 = ImageEncoder(max_dimension=1000).encode(path)
+
+    assert mime == "image/jpeg"
+    with pil_image.open(io.BytesIO(base64.b64decode(b64))) as img:
+        assert img.size == (1000, 750)
+
+
+def test_small_image_passes_through_and_is_cached(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "icon.gif"
+    data = b"GIF89a\x01\x00\x01\x00" + b"\0" * 20
+    path.write_bytes(data)
+    encoder = ImageEncoder()
+
+    assert encoder.encode(path) == ("image/gif", base64.b64encode(data).decode())
+    monkeypatch.setattr(type(path), "read_bytes", lambda self: pytest.fail("cache miss"))
+    assert encoder.encode(path)[0] == "image/gif"
+    assert encoder.encode(tmp_path / "notes.txt") is None
+
+
+@pytest.mark.asyncio
+async def test_context_prepares_images_off_loop(tmp_path) -> None:
+    path = tmp_path / "a.gif"
+    path.write_bytes(b"GIF89a\x01\x00\x01\x00" + b"\0" * 20)
+    builder = ContextBuilder(tmp_path)
+
+    await builder.prepare_media([str(path)])
+    assert len(builder.images._cache) == 1
+    content = builder._build_user_content("look", [str(path), str(tmp_path / "missing.png")])
+    assert content[0]["image_url"]["url"].startswith("data:image/gif;base64,")
+    assert content[-1] == {"type": "text", "text": "look"}
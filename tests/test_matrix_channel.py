@@ -1131,13 +1131,13 @@ async def test_send_stops_typing_keepalive_task() -> None:
     channel._running = True
 
     await channel._start_typing_keepalive("!room:matrix.org")
-    assert "!room:matrix.org" in channel._typing_tasks
+    assert "!room:matrix.org" in channel._typing
 
     await channel.send(
         OutboundMessage(channel="matrix", chat_id="!room:matrix.org", content="Hi")
     )
 
-    assert "!room:matrix.org" not in channel._typing_tasks
+    assert "!room:matrix.org" not in channel._typing
     assert client.typing_calls[-1] == ("!room:matrix.org", False, TYPING_NOTICE_TIMEOUT_MS)
 
 
@@ -1149,7 +1149,8 @@ async def test_send_progress_keeps_typing_keepalive_running() -> None:
     channel._running = True
 
     await channel._start_typing_keepalive("!room:matrix.org")
-    assert "!room:matrix.org" in channel._typing_tasks
+    assert "!room:matrix.org" in channel._typing
+    await asyncio.sleep(0.01)  # first refresh goes out from the ticker
 
     await channel.send(
         OutboundMessage(
@@ -1160,7 +1161,7 @@ async def test_send_progress_keeps_typing_keepalive_running() -> None:
         )
     )
 
-    assert "!room:matrix.org" in channel._typing_tasks
+    assert "!room:matrix.org" in channel._typing
     assert client.typing_calls[-1] == ("!room:matrix.org", True, TYPING_NOTICE_TIMEOUT_MS)
 
 
@@ -0,0 +1,199 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from nanobot.agent.tools.mcp import MCPManager
+from nanobot.agent.tools.registry import ToolRegistry
+from nanobot.config.schema import MCPServerConfig
+
+_SERVER = """
+import os
+
+from mcp.server.fastmcp import Context, FastMCP
+
+mcp = FastMCP("test")
+
+
+@mcp.tool()
+def echo(text: str) -> str:
+    \"\"\"Echo text back.\"\"\"
+    return text
+
+
+@mcp.tool()
+def crash() -> str:
+    \"\"\"Kill the server process.\"\"\"
+    os._exit(1)
+
+
+@mcp.tool()
+async def grow(ctx: Context) -> str:
+    \"\"\"Add a tool and announce the change.\"\"\"
+    mcp.add_tool(lambda: "new", name="extra", description="Added at runtime")
+    await ctx.session.send_tool_list_changed()
+    return "grown"
+
+
+mcp.run()
+"""
+
+
+@pytest.fixture
+def server_cfg(tmp_path) -> MCPServerConfig:
+    script = tmp_path / "server.py"
+    script.write_text(_SERVER, encoding="utf-8")
+    return MCPServerConfig(command=sys.executable, args=[str(script)], connect_timeout=20)
+
+
+@pytest.mark.asyncio
+async def test_servers_connect_in_parallel_with_per_server_timeout(tmp_path, server_cfg) -> None:
+    hanging = MCPServerConfig(
+        command=sys.executable, args=["-c", "import time; time.sleep(60)"], connect_timeout=1,
+    )
+    registry = ToolRegistry()
+    manager = MCPManager({"a": server_cfg, "b": server_cfg, "hang": hanging}, registry, tmp_path / "cache")
+    try:
+        started = time.monotonic()
+        await manager.start()
+        assert time.monotonic() - started < 20
+        assert sorted(registry.tool_names) == [
+            "mcp_a_crash", "mcp_a_echo", "mcp_a_grow", "mcp_b_crash", "mcp_b_echo", "mcp_b_grow",
+        ]
+        assert not manager.connections["hang"].connected
+        assert await registry.execute("mcp_b_echo", {"text": "hi"}) == "hi"
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_lazy_server_registers_from_manifest_and_starts_on_first_call(tmp_path, server_cfg) -> None:
+    cache = tmp_path / "cache"
+    first = MCPManager({"srv": server_cfg}, ToolRegistry(), cache)
+    await first.start()  # no manifest yet: connects and writes one
+    await first.close()
+    assert (cache / "srv.json").exists()
+
+    server_cfg.lazy = True
+    registry = ToolRegistry()
+    manager = MCPManager({"srv": server_cfg}, registry, cache)
+    try:
+        await manager.start()
+        assert sorted(registry.tool_names) == ["mcp_srv_crash", "mcp_srv_echo", "mcp_srv_grow"]
+        assert not manager.connections["srv"].connected
+
+        assert await registry.execute("mcp_srv_echo", {"text": "lazy"}) == "lazy"
+        assert manager.connections["srv"].connected
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_manifest_is_ignored_when_launch_config_changes(tmp_path, server_cfg) -> None:
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    (cache / "srv.json").write_text('{"fingerprint": "stale", "tools": []}', encoding="utf-8")
+    server_cfg.lazy = True
+    manager = MCPManager({"srv": server_cfg}, ToolRegistry(), cache)
+    assert manager._load_manifest(manager.connections["srv"]) is None
+
+
+@pytest.mark.asyncio
+async def test_dead_server_fails_fast_then_reconnects(tmp_path, server_cfg) -> None:
+    registry = ToolRegistry()
+    manager = MCPManager({"srv": server_cfg}, registry, tmp_path / "cache")
+    try:
+        await manager.start()
+        conn = manager.connections["srv"]
+
+        assert "Error" in await registry.execute("mcp_srv_crash", {})
+        assert not conn.connected
+
+        started = time.monotonic()
+        result = await registry.execute("mcp_srv_echo", {"text": "hi"})
+        assert "unavailable" in result and "retrying" in result
+        assert time.monotonic() - started < 0.5
+
+        for _ in range(100):  # supervisor reconnects after the 1s backoff
+            if conn.connected:
+                break
+            await asyncio.sleep(0.2)
+        assert await registry.execute("mcp_srv_echo", {"text": "back"}) == "back"
+
+        status = manager.status()["srv"]
+        assert status["connected"] and status["reconnects"] == 1
+        assert status["calls"] == 2 and status["errors"] == 1
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_tool_list_changed_notification_refreshes_registry(tmp_path, server_cfg) -> None:
+    registry = ToolRegistry()
+    manager = MCPManager({"srv": server_cfg}, registry, tmp_path / "cache")
+    try:
+        await manager.start()
+        assert await registry.execute("mcp_srv_grow", {}) == "grown"
+        for _ in range(50):
+            if registry.has("mcp_srv_extra"):
+                break
+            await asyncio.sleep(0.1)
+        assert await registry.execute("mcp_srv_extra", {}) == "new"
+    finally:
+        await manager.close()
+
+
+def test_registry_replace_swaps_tools() -> None:
+    from nanobot.agent.tools.message import MessageTool
+
+    registry = ToolRegistry()
+    old = MessageTool()
+    registry.register(old)
+    snapshot = registry._tools
+    registry.replace(["message"], [])
+    assert not registry.has("message")
+    assert snapshot == {"message": old}  # readers holding the old mapping are unaffected
+
+
+def test_large_results_are_truncated_and_spilled(tmp_path) -> None:
+    from mcp import types
+
+    from nanobot.agent.tools.mcp import MCPToolWrapper
+    from nanobot.agent.tools.results import ResultStore
+
+    store = ResultStore(tmp_path)
+    tool = MCPToolWrapper(
+        None, "db", types.Tool(name="query", inputSchema={"type": "object"}),
+        max_result_bytes=1000, results=store,
+    )
+    rows = "\n".join(f"row {i}" for i in range(1000))
+    out = tool._render([types.TextContent(type="text", text=rows)])
+    assert len(out) <= 1000
+    assert out.startswith("row 0\n") and out.endswith("row 999")
+    handle = out.split("stored as result '")[1].split("'")[0]
+    assert store.get(handle).read_text(encoding="utf-8") == rows
+
+    assert tool._render([types.TextContent(type="text", text="small")]) == "small"
+
+
+def test_image_and_resource_blocks_are_saved_to_files(tmp_path) -> None:
+    import base64
+
+    from mcp import types
+
+    from nanobot.agent.tools.mcp import MCPToolWrapper
+    from nanobot.agent.tools.results import ResultStore
+
+    tool = MCPToolWrapper(None, "srv", types.Tool(name="snap", inputSchema={}), results=ResultStore(tmp_path))
+    png = b"\x89PNG\r\n\x1a\n" + b"\0" * 32
+    out = tool._render([
+        types.ImageContent(type="image", data=base64.b64encode(png).decode(), mimeType="image/png"),
+        types.EmbeddedResource(type="resource", resource=types.TextResourceContents(
+            uri="file:///notes.txt", text="hello", mimeType="text/plain",
+        )),
+    ])
+    saved = next((tmp_path / "files").glob("mcp_srv_snap-*.png"))
+    assert saved.read_bytes() == png
+    assert f"[image image/png, {len(png)} bytes, saved to {saved}]" in out
+    assert "[resource file:///notes.txt]\nhello" in out
@@ -0,0 +1,58 @@
+import asyncio
+import time
+
+import pytest
+
+from nanobot.media.fetch import MediaFetcher
+
+
+@pytest.mark.asyncio
+async def test_downloads_run_concurrently_and_keep_order() -> None:
+    async def job(i: int) -> int:
+        await asyncio.sleep(0.2 if i == 0 else 0.05)
+        return i
+
+    started = time.monotonic()
+    results = await MediaFetcher(max_concurrent=5).fetch_all([lambda i=i: job(i) for i in range(5)])
+    assert results == [0, 1, 2, 3, 4]
+    assert time.monotonic() - started < 0.35
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_shared_per_fetcher() -> None:
+    running = peak = 0
+
+    async def job() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    fetcher = MediaFetcher(max_concurrent=2)
+    await asyncio.gather(fetcher.fetch_all([job] * 4), fetcher.fetch_all([job] * 4))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_stragglers_and_errors_are_returned() -> None:
+    cancelled = asyncio.Event()
+
+    async def slow() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "slow"
+
+    async def broken() -> str:
+        raise ValueError("bad")
+
+    async def fast() -> str:
+        return "fast"
+
+    results = await MediaFetcher(deadline_s=0.1).fetch_all([slow, broken, fast])
+    assert isinstance(results[0], TimeoutError) and cancelled.is_set()
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "fast"
@@ -0,0 +1,92 @@
+import struct
+
+import httpx
+import pytest
+
+from nanobot.media.store import MediaStore, MediaTooLargeError, image_size
+
+_PNG = b"\x89PNG\r\n\x1a\n" + b"\0\0\0\rIHDR" + struct.pack(">II", 640, 480) + b"\0" * 16
+
+
+@pytest.mark.asyncio
+async def test_identical_content_is_stored_once_with_metadata(tmp_path) -> None:
+    store = MediaStore(tmp_path / "media")
+
+    first = await store.put_bytes(_PNG, kind="photo", filename="cat.png", source="telegram:1")
+    second = await store.put_bytes(_PNG, kind="image", filename="forwarded.png", source="discord:2")
+
+    assert first == second
+    assert first.suffix == ".png" and first.read_bytes() == _PNG
+    assert store.usage() == len(_PNG)
+    info = store.info(first)
+    assert info["kind"] == "image" and info["mime"] == "image/png"
+    assert (info["width"], info["height"]) == (640, 480)
+    assert info["name"] == "cat.png" and info["source"] == "telegram:1"
+
+
+@pytest.mark.asyncio
+async def test_size_caps_apply_per_kind_and_while_streaming(tmp_path) -> None:
+    store = MediaStore(tmp_path / "media", max_bytes={"audio": 10, "file": 100})
+
+    with pytest.raises(MediaTooLargeError):
+        await store.put_bytes(b"x" * 11, kind="voice")
+    assert await store.put_bytes(b"x" * 11, kind="file")
+
+    async def chunks():
+        for _ in range(5):
+            yield b"y" * 30
+
+    with pytest.raises(MediaTooLargeError):
+        await store.put_stream(chunks(), kind="file")
+    assert not list((tmp_path / "media" / "tmp").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_download_streams_into_store(tmp_path) -> None:
+    body = b"%PDF-1.4 " * 1000
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"content-type": "application/pdf"})
+
+    store = MediaStore(tmp_path / "media", max_bytes={"file": 100})
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        with pytest.raises(MediaTooLargeError):
+            await store.download(client, "https://example.com/a.pdf")
+        store.max_bytes["file"] = len(body)
+        path = await store.download(client, "https://example.com/a.pdf", filename="a.pdf")
+    assert path.read_bytes() == body and path.suffix == ".pdf"
+
+
+@pytest.mark.asyncio
+async def test_quota_evicts_least_recently_used(tmp_path) -> None:
+    root = tmp_path / "media"
+    root.mkdir()
+    legacy = root / "AgADBAADq2k4.jpg"
+    legacy.write_bytes(b"L" * 40)
+
+    store = MediaStore(root, quota_bytes=100)
+    a = await store.put_bytes(b"a" * 40, filename="a.bin")
+    b = await store.put_bytes(b"b" * 40, filename="b.bin")
+    store.touch(a)
+    c = await store.put_bytes(b"c" * 40, filename="c.bin")
+
+    assert not legacy.exists() and not b.exists()
+    assert a.exists() and c.exists()
+    assert store.usage() == 80
+
+    store.close()
+    assert MediaStore(root, quota_bytes=100).usage() == 80
+
+
+def test_image_size_reads_common_headers(tmp_path) -> None:
+    gif = tmp_path / "x.gif"
+    gif.write_bytes(b"GIF89a" + struct.pack("<HH", 32, 16) + b"\0" * 20)
+    jpeg = tmp_path / "x.jpg"
+    jpeg.write_bytes(b"\xff\xd8" + b"\xff\xe0\x00\x04\0\0" + b"\xff\xc0\x00\x11\x08" + struct.pack(">HH", 200, 300))
+    png = tmp_path / "x.png"
+    png.write_bytes(_PNG)
+
+    assert image_size(gif) == (32, 16)
+    assert image_size(jpeg) == (300, 200)
+    assert image_size(png) == (640, 480)
+    assert image_size(tmp_path / "missing") is None
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.discord import DiscordChannel
+from nanobot.channels.rate_limit import RateLimiter, TokenBucket, retry_after
+from nanobot.config.schema import DiscordConfig
+
+
+def test_token_bucket_allows_burst_then_spaces_calls() -> None:
+    bucket = TokenBucket(rate=10, burst=2)
+    now = bucket.updated
+
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == 0
+    assert bucket.reserve(now) == pytest.approx(0.1)
+    assert bucket.reserve(now) == pytest.approx(0.2)
+
+
+def test_blocked_bucket_waits_for_the_block_first() -> None:
+    bucket = TokenBucket(rate=10, burst=5)
+    now = bucket.updated
+
+    bucket.block(2.0, now)
+
+    assert bucket.blocked_for(now) == pytest.approx(2.0)
+    assert bucket.reserve(now) == pytest.approx(2.1)
+
+
+@pytest.mark.asyncio
+async def test_limiter_spaces_calls_per_chat_but_not_across_chats() -> None:
+    limiter = RateLimiter(rate=1000, burst=1000, chat_rate=20, chat_burst=1)
+
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire("a") for _ in range(3)))
+    assert time.monotonic() - start >= 0.09
+
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire(c) for c in ("x", "y", "z")))
+    assert time.monotonic() - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_block_pauses_only_that_chat() -> None:
+    limiter = RateLimiter(rate=1000, burst=1000, chat_rate=100, chat_burst=10)
+    await limiter.acquire("a")
+    limiter.block(0.1, "a")
+
+    start = time.monotonic()
+    await limiter.acquire("b")
+    assert time.monotonic() - start < 0.05
+    await limiter.acquire("a")
+    assert time.monotonic() - start >= 0.09
+
+
+def test_retry_after_parsing() -> None:
+    assert retry_after({"Retry-After": "3"}) == 3
+    assert 5 <= retry_after({"Retry-After": formatdate(time.time() + 6, usegmt=True)}) <= 6
+    assert retry_after({"X-RateLimit-Reset-After": "0.5"}) == 0.5
+    assert retry_after(body={"retry_after": 1.25, "global": False}) == 1.25
+    assert retry_after(body={"ok": False, "parameters": {"retry_after": 7}}) == 7
+    assert retry_after({"Retry-After": "soon"}, default=2.0) == 2.0
+
+
+@pytest.mark.asyncio
+async def test_discord_429_blocks_channel_and_retries() -> None:
+    calls: list[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, json={"retry_after": 0.1, "global": False})
+        return httpx.Response(200, json={})
+
+    channel = DiscordChannel(DiscordConfig(token="t"), MessageBus())
+    channel._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    ok = await channel._send_payload("https://discord.test/channels/1/messages", {}, {"content": "hi"}, "1")
+
+    assert ok is True
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.09
+    await channel._http.aclose()
@@ -0,0 +1,90 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from nanobot.agent.tools.results import ReadResultTool, ResultStore
+
+
+def test_small_results_pass_through(tmp_path) -> None:
+    store = ResultStore(tmp_path / "results", inline_chars=100)
+    assert store.compact("exec", "short") == "short"
+    assert not (tmp_path / "results").exists()
+
+
+@pytest.mark.asyncio
+async def test_large_result_is_stored_and_paged(tmp_path) -> None:
+    store = ResultStore(tmp_path, inline_chars=1000, preview_chars=50)
+    output = "\n".join(f"line {i}" for i in range(1, 501))
+
+    compact = store.compact("exec", output)
+    assert len(compact) < 300
+    handle = compact.split("stored as result '")[1].split("'")[0]
+    assert store.get(handle).read_text(encoding="utf-8") == output
+    assert store.compact("exec", output) == compact  # content-addressed: stored once
+    assert len(list(tmp_path.glob("*.txt"))) == 1
+
+    tool = ReadResultTool(store)
+    window = await tool.execute(handle=handle, offset=101, limit=3)
+    assert window.startswith("line 101\nline 102\nline 103\n")
+    assert "Use offset=104 to continue" in window
+    assert (await tool.execute(handle="../../etc/passwd")).startswith("Error: No stored result")
+
+
+@pytest.mark.asyncio
+async def test_one_line_result_pages_past_max_bytes(tmp_path) -> None:
+    store = ResultStore(tmp_path, inline_chars=100)
+    output = "a" * 150 + "b" * 150 + "c" * 50
+    handle = store.compact("web_fetch", output).split("stored as result '")[1].split("'")[0]
+    tool = ReadResultTool(store, max_bytes=150)
+
+    first = await tool.execute(handle=handle)
+    assert first.startswith("a" * 150 + "\n")
+    assert "use offset=1, column=151" in first
+    second = await tool.execute(handle=handle, offset=1, column=151)
+    assert second.startswith("b" * 150 + "\n")
+    assert "use offset=1, column=301" in second
+    third = await tool.execute(handle=handle, offset=1, column=301)
+    assert third.startswith("c" * 50)
+
+@pytest.mark.asyncio
+async def test_save_turn_keeps_full_tool_result_recoverable(tmp_path) -> None:
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
+    from nanobot.session.manager import Session
+
+    provider = MagicMock()
+    provider.get_default_model.return_value = "test-model"
+    loop = AgentLoop(bus=MessageBus(), provider=provider, workspace=tmp_path)
+    session = Session(key="cli:test")
+    output = "x" * 5000
+    compacted = loop.results.compact("grep", "y" * 20_000)
+    await loop._save_turn(session, [
+        {"role": "tool", "tool_call_id": "1", "name": "exec", "content": output},
+        {"role": "tool", "tool_call_id": "2", "name": "grep", "content": compacted},
+    ], 0)
+
+    saved = session.messages[0]["content"]
+    assert len(saved) < 700 and saved.endswith("... (truncated)")
+    handle = saved.split("stored as result '")[1].split("'")[0]
+    assert loop.results.get(handle).read_text(encoding="utf-8") == output
+
+    saved = session.messages[1]["content"]
+    assert saved.count("[grep output: ") == 1
+    assert saved.split("\n", 1)[1].startswith("yyy")
+
+
+def test_prune_only_touches_stored_results(tmp_path) -> None:
+    import os
+
+    store = ResultStore(tmp_path, max_age_days=1)
+    old = store.path(store.put("old result"))
+    blob = store.put_bytes(b"\x89PNG", ".png")
+    foreign = tmp_path / "notes.txt"
+    foreign.write_text("not ours")
+    for path in (old, blob, foreign):
+        os.utime(path, (0, 0))
+
+    ResultStore(tmp_path, max_age_days=1).put("new result")
+
+    assert not old.exists() and not blob.exists()
+    assert foreign.exists()
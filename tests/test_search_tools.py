@@ -0,0 +1,98 @@
+import os
+
+import pytest
+
+from nanobot.agent.tools.search import GlobTool, GrepTool, WorkspaceIndex, _required_literals
+
+
+def _make_tree(root) -> None:
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "core.py").write_text("def handle_request():\n    return 42\n", encoding="utf-8")
+    (root / "src" / "util.py").write_text("HANDLE = 'x'\n", encoding="utf-8")
+    (root / "README.md").write_text("# Project\nhandle_request docs\n", encoding="utf-8")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("handle_request()\n", encoding="utf-8")
+    (root / "image.bin").write_bytes(b"\x00\x01handle_request")
+
+
+def test_required_literals() -> None:
+    assert _required_literals("handle_request") == ["handle_request"]
+    assert _required_literals(r"def\s+foo_bar\(") == ["def", "foo_bar"]
+    assert _required_literals("colou?r") == ["colo", "r"]
+    assert _required_literals("(abc)?defg") == ["defg"]
+    assert _required_literals("a{2,3}bcd") == ["bcd"]
+    assert _required_literals("foo|bar") == []
+
+
+def test_index_tracks_changes_incrementally(tmp_path) -> None:
+    _make_tree(tmp_path)
+    index = WorkspaceIndex(tmp_path, min_refresh_interval=0)
+    index.refresh()
+    assert "src/pkg/core.py" in index.files
+    assert not any(p.startswith("node_modules") for p in index.files)
+    assert not index._grams
+    assert index.candidates(["handle_request"]) == {"src/pkg/core.py", "README.md"}
+    assert "image.bin" in index.binary
+
+    (tmp_path / "src" / "util.py").write_text("handle_request = None\n", encoding="utf-8")
+    os.utime(tmp_path / "src" / "util.py", ns=(1, 1))
+    (tmp_path / "README.md").unlink()
+    index.refresh()
+    assert "README.md" not in index.files
+    assert index.candidates(["handle_request"]) == {"src/pkg/core.py", "src/util.py"}
+
+
+def test_index_respects_trigram_budget(tmp_path) -> None:
+    for i in range(10):
+        (tmp_path / f"f{i}.txt").write_text(f"file number {i} says handle_request\n", encoding="utf-8")
+    (tmp_path / "other.txt").write_text("nothing to see here\n", encoding="utf-8")
+    index = WorkspaceIndex(tmp_path, max_trigram_entries=100, min_refresh_interval=0)
+    index.refresh()
+    assert not index._grams and index._entries == 0
+
+    found = index.candidates(["handle_request"])
+    assert 0 < len(index._grams) < 11
+    assert index._entries <= 100
+    assert index._entries == sum(len(g) for g in index._grams.values())
+    # files left out by the budget are still searched
+    assert found == {f"f{i}.txt" for i in range(10)} | ({"other.txt"} - index._grams.keys())
+
+
+@pytest.mark.asyncio
+async def test_grep_finds_lines_and_honors_glob(tmp_path) -> None:
+    _make_tree(tmp_path)
+    tool = GrepTool(workspace=tmp_path)
+
+    result = await tool.execute(pattern=r"handle_\w+")
+    assert "src/pkg/core.py:1: def handle_request():" in result
+    assert "README.md:2: handle_request docs" in result
+    assert "node_modules" not in result and "image.bin" not in result
+
+    result = await tool.execute(pattern="handle", glob="*.py", ignore_case=True)
+    assert "src/util.py:1: HANDLE = 'x'" in result
+    assert "README.md" not in result
+
+    result = await tool.execute(pattern="return", path="src/pkg")
+    assert result == "core.py:2:     return 42"
+
+
+@pytest.mark.asyncio
+async def test_grep_caps_results_and_rejects_bad_regex(tmp_path) -> None:
+    (tmp_path / "many.txt").write_text("hit\n" * 50, encoding="utf-8")
+    tool = GrepTool(workspace=tmp_path)
+
+    result = await tool.execute(pattern="hit", max_results=5)
+    assert result.count("many.txt:") == 5
+    assert "stopped at 5 matches" in result
+    assert (await tool.execute(pattern="(")).startswith("Error: Invalid regex")
+
+
+@pytest.mark.asyncio
+async def test_glob_patterns_and_workspace_restriction(tmp_path) -> None:
+    _make_tree(tmp_path)
+    tool = GlobTool(workspace=tmp_path, allowed_dir=tmp_path)
+
+    assert set((await tool.execute(pattern="*.py")).splitlines()) == {"src/pkg/core.py", "src/util.py"}
+    assert (await tool.execute(pattern="src/**/*.py")).count(".py") == 2
+    assert (await tool.execute(pattern="src/*.py")) == "src/util.py"
+    assert (await tool.execute(pattern="*.py", path="/")).startswith("Error:")
@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+import pytest
+
+from nanobot.agent.subagent import SubagentManager, SubagentTranscript
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import SubagentConfig
+from nanobot.providers.base import LLMResponse, ToolCallRequest
+
+
+class _ScriptedProvider:
+    """Replays responses in order; blocks forever once the script runs out."""
+
+    def __init__(self, *responses: LLMResponse, delay: float = 0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.calls: list[list[dict]] = []
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+    async def chat(self, messages, **kwargs) -> LLMResponse:
+        self.calls.append(list(messages))
+        await asyncio.sleep(self.delay)
+        if not self.responses:
+            await asyncio.Event().wait()
+        return self.responses.pop(0)
+
+
+def _list_dir_call(call_id: str = "c1") -> LLMResponse:
+    return LLMResponse(content="Looking around", tool_calls=[
+        ToolCallRequest(id=call_id, name="list_dir", arguments={"path": "."}),
+    ])
+
+
+def _manager(tmp_path, provider, bus=None, **cfg) -> SubagentManager:
+    return SubagentManager(
+        provider=provider, workspace=tmp_path, bus=bus or MessageBus(), config=SubagentConfig(**cfg),
+    )
+
+
+@pytest.mark.asyncio
+async def test_interrupted_subagent_resumes_from_checkpoint(tmp_path) -> None:
+    first = _manager(tmp_path, _ScriptedProvider(_list_dir_call()))
+    await first.spawn("survey the workspace", label="survey", origin_channel="telegram", origin_chat_id="42")
+    (task_id, task), = first._running_tasks.items()
+    checkpoint = tmp_path / "subagents" / f"{task_id}.jsonl"
+    for _ in range(100):
+        if '"role": "tool"' in checkpoint.read_text(encoding="utf-8"):
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()  # gateway shutdown
+    await asyncio.gather(task, return_exceptions=True)
+    assert checkpoint.exists()
+
+    bus = MessageBus()
+    provider = _ScriptedProvider(LLMResponse(content="Found 1 directory"))
+    second = _manager(tmp_path, provider, bus=bus)
+    assert await second.resume_pending() == 1
+    await asyncio.gather(*second._running_tasks.values())
+
+    resumed_with = provider.calls[0]
+    assert [m["role"] for m in resumed_with] == ["system", "user", "assistant", "tool"]
+    assert resumed_with[1]["content"] == "survey the workspace"
+    announcement = await bus.consume_inbound()
+    assert announcement.chat_id == "telegram:42"
+    assert "Found 1 directory" in announcement.content
+    assert not checkpoint.exists()
+
+
+def test_load_drops_unfinished_tool_round(tmp_path) -> None:
+    path = tmp_path / "t.jsonl"
+    lines = [
+        {"_type": "metadata", "task_id": "t"},
+        {"role": "user", "content": "go"},
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "a"}, {"id": "b"}]},
+        {"role": "tool", "tool_call_id": "a", "content": "ok"},
+    ]
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+    meta, messages = SubagentTranscript.load(path)
+    assert meta["task_id"] == "t"
+    assert messages == [{"role": "user", "content": "go"}]
+
+
+@pytest.mark.asyncio
+async def test_stopped_subagents_are_not_resumed_and_progress_is_posted(tmp_path) -> None:
+    bus = MessageBus()
+    provider = _ScriptedProvider(_list_dir_call(), delay=1.05)
+    mgr = _manager(tmp_path, provider, bus=bus, progress_interval=1)
+    await mgr.spawn("long job", label="job", session_key="cli:direct")
+
+    progress = await asyncio.wait_for(bus.consume_outbound(), timeout=5)
+    assert progress.metadata["_progress"]
+    assert progress.content == "[job] step 1/15: Looking around"
+
+    assert await mgr.cancel_by_session("cli:direct") == 1
+    assert list((tmp_path / "subagents").glob("*.jsonl")) == []
+    assert await _manager(tmp_path, provider).resume_pending() == 0
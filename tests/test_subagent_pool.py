@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nanobot.agent.subagent import SubagentManager
+from nanobot.bus.queue import MessageBus
+from nanobot.config.schema import SubagentConfig
+from nanobot.providers.base import LLMResponse
+
+
+class _GatedProvider:
+    """Provider whose chat() blocks until released, recording task order and concurrency."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started: list[str] = []
+        self.active = 0
+        self.peak = 0
+
+    def get_default_model(self) -> str:
+        return "test-model"
+
+    async def chat(self, messages, **kwargs) -> LLMResponse:
+        self.started.append(messages[-1]["content"])
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await self.release.wait()
+        self.active -= 1
+        return LLMResponse(content="done")
+
+
+def _manager(tmp_path, provider, **cfg) -> SubagentManager:
+    return SubagentManager(
+        provider=provider, workspace=tmp_path, bus=MessageBus(), config=SubagentConfig(**cfg),
+    )
+
+
+async def _drain(mgr: SubagentManager) -> None:
+    await asyncio.gather(*mgr._running_tasks.values())
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrency_and_queues_the_rest(tmp_path) -> None:
+    provider = _GatedProvider()
+    mgr = _manager(tmp_path, provider, max_concurrent=2, max_per_session=10)
+
+    replies = [await mgr.spawn(f"task {i}", session_key="cli:a") for i in range(5)]
+    assert [("queued" in r) for r in replies] == [False, False, True, True, True]
+    await asyncio.sleep(0.05)
+    assert provider.active == 2
+    assert mgr.status()["running"] == 2 and mgr.status()["queued"] == 3
+
+    provider.release.set()
+    await _drain(mgr)
+    assert provider.peak == 2
+    assert provider.started == [f"task {i}" for i in range(5)]
+    assert mgr.stats.completed == 5 and mgr.status()["running"] == 0
+    assert mgr.stats.max_wait_s > 0
+
+
+@pytest.mark.asyncio
+async def test_high_priority_jumps_the_queue(tmp_path) -> None:
+    provider = _GatedProvider()
+    mgr = _manager(tmp_path, provider, max_concurrent=1)
+
+    await mgr.spawn("first")
+    await asyncio.sleep(0.01)
+    await mgr.spawn("low", priority="low")
+    await mgr.spawn("normal")
+    await mgr.spawn("urgent", priority="high")
+    await asyncio.sleep(0.01)
+
+    provider.release.set()
+    await _drain(mgr)
+    assert provider.started == ["first", "urgent", "normal", "low"]
+
+
+@pytest.mark.asyncio
+async def test_session_quota_and_cancelled_waiters_free_their_place(tmp_path) -> None:
+    provider = _GatedProvider()
+    mgr = _manager(tmp_path, provider, max_concurrent=1, max_per_session=2)
+
+    await mgr.spawn("a", session_key="cli:x")
+    await mgr.spawn("b", session_key="cli:x")
+    assert (await mgr.spawn("c", session_key="cli:x")).startswith("Error:")
+    assert mgr.stats.rejected == 1
+    await asyncio.sleep(0.01)
+
+    assert await mgr.cancel_by_session("cli:x") == 2
+    assert mgr.status()["running"] == 0 and mgr.stats.cancelled == 2
+
+    provider.release.set()
+    await mgr.spawn("d", session_key="cli:x")
+    await _drain(mgr)
+    assert provider.started == ["a", "d"]
+
+
+def test_tools_and_prompt_are_reused(tmp_path) -> None:
+    mgr = _manager(tmp_path, MagicMock())
+    assert mgr._get_tools() is mgr._get_tools()
+    assert not mgr._get_tools().has("spawn") and not mgr._get_tools().has("message")
+
+    with patch("nanobot.agent.skills.SkillsLoader.build_skills_summary", return_value="") as summary:
+        mgr._build_subagent_prompt()
+        mgr._build_subagent_prompt()
+        assert summary.call_count == 1
+
+        skill = tmp_path / "skills" / "demo"
+        skill.mkdir(parents=True)
+        (skill / "SKILL.md").write_text("---\nname: demo\n---\n", encoding="utf-8")
+        mgr._build_subagent_prompt()
+        assert summary.call_count == 2
@@ -0,0 +1,164 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from nanobot.providers.transcription import TranscriptionService
+
+
+class FakeBackend:
+    name = "fake"
+
+    def __init__(self, max_upload_bytes: int = 0, delay: float = 0.0):
+        self.max_upload_bytes = max_upload_bytes
+        self.delay = delay
+        self.calls: list[Path] = []
+
+    async def transcribe_file(self, path: Path) -> str:
+        self.calls.append(path)
+        await asyncio.sleep(self.delay)
+        return f"text of {path.read_bytes()[:8].decode()}"
+
+    async def aclose(self) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_by_audio_hash(tmp_path) -> None:
+    backend = FakeBackend()
+    service = TranscriptionService(backend, cache_dir=tmp_path / "cache")
+    (tmp_path / "a.ogg").write_bytes(b"voice-01")
+    (tmp_path / "b.ogg").write_bytes(b"voice-01")
+
+    assert await service.transcribe(tmp_path / "a.ogg") == "text of voice-01"
+    assert await service.transcribe(tmp_path / "b.ogg") == "text of voice-01"
+    assert len(backend.calls) == 1
+
+    fresh = TranscriptionService(FakeBackend(), cache_dir=tmp_path / "cache")
+    assert await fresh.transcribe(tmp_path / "b.ogg") == "text of voice-01"
+    assert not fresh.backend.calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_a_call_and_overflow_is_skipped(tmp_path) -> None:
+    backend = FakeBackend(delay=0.1)
+    service = TranscriptionService(backend, max_concurrent=1, max_queue=1)
+    paths = []
+    for i in range(3):
+        paths.append(tmp_path / f"{i}.ogg")
+        paths[-1].write_bytes(f"voice-{i:02d}".encode())
+
+    results = await asyncio.gather(
+        service.transcribe(paths[0]),
+        service.transcribe(paths[0]),
+        service.transcribe(paths[1]),
+        service.transcribe(paths[2]),
+    )
+
+    assert results[:2] == ["text of voice-00", "text of voice-00"]
+    assert results[2:].count("") == 1  # one voice note over max_concurrent + max_queue
+    assert len(backend.calls) == 2 and "0.ogg" in {p.name for p in backend.calls}
+
+
+@pytest.mark.asyncio
+async def test_missing_file_returns_empty(tmp_path) -> None:
+    service = TranscriptionService(FakeBackend())
+    assert await service.transcribe(tmp_path / "missing.ogg") == ""
+
+
+@pytest.mark.asyncio
+async def test_oversized_audio_is_split_into_chunks(tmp_path, monkeypatch) -> None:
+    backend = FakeBackend(max_upload_bytes=4)
+    service = TranscriptionService(backend)
+
+    async def fake_split(path: Path, out_dir: Path) -> list[Path]:
+        for i in range(2):
+            (out_dir / f"part{i:04d}.ogg").write_bytes(f"chunk-{i:02d}".encode())
+        return sorted(out_dir.glob("part*.ogg"))
+
+    monkeypatch.setattr(service, "_split", fake_split)
+    (tmp_path / "long.ogg").write_bytes(b"long recording")
+
+    assert await service.transcribe(tmp_path / "long.ogg") == "text of chunk-00 text of chunk-01"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_others(tmp_path) -> None:
+    backend = FakeBackend(delay=0.1)
+    service = TranscriptionService(backend)
+    (tmp_path / "a.ogg").write_bytes(b"voice-01")
+
+    first = asyncio.create_task(service.transcribe(tmp_path / "a.ogg"))
+    second = asyncio.create_task(service.transcribe(tmp_path / "a.ogg"))
+    await asyncio.sleep(0.02)
+    first.cancel()
+
+    assert await second == "text of voice-01"
+    assert first.cancelled()
+    assert len(backend.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_work_is_cancelled_when_every_waiter_gives_up(tmp_path) -> None:
+    service = TranscriptionService(FakeBackend(delay=10))
+    (tmp_path / "a.ogg").write_bytes(b"voice-01")
+
+    waiter = asyncio.create_task(service.transcribe(tmp_path / "a.ogg"))
+    await asyncio.sleep(0.02)
+    [task] = service._inflight.values()
+    waiter.cancel()
+    await asyncio.sleep(0.01)
+
+    assert task.cancelled()
+    assert not service._inflight and not service._waiters
+
+
+@pytest.mark.asyncio
+async def test_channel_forwards_voice_note_after_transcribing_in_background(tmp_path) -> None:
+    from nanobot.bus.queue import MessageBus
+    from nanobot.channels.discord import DiscordChannel
+    from nanobot.config.schema import DiscordConfig
+
+    bus = MessageBus()
+    channel = DiscordChannel(DiscordConfig(token="t", allow_from=["*"]), bus)
+    channel.transcriber = TranscriptionService(FakeBackend(delay=0.05))
+    voice = tmp_path / "voice.ogg"
+    voice.write_bytes(b"voice-01")
+
+    await channel._handle_message("u1", "c1", f"[attachment: {voice}]", media=[str(voice)], audio=[str(voice)])
+    assert bus.inbound.empty()  # the handler returned before transcription finished
+
+    msg = await asyncio.wait_for(bus.consume_inbound(), timeout=1)
+    assert msg.content == f"[attachment: {voice}]\n[transcription: text of voice-01]"
+    assert msg.media == [str(voice)]
+
+
+@pytest.mark.asyncio
+async def test_channel_keeps_text_behind_pending_voice_note(tmp_path) -> None:
+    from nanobot.bus.queue import MessageBus
+    from nanobot.channels.discord import DiscordChannel
+    from nanobot.config.schema import DiscordConfig
+
+    bus = MessageBus()
+    channel = DiscordChannel(DiscordConfig(token="t", allow_from=["*"]), bus)
+    channel.transcriber = TranscriptionService(FakeBackend(delay=0.05))
+    voice = tmp_path / "voice.ogg"
+    voice.write_bytes(b"voice-01")
+
+    await channel._handle_message("u1", "c1", "voice", media=[str(voice)], audio=[str(voice)])
+    await channel._handle_message("u1", "c1", "text after voice")
+    await channel._handle_message("u2", "c2", "other chat")
+
+    first = await asyncio.wait_for(bus.consume_inbound(), timeout=1)
+    assert first.content == "other chat"  # not held up by c1's transcription
+    second = await asyncio.wait_for(bus.consume_inbound(), timeout=1)
+    third = await asyncio.wait_for(bus.consume_inbound(), timeout=1)
+    assert second.content.startswith("voice\n[transcription:")
+    assert third.content == "text after voice"
+    await asyncio.sleep(0)
+    assert not channel._chat_tails
+
+    await channel._handle_message("u1", "c1", "voice", media=[str(voice)], audio=[str(voice)])
+    await channel.cancel_pending()
+    assert not channel._transcribing and not channel._chat_tails
+    assert bus.inbound.empty()
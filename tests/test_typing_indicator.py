@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from nanobot.channels.typing_indicator import TypingIndicator
+
+
+class _Recorder:
+    def __init__(self, fail: set[str] | None = None):
+        self.calls: list[str] = []
+        self.fail = fail or set()
+
+    async def __call__(self, chat_id: str) -> None:
+        self.calls.append(chat_id)
+        if chat_id in self.fail:
+            raise RuntimeError("forbidden")
+
+
+@pytest.mark.asyncio
+async def test_start_refreshes_immediately_and_periodically() -> None:
+    send = _Recorder()
+    typing = TypingIndicator(send, interval_s=0.01)
+
+    typing.start("a")
+    assert send.calls == []  # start() doesn't wait for the API
+    assert "a" in typing
+    await asyncio.sleep(0.005)
+    assert send.calls == ["a"]
+
+    await asyncio.sleep(0.05)
+    assert send.calls.count("a") >= 2
+
+    typing.stop("a")
+    count = len(send.calls)
+    await asyncio.sleep(0.03)
+    assert len(send.calls) == count
+    assert "a" not in typing
+    typing.close()
+
+
+@pytest.mark.asyncio
+async def test_one_ticker_caps_refreshes_per_tick() -> None:
+    send = _Recorder()
+    typing = TypingIndicator(send, interval_s=0.02, max_per_tick=2)
+
+    for chat_id in ("a", "b", "c", "d"):
+        typing.start(chat_id)
+    ticker = typing._task
+
+    await asyncio.sleep(0.005)
+    # The first tick sends at most max_per_tick refreshes; the rest go next tick.
+    assert send.calls == ["a", "b"]
+    await asyncio.sleep(0.03)
+    assert send.calls[2:4] == ["c", "d"]
+    assert typing._task is ticker
+    typing.close()
+    assert typing.active == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_drops_the_chat() -> None:
+    send = _Recorder(fail={"gone"})
+    typing = TypingIndicator(send, interval_s=0.01)
+
+    typing.start("gone")
+    await asyncio.sleep(0.01)
+    assert "gone" not in typing
+    assert typing._task.done()
+
+
+@pytest.mark.asyncio
+async def test_indicator_times_out() -> None:
+    send = _Recorder()
+    typing = TypingIndicator(send, interval_s=0.01, timeout_s=0.03)
+
+    typing.start("a")
+    await asyncio.sleep(0.1)
+    assert "a" not in typing
+    await asyncio.sleep(0.02)
+    assert typing._task.done()